@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Time convert/dig/export/visplt hot paths of gdpy3 on synthetic GTC cases.
+
+Each operation runs in a forked child process, so every measurement
+starts from the same state, and the peak RSS of the child (and of its
+worker processes) is the memory used by this operation only.
+Results are saved as JSON, use ``--compare`` to check them against
+the JSON of another commit.
+
+Example
+-------
+$ PYTHONPATH=/path/to/gdpy3-parent python benchmarks/runbench.py \\
+      --size small --workers 4 -o bench-new.json --compare bench-old.json
+'''
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import argparse
+import resource
+import traceback
+import subprocess
+import multiprocessing
+
+import numpy
+
+try:
+    import gdpy3
+except ImportError:
+    sys.exit("Need gdpy3 in sys.path, install it or set PYTHONPATH!")
+from gdpy3 import get_processor
+from gdpy3.savers import pcksaver_types
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthgtc import SIZES, make_case
+
+FORMATS = pcksaver_types[1:]
+OPERATIONS = ('convert', 'multi_convert', 'dig', 'multi_dig',
+              'export', 'multi_visplt')
+# regular expressions, the first matched figlabel of each is used
+FIGLABEL_PATTERNS = (
+    r'^history/ion$',
+    r'^history/phi$',
+    r'^data1d/ion_energy_flux$',
+    r'^data1d/phi_rms_fft$',
+    r'^equilibrium/q\(r\)$',
+    r'^snap\d{5}/phi_fluxa$',
+    r'^snap\d{5}/phi_spectrum$',
+    r'^snap\d{5}/ion_pdf$',
+    r'^snap/phi_spectrum$',
+    r'^snap/phi_fluxa_time$',
+    r'^flux3d/phi_\d{3}a_time$',
+    r'^zp3d\d{5}/phi_000$',
+    r'^phase2d\d{5}/ion_deltaf$',
+)
+
+
+def _maxrss_kb(who):
+    '''Peak RSS in KiB, ru_maxrss is in bytes on macOS.'''
+    rss = resource.getrusage(who).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _child(conn, func, args):
+    start_rss = _maxrss_kb(resource.RUSAGE_SELF)
+    try:
+        job = func(*args)  # setup, not timed
+        start = time.perf_counter()
+        job()
+        seconds = time.perf_counter() - start
+        res = dict(ok=True, seconds=seconds)
+    except Exception:
+        res = dict(ok=False, error=traceback.format_exc(limit=3))
+    res['maxrss_kb'] = _maxrss_kb(resource.RUSAGE_SELF)
+    res['maxrss_delta_kb'] = res['maxrss_kb'] - start_rss
+    res['children_maxrss_kb'] = _maxrss_kb(resource.RUSAGE_CHILDREN)
+    conn.send(res)
+    conn.close()
+
+
+def measure(func, *args):
+    '''
+    Call ``func(*args)`` in a forked process to set up a job,
+    then time the returned job. Return timing and memory.
+    '''
+    ctx = multiprocessing.get_context('fork')
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(child, func, args))
+    proc.start()
+    child.close()
+    try:
+        res = parent.recv()
+    except EOFError:
+        res = dict(ok=False, error='exitcode %s' % proc.exitcode)
+    proc.join()
+    return res
+
+
+def _processor(path, parallel, workers=1, **kwargs):
+    if parallel == 'multiprocess':
+        from gdpy3.processors.multiprocessor import MultiProcessor
+        MultiProcessor.multiproc = workers
+    kwargs.setdefault('add_visplter', None)
+    return get_processor(path, name='GTCv3', parallel=parallel, **kwargs)
+
+
+# op_* functions set up and return a job to time
+
+
+def op_convert(case, savedir, fmt, workers, parallel='off'):
+    def job():
+        gdp = _processor(case, parallel, workers, savedir=savedir,
+                         savetype=fmt, overwrite=True, Sid=True)
+        if gdp.pcksaver is None or not os.path.exists(gdp.pcksaver.path):
+            raise RuntimeError("Failed to convert %s!" % case)
+    return job
+
+
+def op_multi_convert(case, savedir, fmt, workers):
+    return op_convert(case, savedir, fmt, workers, parallel='multiprocess')
+
+
+def op_dig(pckpath, figlabel):
+    gdp = _processor(pckpath, 'off')
+
+    def job():
+        if gdp.dig(figlabel, redig=True, post=True)[0] is None:
+            raise RuntimeError("Failed to dig %s!" % figlabel)
+    return job
+
+
+def op_multi_dig(pckpath, figlabels, workers):
+    gdp = _processor(pckpath, 'multiprocess', workers)
+
+    def job():
+        res = gdp.multi_dig(*figlabels, redig=True, post=True)
+        lost = [l for l, r in zip(figlabels, res) if r[0] is None]
+        if lost:
+            raise RuntimeError("Failed to dig %s!" % lost)
+    return job
+
+
+def op_export(pckpath, figlabels):
+    gdp = _processor(pckpath, 'off')
+    for label in figlabels:
+        gdp.dig(label, post=False)
+
+    def job():
+        for label in figlabels:
+            gdp.export(label, fmt='json')
+    return job
+
+
+def op_multi_visplt(pckpath, figlabels, workers, figdir):
+    gdp = _processor(pckpath, 'multiprocess', workers,
+                     add_visplter='mpl::')
+
+    def job():
+        accfiglabels, failed = gdp.multi_visplt(
+            *figlabels, revis=True, savepath=figdir, mpl_backend='agg')
+        if failed:
+            raise RuntimeError("Failed to plot %s!" % failed)
+    return job
+
+
+def find_figlabels(pckpath, patterns):
+    gdp = _processor(pckpath, 'off')
+    labels = []
+    for pat in patterns:
+        found = gdp.refind(pat)
+        if found:
+            labels.append(found[0])
+    return labels
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, cwd=os.path.dirname(os.path.abspath(gdpy3.__file__))
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(args):
+    sizes = dict(SIZES[args.size])
+    workdir = args.workdir or tempfile.mkdtemp(prefix='gdpy3-bench-')
+    case = os.path.join(workdir, 'case-%s' % args.size)
+    if not os.path.isdir(case):
+        print("Generating synthetic case %s %s ..." % (case, sizes))
+        make_case(case, **sizes)
+    meta = dict(
+        gdpy3=gdpy3.__version__, commit=_git_commit(),
+        python=platform.python_version(), numpy=numpy.__version__,
+        platform=platform.platform(), cpu_count=os.cpu_count(),
+        workers=args.workers, size=args.size, case=sizes,
+        repeat=args.repeat, date=time.strftime('%F %T'),
+    )
+    records = []
+
+    def record(fmt, op, label, func, *fargs):
+        runs = [measure(func, *fargs) for _ in range(args.repeat)]
+        ok = [r for r in runs if r['ok']]
+        rec = dict(format=fmt, op=op, label=label, ok=len(ok) == len(runs))
+        if ok:
+            rec['seconds'] = min(r['seconds'] for r in ok)
+            rec['all_seconds'] = [r['seconds'] for r in ok]
+        for key in ('maxrss_kb', 'maxrss_delta_kb', 'children_maxrss_kb'):
+            rec[key] = max(r.get(key, 0) for r in runs)
+        if not rec['ok']:
+            rec['error'] = [r['error'] for r in runs if not r['ok']][0]
+        records.append(rec)
+        print("%-6s %-13s %-32s %s" % (
+            fmt, op, label or '', '%.3fs' % rec['seconds'] if ok
+            else 'FAILED\n' + rec['error']))
+
+    for fmt in args.formats:
+        savedir = os.path.join(workdir, 'saved%s' % fmt.replace('.', '-'))
+        os.makedirs(savedir, exist_ok=True)
+        if 'multi_convert' in args.ops:
+            record(fmt, 'multi_convert', None,
+                   op_multi_convert, case, savedir, fmt, args.workers)
+        # always convert, others need the converted data
+        record(fmt, 'convert', None,
+               op_convert, case, savedir, fmt, args.workers)
+        pckpaths = [os.path.join(savedir, n) for n in os.listdir(savedir)
+                    if n.endswith('.converted' + fmt)]
+        if not pckpaths:
+            continue
+        pckpath = pckpaths[0]
+        labels = find_figlabels(pckpath, args.figlabels)
+        if 'dig' in args.ops:
+            for label in labels:
+                record(fmt, 'dig', label, op_dig, pckpath, label)
+        if 'multi_dig' in args.ops:
+            record(fmt, 'multi_dig', None,
+                   op_multi_dig, pckpath, labels, args.workers)
+        if 'export' in args.ops:
+            record(fmt, 'export', None, op_export, pckpath, labels)
+        if 'multi_visplt' in args.ops:
+            figdir = os.path.join(workdir, 'figures')
+            os.makedirs(figdir, exist_ok=True)
+            record(fmt, 'multi_visplt', None,
+                   op_multi_visplt, pckpath, labels, args.workers, figdir)
+    if not args.workdir and not args.keep:
+        shutil.rmtree(workdir)
+    return dict(meta=meta, results=records)
+
+
+def compare(new, old, threshold):
+    '''
+    Print time ratios of *new* to *old* results.
+    Return records slower than *threshold*.
+    '''
+    def key(r):
+        return (r['format'], r['op'], r['label'])
+    oldrecords = {key(r): r for r in old['results'] if r.get('seconds')}
+    slower = []
+    print("\nCompare with commit %s (%s):" % (
+        old['meta'].get('commit'), old['meta'].get('date')))
+    for r in new['results']:
+        o = oldrecords.get(key(r))
+        if not (o and r.get('seconds')):
+            continue
+        ratio = r['seconds'] / o['seconds']
+        flag = ''
+        if ratio > threshold:
+            flag = ' SLOWER'
+            slower.append(r)
+        print("%-6s %-13s %-32s %.3fs -> %.3fs x%.2f%s" % (
+            r['format'], r['op'], r['label'] or '',
+            o['seconds'], r['seconds'], ratio, flag))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark gdpy3 with synthetic GTC cases.")
+    parser.add_argument('--size', default='small', choices=list(SIZES),
+                        help="synthetic case size, (default: %(default)s)")
+    parser.add_argument('--formats', nargs='+', default=FORMATS,
+                        choices=FORMATS, metavar='EXT',
+                        help="pck formats, (default: all %s)" % (FORMATS,))
+    parser.add_argument('--ops', nargs='+', default=OPERATIONS,
+                        choices=OPERATIONS, metavar='OP',
+                        help="operations, (default: all %s)" % (OPERATIONS,))
+    parser.add_argument('--figlabels', nargs='+', metavar='Pattern',
+                        default=FIGLABEL_PATTERNS,
+                        help="figlabel patterns, (default: representative)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes of multi_* operations")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="repeat each operation, keep the best time")
+    parser.add_argument('--workdir', type=str,
+                        help="reuse case and converted data in this dir")
+    parser.add_argument('--keep', action='store_true',
+                        help="keep the temporary workdir")
+    parser.add_argument('-o', '--output', type=str,
+                        help="save results to this JSON file")
+    parser.add_argument('--compare', type=str, metavar='JSON',
+                        help="results JSON file of another commit")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="time ratio to report a slowdown, "
+                        "(default: %(default)s)")
+    args = parser.parse_args()
+    result = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=1)
+        print("Results saved in %s." % args.output)
+    status = 0 if all(r['ok'] for r in result['results']) else 1
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        if compare(result, old, args.threshold):
+            status = 1
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
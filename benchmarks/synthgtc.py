@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Generate synthetic GTC raw data directories for benchmarks.
+
+The files have the layout read by the GTCv3 converters, filled with
+random numbers. Profiles in meshgrid.out and simugrid.out are monotonic,
+so the diggers which interpolate on them also work.
+'''
+
+import os
+import argparse
+import numpy as np
+
+__all__ = ['SIZES', 'make_case']
+
+SIZES = {
+    'tiny': dict(mpsi=20, mtgrid=32, mtoroidal=8, ndstep=50, nsnap=2),
+    'small': dict(mpsi=50, mtgrid=128, mtoroidal=16, ndstep=500, nsnap=4),
+    'medium': dict(mpsi=100, mtgrid=256, mtoroidal=32, ndstep=2000,
+                   nsnap=10),
+    'large': dict(mpsi=200, mtgrid=512, mtoroidal=64, ndstep=10000,
+                  nsnap=20),
+}
+_FMT = '%15.6E\n'
+
+
+def _write(path, ints=(), floats=(), data=None, lines=()):
+    '''Write integers, floats, text lines, then *data* in Fortran order.'''
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(''.join('%8d\n' % i for i in ints))
+        f.write(''.join(_FMT % x for x in floats))
+        f.write(''.join(l + '\n' for l in lines))
+        if data is not None:
+            data = np.ravel(data, order='F')
+            f.write((_FMT * data.size) % tuple(data))
+
+
+def _profiles(rng, nrow, ncol):
+    '''Return *nrow* positive monotonic profiles of size *ncol*.'''
+    r = np.linspace(0.1, 0.9, ncol)
+    scale = 1.0 + rng.random((nrow, 1))
+    return scale * (1.0 + 2.0 * r**2)
+
+
+def make_case(path, mpsi=20, mtgrid=32, mtoroidal=8, ndstep=50, nsnap=2,
+              seed=0):
+    '''
+    Create a GTC raw data directory *path*.
+
+    Parameters
+    ----------
+    mpsi, mtgrid, mtoroidal: int
+        radial, poloidal and toroidal grid numbers
+    ndstep: int
+        time steps in history.out, data1d.out etc.
+    nsnap: int
+        number of snapshots, snapNNNNN.out, phi_dir/flux3daNNNNN.out etc.
+
+    Tracked particles in trackp_dir/TRACKP.NNNNN are written every
+    ndiag steps, 8 params of each in two lines, like Fortran does.
+    '''
+    rng = np.random.default_rng(seed)
+    os.makedirs(path, exist_ok=True)
+    ndiag = 4
+    with open(os.path.join(path, 'gtc.out'), 'w') as f:
+        f.write('''Program starts at DATE=20240101  TIME=000000
+ mpsi=  %d
+ mthetamax=  %d
+ mtoroidal=  %d
+ mtdiag=  %d
+ tstep=  0.01
+ ndiag=  %d
+ iload=  1
+ rho0=  0.005
+ r0=  83.5
+ a_minor=  0.36
+ qiflux=  1.4
+ rgiflux=  0.18
+ rg0=  0.1
+ rg1=  0.9
+ zfistep=  1
+''' % (mpsi, mtgrid, mtoroidal, mtgrid, ndiag))
+    # history
+    nsp, mpdiag, nfield, modes, mfdiag = 2, 10, 3, 8, 4
+    ndata = nsp*mpdiag + nfield*(2*modes+mfdiag)
+    _write(os.path.join(path, 'history.out'),
+           ints=(ndstep, nsp, mpdiag, nfield, modes, mfdiag),
+           floats=(0.01*ndiag,), data=rng.random(ndata*ndstep))
+    # data1d, rzf
+    ndata = (mpsi+1)*(nsp*3 + nfield*2)
+    _write(os.path.join(path, 'data1d.out'),
+           ints=(ndstep, mpsi+1, nsp, 1, 3, nfield, 2),
+           data=rng.random(ndata*ndstep))
+    _write(os.path.join(path, 'data1d_density.out'),
+           ints=(ndstep, mpsi+1, nsp, 1),
+           data=rng.random((mpsi+1)*nsp*ndstep))
+    # meshgrid, simugrid
+    _write(os.path.join(path, 'meshgrid.out'),
+           data=_profiles(rng, 7, mpsi+1))
+    _write(os.path.join(path, 'simugrid.out'), ints=(18, mpsi+1),
+           data=_profiles(rng, 18, mpsi+1))
+    # equilibrium
+    n1, nrad, n2, mm, lst = 27, mpsi+1, 6, 5, 12
+    with open(os.path.join(path, 'equilibrium.out'), 'w') as f:
+        f.write('%8d\n%8d\n' % (n1, nrad))
+        f.write(''.join(_FMT % x for x in
+                        np.ravel(_profiles(rng, n1+1, nrad), order='F')))
+        f.write('%8d\n%8d\n%8d\n' % (n2, mm, lst))
+        f.write(''.join(_FMT % x for x in rng.random((n2+2)*mm*lst)))
+    # theta1d
+    nf, nifl, grids = 2, 2, [mtgrid+1, mtgrid+3]
+    _write(os.path.join(path, 'theta1d.out'),
+           ints=(ndstep, nf, nifl, 1, 3, 5, 10, *grids),
+           data=rng.random(nf*sum(grids)*ndstep))
+    # trackp_dir, 2 species, 8 tracked particles per species in each pe
+    npe, ntrackp = 4, 8
+    for pe in range(npe):
+        lines = []
+        for istep in range(ndiag, ndstep*ndiag + 1, ndiag):
+            lines += ['%8d' % istep, '%8d%8d' % (ntrackp, ntrackp)]
+            for tag in range(1, 2*ntrackp + 1):
+                p = rng.random(6)
+                lines += ['%15.6E%15.6E%15.6E%15.6E' % tuple(p[:4]),
+                          '%15.6E%15.6E%15.6E%15.6E' % (
+                              *p[4:], (tag - 1) % ntrackp + 1, pe)]
+        _write(os.path.join(path, 'trackp_dir', 'TRACKP.%05d' % pe),
+               lines=lines)
+    for istep in range(1, nsnap+1):
+        snap = 'snap%05d' % (istep*ndstep//nsnap*ndiag)
+        num = snap[4:]
+        # snapshot
+        nsp3, nvgrid = 3, 16
+        size = ((mpsi+1)*6*nsp3 + nvgrid*4*nsp3
+                + (mtgrid+1)*(mpsi+1)*(3+2) + (mtgrid+1)*mtoroidal*3)
+        _write(os.path.join(path, snap + '.out'),
+               ints=(nsp3, 3, nvgrid, mpsi+1, mtgrid+1, mtoroidal),
+               floats=(2.5,), data=rng.standard_normal(size))
+        # evphase
+        ne = 8
+        _write(os.path.join(path, snap + '_evphase.out'),
+               ints=(2, 1, ne, nvgrid), floats=(0.1, 0.9, 5.0, 0.2, 0.8),
+               data=rng.random(ne*nvgrid*6*2))
+        # phase2d, format=3
+        nsp, nhyb, pnf, xg, yg, ncoord, niflux = 2, 1, 2, 6, 5, 2, 3
+        lines = ['format=3', ' '.join(str(i) for i in
+                                      (nsp, nhyb, pnf, xg, yg, ncoord, niflux))]
+        lines += ['%d %d %d' % (1, 2, 3)] * (niflux+1)
+        lines += ['1 2', '1 2 3 4', '5 10 15', '1 1 1']
+        lines += [' '.join(['1.5']*5)]*2 + [' '.join(['0.5']*5)]*6
+        _write(os.path.join(path, 'phase2d%s.out' % num), lines=lines,
+               data=rng.random(pnf*xg*yg*ncoord*niflux*nsp))
+        # phi_dir/flux3da
+        i0, i1, nfd = mpsi//4, mpsi//4 + 2, 2
+        mt = [mtgrid+1+i for i in range(i1-i0+1)]
+        digrid = sum(m+1 for m in mt)
+        _write(os.path.join(path, 'phi_dir', 'flux3da%s.out' % num),
+               ints=(i0, i1, digrid, mtoroidal, nfd, 1, 4, *mt),
+               data=rng.random(digrid*mtoroidal*nfd))
+        # phi_dir/zetapsi3d
+        mzeach, nj = 4, 3
+        _write(os.path.join(path, 'phi_dir', 'zetapsi3d%s.out' % num),
+               ints=(mzeach, mpsi+1, nj, 0, 8, 16, 2, 1, 2, mtoroidal),
+               data=rng.random(mzeach*(mpsi+1)*nj*2*mtoroidal))
+        # phi_dir/phi_zeta_psi_snap
+        for tor in range(mtoroidal):
+            _write(os.path.join(path, 'phi_dir', 'phi_zeta_psi_%s_tor%04d.out'
+                                % (snap, tor)),
+                   ints=(mzeach, mpsi+1, nj, 0, 8, 16) if tor == 0 else (),
+                   data=rng.random(mzeach*(mpsi+1)*nj))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic GTC raw data directory.")
+    parser.add_argument('path', type=str, help='output directory')
+    parser.add_argument('--size', default='small', choices=list(SIZES),
+                        help="size preset, (default: %(default)s)")
+    for key in SIZES['tiny']:
+        parser.add_argument('--%s' % key, type=int, metavar='N',
+                            help='override %s of size preset' % key)
+    args = parser.parse_args()
+    kwargs = dict(SIZES[args.size])
+    kwargs.update({k: getattr(args, k) for k in kwargs
+                   if getattr(args, k) is not None})
+    make_case(args.path, **kwargs)
+    print("Synthetic GTC case %s: %s" % (args.path, kwargs))
+
+
+if __name__ == '__main__':
+    main()
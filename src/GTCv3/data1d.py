@@ -59,7 +59,7 @@ diagnosis.F90:194-203, ::
 
 import numpy as np
 from .. import tools
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .gtc import Ndigits_tstep
 
@@ -105,16 +105,15 @@ class Data1dConverter(Converter):
         '''Read 'data1d.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header, outdata = read_text_numbers(f, skiprows=7)
 
         sd = {}
         # 1. diagnosis.F90:opendiag():739
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
         for i, key in enumerate(self._datakeys[:7]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
 
         # 2. diagnosis.F90:opendiag():790
-        outdata = np.array([float(n.strip()) for n in outdata[7:]])
         ndata = sd['mpsi+1'] * (sd['nspecies'] * sd['mpdata1d'] +
                                 sd['nfield'] * sd['mfdata1d'])
         if len(outdata) // ndata != sd['ndstep']:
@@ -195,10 +194,11 @@ class _Data1dDigger(Digger):
         *use_ra*: bool
             use psi or r/a, default False
         '''
-        data, tstep, ndiag = self.pckloader.get_many(
-            self.srckeys[0], *self.extrakeys[:2])
+        # srckey may come from another file, e.g. data1d_density.out,
+        # with its own ndstep, so take the window from its own shape
+        y, x = self.pckloader.getshape(self.srckeys[0])
+        tstep, ndiag = self.pckloader.get_many(*self.extrakeys[:2])
         tstep = round(tstep, Ndigits_tstep)
-        y, x = data.shape
         dt = tstep * ndiag
         X, Y = np.arange(1, x + 1) * dt, np.arange(0, y)
         X = np.around(X, 8)
@@ -251,7 +251,7 @@ class _Data1dDigger(Digger):
                 ylabel = r'$r/a$'
                 acckwargs['use_ra'] = True
         # update
-        data = data[y0:y1, x0:x1]
+        data = self.pckloader.get_slice(self.srckeys[0], np.s_[y0:y1, x0:x1])
         return dict(X=X, Y=Y, Z=data, cutoff_idx=cutoff_idx,
                     title=self._get_title(),
                     ylabel=ylabel, xlabel=r'time($R_0/c_s$)'), acckwargs
@@ -19,7 +19,7 @@ shmilee.F90, shmilee_flux3d_diag, subroutine flux3d_diagnosis
 import re
 import numpy as np
 
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .snapshot import (SnapshotFieldFluxAlphaDigger,
                        SnapshotFieldFluxThetaDigger,
@@ -70,7 +70,11 @@ class Flux3DConverter(Converter):
         r'''Read 'phi_dir/flux3da*\d{5}.out'. '''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            outdata = [f.readline() for i in range(5)]
+            # nfield, mtgrid+1 of iflux0..iflux1
+            nhead = int(outdata[4]) + int(outdata[1]) - int(outdata[0]) + 1
+            header, tmpdata = read_text_numbers(f, skiprows=nhead)
+            outdata.extend(header)
 
         sd = {}
         # 1. parameters
@@ -89,8 +93,6 @@ class Flux3DConverter(Converter):
         mtgrid_dict = {
             ipsi: int(outdata[idx0+i].strip())
             for i, ipsi in enumerate(range(sd['iflux0'], sd['iflux1']+1))}
-        idx0 = idx0 + len(mtgrid_dict)
-        tmpdata = np.array([float(n.strip()) for n in outdata[idx0:]])
         shape = (sd['digrid'], sd['mtoroidal'], sd['nfield'])
         size = sd['digrid'] * sd['mtoroidal'] * sd['nfield']
         assert len(tmpdata) == size
@@ -154,19 +156,9 @@ class Flux3DThetaDigger(Flux3DAlphaDigger, SnapshotFieldFluxThetaDigger):
         return self.pckloader['gtc/qmesh'][self.ipsi]
 
 
-def _flux3d_interpolate_worker(i, total, data, q, iM, iN, fielddir):
-    '''
-    Interpolate flux(alpha,zeta) -> flux(theta,zeta). Return flux(theta,zeta)
-    '''
-    logstep = max(1, round(total/10))
-    res = _fluxdata_theta_interpolation(data, q, iM, iN, fielddir)[2]
-    if (i+1) % logstep == 0 or i == 0 or i+1 == total:
-        dlog.info("Interpolation %d/%d, done." % (i+1, total))
-    return res
-
-
 def flux3d_interpolate_stack(loader, iM, iN, field, fielddir=0,
-                             float64=False, savepath=None, dry=False):
+                             float64=False, savepath=None, dry=False,
+                             chunksize=None):
     '''
     Interpolate of flux(alpha,zeta) -> flux(theta,zeta), then stack 2-D array
     into a 4-D array flux(time,psi,theta,zeta).
@@ -184,10 +176,17 @@ def flux3d_interpolate_stack(loader, iM, iN, field, fielddir=0,
     savepath: str, pcksaver path
         default 'gtcv3-XXXXXX.flux4d-%s-iM%d-iN%d.npz' % (field, iM, iN)
     dry: bool, dry run, show array info then return
+    chunksize: int, steps interpolated together for each psi,
+        default None, steps in about 64MB float64 array
+
+    Notes
+    -----
+    Interpolation indices and weights are calculated once for each psi,
+    then applied to chunks of steps, so only one chunk of raw-data
+    is loaded at the same time.
     '''
     import os
     import time as mod_time
-    import multiprocessing
     from ..savers import get_pcksaver
     from .. import __gversion__
 
@@ -236,26 +235,19 @@ def flux3d_interpolate_stack(loader, iM, iN, field, fielddir=0,
         f4d_arr = np.zeros(shape, dtype=np.float64)
     else:
         f4d_arr = np.zeros(shape, dtype=np.float32)
+    if chunksize is None:
+        chunksize = max(1, 2**23 // (iM*iN))
     for i in range(len(psis)):
-        dlog.info("Getting raw-data of %s(ipsi=%s), q=%f" %
+        dlog.info("Interpolating %s(ipsi=%s), q=%f" %
                   (field, psis[i], qs[i]))
-        rawdata = loader.get_many(*keys[:, i])
-        total = len(rawdata)
-        nproc = min(multiprocessing.cpu_count(), total)
-        with multiprocessing.Pool(processes=nproc) as pool:
-            results = [
-                pool.apply_async(
-                    _flux3d_interpolate_worker,
-                    (idx, total, rawdata[idx], qs[i], iM, iN, fielddir)
-                ) for idx in range(total)
-            ]
-            pool.close()
-            pool.join()
-        dlog.info("Set interpolate-data of ipsi=%s, q=%f" % (psis[i], qs[i]))
-        # tmp(time, psi=i, theta, zeta)
-        tmp = [res.get() for res in results]
-        f4d_arr[:, i, :, :] = tmp
-        loader.clear_cache()
+        for t0 in range(0, len(steps), chunksize):
+            t1 = min(t0 + chunksize, len(steps))
+            rawdata = np.array(loader.get_many(*keys[t0:t1, i]))
+            # tmp(time, psi=i, theta, zeta)
+            f4d_arr[t0:t1, i, :, :] = _fluxdata_theta_interpolation(
+                rawdata, qs[i], iM, iN, fielddir)[2]
+            loader.clear_cache()
+        dlog.info("Interpolation %d/%d, done." % (i+1, len(psis)))
     desc = "Flux4D array: %s(time, psi, theta, zeta)." % field
     desc = ("%s\nCreated by gdpy3 v%s.\nCreated on %s."
             % (desc, __gversion__, mod_time.asctime()))
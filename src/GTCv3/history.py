@@ -57,7 +57,7 @@ diagfast(mpdiag), pushf.F90:472-483
 import numpy as np
 
 from .. import tools
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .gtc import Ndigits_tstep
 
@@ -100,18 +100,17 @@ class HistoryConverter(Converter):
         '''Read 'history.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header, outdata = read_text_numbers(f, skiprows=7)
 
         sd = {}
         # 1. diagnosis.F90:opendiag():734-735
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
         for i, key in enumerate(self._datakeys[:6]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
         # 1. tstep*ndiag
-        sd.update({'tstep*ndiag': float(outdata[6].strip())})
+        sd.update({'tstep*ndiag': float(header[6].strip())})
 
         # 2. diagnosis.F90:opendiag():729::
-        outdata = np.array([float(n.strip()) for n in outdata[7:]])
         ndata = sd['nspecies'] * sd['mpdiag'] + \
             sd['nfield'] * (2 * sd['modes'] + sd['mfdiag'])
         if len(outdata) // ndata != sd['ndstep']:
@@ -222,7 +221,7 @@ class HistoryParticleDigger(_TimeCutoff):
             If R0Ln=None, use a_minor as default Ln.
         '''
         time, x0, x1, acckws = super(HistoryParticleDigger, self)._dig(kwargs)
-        data = self.pckloader.get_many(self.srckeys[0])[0][:, x0:x1]
+        data = self.pckloader.get_slice(self.srckeys[0], np.s_[:, x0:x1])
         if self.fignum == self.section[1]:
             return dict(
                 time=time,
@@ -316,7 +315,7 @@ class HistoryFieldDigger(_TimeCutoff):
 
     def _dig(self, kwargs):
         time, x0, x1, acckws = super(HistoryFieldDigger, self)._dig(kwargs)
-        data = self.pckloader.get_many(self.srckeys[0])[0][:, x0:x1]
+        data = self.pckloader.get_slice(self.srckeys[0], np.s_[:, x0:x1])
         return dict(
             time=time,
             field=data[0],
@@ -368,10 +367,11 @@ class HistoryFieldModeDigger(_TimeCutoff):
         _timedata = super(HistoryFieldModeDigger, self)._dig(kwargs)
         time, x0, x1, acckwargs = _timedata
         fstr = field_tex_str[self.section[1]]
-        yreal, yimag, ndstep, tstep, ndiag, nmodes, mmodes, rho0 = \
-            self.pckloader.get_many(*self.srckeys, *self.extrakeys[:6])
+        yreal, yimag = self.pckloader.get_many_slices(
+            np.s_[self._idx-1, x0:x1], *self.srckeys)
+        ndstep, tstep, ndiag, nmodes, mmodes, rho0 = \
+            self.pckloader.get_many(*self.extrakeys[:6])
         tstep = round(tstep, Ndigits_tstep)
-        yreal, yimag = yreal[self._idx-1, x0:x1], yimag[self._idx-1, x0:x1]
         dt = tstep * ndiag
         n = nmodes[self._idx-1]
         m = mmodes[self._idx-1]
@@ -22,8 +22,7 @@ diagnosis.F90, subroutine diagnosis:37-50
     endif
 '''
 
-import numpy
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 
 _all_Converters = ['MeshgridConverter']
@@ -50,17 +49,16 @@ class MeshgridConverter(Converter):
         '''Read 'meshgrid.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            _, outdata = read_text_numbers(f)
 
         sd = {}
         shape = (7, len(outdata) // 7)
-        outdata = outdata[:len(outdata) // 7 * 7]
         if len(outdata) % 7 != 0:
             clog.warning("Missing some raw data in '%s'! Guess the shape '%s'."
                          % (self.files, shape))
+        outdata = outdata[:len(outdata) // 7 * 7]
 
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:]))
-        outdata = numpy.array([float(n.strip()) for n in outdata])
         outdata = outdata.reshape(shape, order='F')
         for i, key in enumerate(self._datakeys):
             sd.update({key: outdata[i]})
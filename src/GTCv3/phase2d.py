@@ -59,7 +59,8 @@ shmilee.F90, subroutine phase2d_diagnosis
 '''
 
 import numpy as np
-from ..cores.converter import Converter, clog
+from .. import tools
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .snapshot import _snap_get_time
 
@@ -110,15 +111,23 @@ class Phase2dConverter(Converter):
         '''Read 'phase2d%05d.out' % istep.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
-        if 'format=' not in outdata[0]:
-            return self._read_old_format(outdata)
-        elif 'format=2' in outdata[0]:
-            fmt = 2
-        elif 'format=3' in outdata[0]:
-            fmt = 3
-        else:
-            raise ValueError('Wrong phase2d format: ' + outdata[0])
+            outdata = [f.readline(), f.readline()]
+            if 'format=' not in outdata[0]:
+                fmt = 1
+                # 'p2d_niflux' is the 6th parameter in old format
+                nhead = 5 + int(outdata[0].split()[5])
+            elif 'format=2' in outdata[0]:
+                fmt = 2
+                nhead = 9 + int(outdata[1].split()[6])
+            elif 'format=3' in outdata[0]:
+                fmt = 3
+                nhead = 13 + int(outdata[1].split()[6])
+            else:
+                raise ValueError('Wrong phase2d format: ' + outdata[0])
+            header, data = read_text_numbers(f, skiprows=nhead)
+            outdata.extend(header)
+        if fmt == 1:
+            return self._read_old_format(outdata, data)
         sd = {'format': fmt}
         outdata = outdata[1:]
 
@@ -155,7 +164,6 @@ class Phase2dConverter(Converter):
                 [float(i.strip()) for i in outdata[idx+3].split()],
             ]).T
             assert sd['xymax_inv'].shape == (5, 3)
-            idx = idx + 4  # xymax ... 4 lines
         elif fmt == 3:
             clog.debug("Filling datakeys: %s ..." % 'xymax, xymin, xyrange')
             sd['xymax'] = [float(i.strip()) for i in outdata[idx].split()]
@@ -172,13 +180,11 @@ class Phase2dConverter(Converter):
                 [float(i.strip()) for i in outdata[idx+7].split()],
             ]).T
             assert sd['xymin_org'].shape == (5, 3)
-            idx = idx + 8  # xymax ... 8 lines
 
         # 2. data
         shape = (nfield, sd['xgrid'], sd['ygrid'], ncoord, niflux,
                  sd['nspecies'])
-        outdata = np.array([float(n.strip()) for n in outdata[idx:]])
-        outdata = outdata.reshape(shape, order='F')
+        outdata = data.reshape(shape, order='F')
         particles = [('ion', 0)]
         if sd['nspecies'] == 2:
             if sd['nhybrid'] > 0:
@@ -206,7 +212,7 @@ class Phase2dConverter(Converter):
         #    split to pdf(xgrid, ygrid, p2d_niflux)
     )
 
-    def _read_old_format(self, outdata):
+    def _read_old_format(self, outdata, data):
         sd = {'format': 1, 'p2d_ncoord': 1}
         # 1. parameters
         clog.debug("Filling datakeys: %s ..." % str(self._fmt1_keys[:8]))
@@ -234,10 +240,8 @@ class Phase2dConverter(Converter):
         sd['xymax_inv'][sd['coordx']-1] = xmax[1:]
         sd['xymax_inv'][sd['coordy']-1] = ymax[1:]
         # 2. data
-        idx = idx + 5
         shape = (nfield, sd['xgrid'], sd['ygrid'], niflux, sd['nspecies'])
-        outdata = np.array([float(n.strip()) for n in outdata[idx:]])
-        outdata = outdata.reshape(shape, order='F')
+        outdata = data.reshape(shape, order='F')
         particles = [('ion', 0)]
         if sd['nspecies'] == 2:
             if sd['nhybrid'] > 0:
@@ -541,23 +545,7 @@ class Phase2dResonanceDigger(Phase2dDigger):
         else:
             N = sum(Z.shape)
             LineX = np.linspace(resZ.min(), resZ.max(), N)
-            dx = (resZ.max() - resZ.min())/(N-1)
-            LineY = np.zeros(N)
-            ix, iy = resZ.shape
-            for i in range(ix):
-                for j in range(iy):
-                    # idx = np.nanargmin(np.abs(LineX-resZ[i, j]))
-                    # LineY[idx] += Z[i, j]
-                    idx = np.where(LineX < resZ[i, j])[0]
-                    if idx.size == 0:
-                        LineY[0] += Z[i, j]
-                    elif idx.size == N:
-                        LineY[N-1] += Z[i, j]
-                    else:
-                        idx = idx[-1]
-                        dp = (resZ[i, j] - LineX[idx])/dx
-                        LineY[idx] += (1.0-dp)*Z[i, j]
-                        LineY[idx+1] += dp*Z[i, j]
+            LineY = tools.linear_deposit(LineX, resZ, Z)
             idx = np.where(abs(LineY) > abs(LineY).max()*1e-4)[0]
             xlim = sorted([LineX[0], LineX[idx[-1]]])
             # if idx.size > 0 and idx[-1] != N-1:  # cutoff
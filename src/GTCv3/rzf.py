@@ -7,7 +7,7 @@ Residual zonal flow Cores.
 '''
 
 import numpy as np
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .. import tools
 from .data1d import _Data1dDigger
@@ -39,14 +39,13 @@ class Data1dDensityConverter(Converter):
         '''Read 'data1d_density.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header, outdata = read_text_numbers(f, skiprows=4)
 
         sd, outsd = {}, {}
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:4]))
         for i, key in enumerate(self._datakeys[:4]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
 
-        outdata = np.array([float(n.strip()) for n in outdata[4:]])
         ndata = sd['mpsi+1'] * sd['nspecies']
         if len(outdata) // ndata != sd['ndstep']:
             clog.debug("Filling datakeys: %s ..." % 'ndstep')
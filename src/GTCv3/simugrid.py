@@ -44,7 +44,7 @@ Source fortran code:
 '''
 
 import numpy as np
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .equilibrium import _1d_data_misc
 
@@ -74,11 +74,10 @@ class SimugridConverter(Converter):
         '''Read 'simugrid.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header, outdata = read_text_numbers(f, skiprows=2)
         sd = {}
-        N, mpsi1 = int(outdata[0]), int(outdata[1])
+        N, mpsi1 = int(header[0]), int(header[1])
         assert N in (17, 18)
-        outdata = outdata[2:]
         shape = (N, len(outdata) // N)
         if len(outdata) % N != 0:
             clog.warning("Missing some raw data in '%s'! Guess the shape '%s'."
@@ -87,7 +86,6 @@ class SimugridConverter(Converter):
         else:
             assert shape == (N, mpsi1)
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:]))
-        outdata = np.array([float(n.strip()) for n in outdata])
         outdata = outdata.reshape(shape, order='F')
         for i, key in enumerate(self._datakeys):
             sd.update({key: outdata[i]})
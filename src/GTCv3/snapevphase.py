@@ -20,7 +20,8 @@ shmilee.F90, subroutine snap_loop_evphase_space
 '''
 
 import numpy as np
-from ..cores.converter import Converter, clog
+from .. import tools
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .snapshot import _snap_get_timestr
 from ..deprecation import warn_deprecated
@@ -57,19 +58,18 @@ class SnapEVphaseConverter(Converter):
     def _convert(self):
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header, outdata = read_text_numbers(f, skiprows=9)
 
         sd = {}
         # 1. parameters
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:4]))
         for i, key in enumerate(self._datakeys[:4]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[4:9]))
         for i, key in enumerate(self._datakeys[4:9]):
-            sd.update({key: float(outdata[i+4].strip())})
+            sd.update({key: float(header[i+4].strip())})
         # 2. data
         shape = (sd['ev-negrid'], sd['nvgrid'], 6, sd['nspecies'])
-        outdata = np.array([float(n.strip()) for n in outdata[9:]])
         outdata = outdata.reshape(shape, order='F')
         clog.debug("Filling datakey: %s ..." % 'ion-evphase')
         sd['evphase-ion'] = outdata[:, :, :, 0]
@@ -192,13 +192,10 @@ class SnapEVphaseDigger(Digger):
                 X, Y, iZ, N, least_N, merge_xgrid, merge_ygrid)
             xlim = [X[0], X[-1]]
             ylim = [Y[0], Y[-1]]
-        else:
-            if least_N > 0:
-                for i in range(Y.size):
-                    for j in range(X.size):
-                        if N[i, j] < least_N:
-                            dlog.debug("Drop data [%d, %d]" % (i, j))
-                            Z[i, j] = 0.0
+        elif least_N > 0:
+            drop = N < least_N
+            dlog.debug("Drop data of %d cells" % np.count_nonzero(drop))
+            Z = np.where(drop, 0.0, Z)
 
         return dict(X=X, Y=Y, Z=Z, title=title, xlabel=xlabel,
                     xlim=xlim, ylim=ylim), acckwargs
@@ -210,25 +207,16 @@ class SnapEVphaseDigger(Digger):
         return a/b
 
     def __merge_grids(self, X, Y, iZ, N, least_N, dx, dy):
-        newX = np.array(
-            [np.sum(X[i:i+dx])/X[i:i+dx].size for i in range(0, X.size, dx)])
-        newY = np.array(
-            [np.sum(Y[i:i+dy])/Y[i:i+dy].size for i in range(0, Y.size, dy)])
-        newZ = np.zeros((newY.size, newX.size))
-        dlog.parm('Data shape is %s -> %s' % (iZ.shape, newZ.shape))
-        print(newX, newY, newX.size, newY.size)
-        for jj, j in enumerate(range(0, N.shape[1], dx)):
-            for ii, i in enumerate(range(0, N.shape[0], dy)):
-                a, b = np.sum(iZ[i:i+dy, j:j+dx]), np.sum(N[i:i+dy, j:j+dx])
-                print(jj, j, ii, i, a, b, least_N)
-                if least_N > 0 and b < least_N:
-                    dlog.parm("Drop data [%d, %d]" % (ii, jj))
-                    newZ[ii, jj] = 0.0
-                else:
-                    if a == 0 or b == 0:
-                        newZ[ii, jj] = 0.0
-                    else:
-                        newZ[ii, jj] = a / b
+        newX = tools.block_sum(X, dx, mean=True)
+        newY = tools.block_sum(Y, dy, mean=True)
+        a, b = tools.block_sum(iZ, (dy, dx)), tools.block_sum(N, (dy, dx))
+        dlog.parm('Data shape is %s -> %s' % (iZ.shape, a.shape))
+        newZ = np.divide(a, b, out=np.zeros(a.shape),
+                         where=(a != 0) & (b != 0))
+        if least_N > 0:
+            drop = b < least_N
+            dlog.parm("Drop data of %d merged cells" % np.count_nonzero(drop))
+            newZ[drop] = 0.0
         return newX, newY, newZ
 
     def _post_dig(self, results):
@@ -24,7 +24,7 @@ shmilee.F90, subroutine snap_once snap_loop_phi_zeta_psi
 
 import numpy as np
 
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .snapshot import (
     _snap_get_timestr,
@@ -77,14 +77,14 @@ class SnapPhiZetaPsiConverter(Converter):
             shape = (mzeach, mpsi1, nj)
             j_list = [int(fid.readline()) for j in range(nj)]
             # data
-            outdata = np.array([float(n.strip()) for n in fid.readlines()])
-            phi.extend(outdata.reshape(shape, order='F'))
+            _, outdata = read_text_numbers(fid)
+            phi.append(outdata.reshape(shape, order='F'))
         # tor0001.out ...
         for f in self.files[1:]:
             with self.rawloader.get(f) as fid:
-                outdata = np.array([float(n.strip()) for n in fid.readlines()])
-                phi.extend(outdata.reshape(shape, order='F'))
-        phi = np.array(phi)
+                _, outdata = read_text_numbers(fid)
+                phi.append(outdata.reshape(shape, order='F'))
+        phi = np.concatenate(phi, axis=0)
         mtoroidal = len(self.files)
         assert phi.shape == (mzeach*mtoroidal, mpsi1, nj)
         # 1. parameters
@@ -469,26 +469,16 @@ class SnapPhiTimeSpectrumDigger(SnapPhiSpectrumDigger):
                 time = time[i0:i1]
             else:
                 dlog.warning('Cannot cutoff: %s <= time <= %s!' % (t0, t1))
-        YT1, YT2, nY, rpY = [], [], [], []
         dlog.info('%d snapshot phi data to do ...' % (i1 - i0))
-        _idxlog = (i1 - i0) // 10
-        for idx in range(i0, i1):
-            if idx % _idxlog == 0 or idx == i1 - 1:
-                dlog.info('Calculating [%d/%d] %s' % (
-                    idx+1-i0, i1 - i0, self.srckeys[idx]))
-            data = all_data[idx]
-            if data.shape != (mtgrid, mpsi1):
-                dlog.error("Invalid phi data shape!")
-                return {}, {}
-            Y1, Y2, idx1, idx2 = self._get_spectrum(
-                nmode, rmode, data, mtgrid, mpsi1,
-                acckwargs['smooth'], acckwargs['norm'])
-            YT1.append(Y1)
-            YT2.append(Y2)
-            nY.append(X1[idx1])
-            rpY.append(X2[idx2])
-        YT1, YT2 = np.array(YT1).T, np.array(YT2).T
-        nY, rpY = np.array(nY), np.array(rpY)
+        all_data = all_data[i0:i1]
+        if any(data.shape != (mtgrid, mpsi1) for data in all_data):
+            dlog.error("Invalid phi data shape!")
+            return {}, {}
+        YT1, YT2, idx1, idx2 = self._get_spectrum(
+            nmode, rmode, np.array(all_data), mtgrid, mpsi1,
+            acckwargs['smooth'], acckwargs['norm'])
+        YT1, YT2 = YT1.T, YT2.T
+        nY, rpY = X1[idx1], X2[idx2]
         return dict(
             nX=X1, nY=nY, toroidal_spectrum=YT1, nmode=nmode,
             rX=X2, rpY=rpY, radial_spectrum=YT2, rmode=rmode,
@@ -33,9 +33,13 @@ field quantities: phi, a_para, fluidne.
 '''
 
 import re
+import json
+import functools
+import threading
+import collections
 import numpy as np
 from .. import tools
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .gtc import Ndigits_tstep
 
@@ -95,17 +99,15 @@ class SnapshotConverter(Converter):
         '''Read 'snap%05d.out' % istep.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header, outdata = read_text_numbers(f, skiprows=7)
 
         sd = {}
         # 1. parameters
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:7]))
         for i, key in enumerate(self._datakeys[:6]):
-            sd.update({key: int(outdata[i].strip())})
+            sd.update({key: int(header[i].strip())})
         # 1. T_up, 1.0/emax_inv
-        sd.update({'T_up': float(outdata[6].strip())})
-
-        outdata = np.array([float(n.strip()) for n in outdata[7:]])
+        sd.update({'T_up': float(header[6].strip())})
 
         # 2. profile(0:mpsi,6,nspecies)
         tempsize = sd['mpsi+1'] * 6 * sd['nspecies']
@@ -321,37 +323,51 @@ class SnapshotFieldFluxAlphaDigger(Digger):
                     ylabel=r'$\alpha$', aspect='equal')
 
 
-def _fluxdata_theta_interpolation(data, q, iM, iN, fielddir):
-    '''Interpolation flux(alpha,zeta) -> flux(theta,zeta).'''
-    aM, aN = data.shape  # old grids
+@functools.lru_cache(maxsize=32)
+def _fluxdata_theta_weights(q, iM, iN, fielddir, shape):
+    '''
+    Return grids, indices and weights of interpolation
+    flux(alpha,zeta) -> flux(theta,zeta) for data in *shape*.
+    '''
+    aM, aN = shape  # old grids
     sep = round(aM*(1.0-1.0/q))  # q>=1
-    if sep == 0:
-        lastdata = data[:, 0]
-    else:
-        # !! seq is int, so tile zeta may have tiny problem
-        # !! TODO data interpolation at zeta=2pi
-        lastdata = np.append(data[-sep:, 0], data[:(aM-sep), 0])
-    data = np.append(data, np.array([lastdata]).T, axis=1)  # [0, 2pi]
-    aN += 1
+    aN += 1  # [0, 2pi], column aN-1 is column 0 shifted by sep
     pi2 = 2*np.pi
     zeta = np.arange(0, iN) / (iN-1) * pi2
     theta = np.arange(0, iM) / (iM-1) * pi2
-    res = np.zeros((iM, iN))
-    for ii, zdum in enumerate(zeta):
-        i = max(0, min(int(zdum/pi2*(aN-1)), (aN - 2)))  # left
-        wz = zdum/(pi2/(aN-1)) - i
-        # print('i=', i, ', wz=', wz)
-        for jj, tdum in enumerate(theta):
-            if (fielddir == 1 or fielddir == 3):
-                adum = np.mod(tdum - (zdum-pi2)/q, pi2)
-            else:
-                adum = np.mod(tdum - zdum/q, pi2)
-            j = max(0, min(int(adum/pi2*(aM-1)), (aM - 2)))  # lower
-            wt = adum/(pi2/(aM-1)) - j
-            # print('j=', j, ', wt=', wt)
-            res[jj, ii] = (data[j, i+1]*(1-wt) + data[j+1, i+1]*wt)*wz \
-                + (data[j, i]*(1-wt) + data[j+1, i]*wt)*(1-wz)
-    return theta, zeta, res
+    i = np.clip((zeta/pi2*(aN-1)).astype(int), 0, aN - 2)  # left
+    wz = zeta/(pi2/(aN-1)) - i
+    if (fielddir == 1 or fielddir == 3):
+        adum = np.mod(theta[:, None] - (zeta[None, :]-pi2)/q, pi2)
+    else:
+        adum = np.mod(theta[:, None] - zeta[None, :]/q, pi2)
+    j = np.clip((adum/pi2*(aM-1)).astype(int), 0, aM - 2)  # lower
+    wt = adum/(pi2/(aM-1)) - j
+    i = np.broadcast_to(i, j.shape)
+    corners = []
+    for r, c in ((j, i), (j+1, i), (j, i+1), (j+1, i+1)):
+        # !! seq is int, so tile zeta may have tiny problem
+        # !! TODO data interpolation at zeta=2pi
+        last = c == aN - 1
+        corners.append((np.where(last, (r - sep) % aM, r),
+                        np.where(last, 0, c)))
+    wz = np.broadcast_to(wz, wt.shape)
+    for arr in (theta, zeta, wt, wz):
+        arr.flags.writeable = False
+    return theta, zeta, corners, wt, wz
+
+
+def _fluxdata_theta_interpolation(data, q, iM, iN, fielddir):
+    '''
+    Interpolation flux(alpha,zeta) -> flux(theta,zeta).
+    *data* can be a stack of fluxes, shape (..., alpha, zeta).
+    '''
+    theta, zeta, corners, wt, wz = _fluxdata_theta_weights(
+        q, iM, iN, fielddir, data.shape[-2:])
+    (r00, c00), (r10, c10), (r01, c01), (r11, c11) = corners
+    res = (data[..., r01, c01]*(1-wt) + data[..., r11, c11]*wt)*wz \
+        + (data[..., r00, c00]*(1-wt) + data[..., r10, c10]*wt)*(1-wz)
+    return theta.copy(), zeta.copy(), res
 
 
 class SnapshotFieldFluxThetaDigger(SnapshotFieldFluxAlphaDigger):
@@ -883,27 +899,41 @@ class SnapshotFieldSpectrumDigger(Digger):
         self._fignum = '%s_spectrum' % self.section[1]
         self.kwoptions = None
 
+    @staticmethod
+    def _fold_power(power, n, period, nmode):
+        '''
+        Sum power of mode j and -j, j<*nmode*. *power* is got by rfft of
+        *n* points, and -j is at index *period*-j in full fft.
+        '''
+        j = np.arange(1, nmode)
+        k = (period - j) % n
+        k = np.where(k > n // 2, n - k, k)  # |yy[k]| == |yy[n-k]|
+        res = np.empty(power.shape[:-1] + (nmode,))
+        res[..., 0] = power[..., 0]
+        res[..., 1:] = power[..., j] + power[..., k]
+        return res
+
     def _get_spectrum(self, mmode, pmode, fluxdata, mtgrid, mtoroidal,
                       smooth, norm):
-        Y1, Y2 = np.zeros(mmode), np.zeros(pmode)
-        for i in range(mtoroidal):
-            yy = np.fft.fft(fluxdata[:, i])
-            Y1[0] = Y1[0] + (abs(yy[0]))**2
-            for j in range(1, mmode):
-                Y1[j] = Y1[j] + (abs(yy[j]))**2 + (abs(yy[mtgrid - j]))**2
+        '''
+        Return poloidal, parallel spectra and indices of their maxima.
+        *fluxdata* can be a stack of data, shape (..., theta, zeta).
+        '''
+        fluxdata = np.asarray(fluxdata)
+        P1 = np.square(np.abs(np.fft.rfft(fluxdata, axis=-2))).sum(axis=-1)
+        Y1 = self._fold_power(P1, fluxdata.shape[-2], mtgrid, mmode)
         Y1 = np.sqrt(Y1 / mtoroidal) / mtgrid
-        for i in range(mtgrid):
-            yy = np.fft.fft(fluxdata[i, :])
-            Y2[0] = Y2[0] + (abs(yy[0]))**2
-            for j in range(1, pmode):
-                Y2[j] = Y2[j] + (abs(yy[j]))**2 + (abs(yy[mtoroidal - j]))**2
+        P2 = np.square(np.abs(np.fft.rfft(
+            fluxdata[..., :mtgrid, :], axis=-1))).sum(axis=-2)
+        Y2 = self._fold_power(P2, fluxdata.shape[-1], mtoroidal, pmode)
         Y2 = np.sqrt(Y2 / mtgrid) / mtoroidal
         if smooth:
             Y1 = tools.savgolay_filter(Y1, info='spectrum')
             Y2 = tools.savgolay_filter(Y2, info='spectrum')
         if norm:
-            Y1, Y2 = Y1/Y1.max(), Y2/Y2.max()
-        idx1, idx2 = np.argmax(Y1), np.argmax(Y2)
+            Y1 = Y1/Y1.max(axis=-1, keepdims=True)
+            Y2 = Y2/Y2.max(axis=-1, keepdims=True)
+        idx1, idx2 = np.argmax(Y1, axis=-1), np.argmax(Y2, axis=-1)
         return Y1, Y2, idx1, idx2
 
     def _set_params(self, kwargs, mtgrid, mtoroidal,
@@ -1036,6 +1066,28 @@ class SnapshotFieldSpectrumTimeDigger(SnapshotFieldSpectrumDigger):
         r'^(?P<s>snap)\d{5,7}/mtgrid\+1',
         r'^(?P<s>snap)\d{5,7}/mtoroidal']
     post_template = ('tmpl_z111p', 'tmpl_contourf', 'tmpl_line')
+    _chunksize = 256  # snapshots calculated together
+    # digger cores are regenerated after update, so spectra are kept
+    # in the class, params -> {key: (ident, Y1, Y2)}, last used at end
+    _spectrum_memo = collections.OrderedDict()
+    _spectrum_memo_lock = threading.Lock()
+    _spectrum_memo_maxsize = 8
+
+    @classmethod
+    def clear_spectrum_memo(cls):
+        '''Remove all spectra kept for incremental calculation.'''
+        with cls._spectrum_memo_lock:
+            cls._spectrum_memo.clear()
+
+    def _get_spectrum_memo(self, params):
+        '''Return memo dict of *params*, keep last used ones.'''
+        cls = type(self)
+        with cls._spectrum_memo_lock:
+            memo = cls._spectrum_memo.setdefault(params, {})
+            cls._spectrum_memo.move_to_end(params)
+            while len(cls._spectrum_memo) > cls._spectrum_memo_maxsize:
+                cls._spectrum_memo.popitem(last=False)
+        return memo
 
     def _dig(self, kwargs):
         '''*tcutoff*: [t0,t1], t0 t1 float
@@ -1054,24 +1106,14 @@ class SnapshotFieldSpectrumTimeDigger(SnapshotFieldSpectrumDigger):
             self.kwoptions, kwargs, acckwargs)
         if time is None:
             return {}, {}
-        YT1, YT2, mY, pY = [], [], [], []
-        for idx in range(i0, i1):
-            if idx % _idxlog == 0 or idx == i1 - 1:
-                dlog.info('Calculating [%d/%d] %s' % (
-                    idx+1-i0, i1 - i0, self.srckeys[idx]))
-            fluxdata = self.pckloader.get(self.srckeys[idx])
-            if fluxdata.shape != (mtgrid1, mtoroidal):
-                dlog.error("Invalid fluxdata shape!")
-                return {}, {}
-            Y1, Y2, idx1, idx2 = self._get_spectrum(
-                mmode, pmode, fluxdata, mtgrid, mtoroidal,
-                acckwargs['smooth'], acckwargs['norm'])
-            YT1.append(Y1)
-            YT2.append(Y2)
-            mY.append(X1[idx1])
-            pY.append(X2[idx2])
-        YT1, YT2 = np.array(YT1).T, np.array(YT2).T
-        mY, pY = np.array(mY), np.array(pY)
+        res = self._get_time_spectrum(
+            self.srckeys[i0:i1], mmode, pmode, mtgrid1, mtoroidal,
+            acckwargs['smooth'], acckwargs['norm'])
+        if res is None:
+            return {}, {}
+        YT1, YT2 = res
+        mY, pY = X1[np.argmax(YT1, axis=1)], X2[np.argmax(YT2, axis=1)]
+        YT1, YT2 = YT1.T, YT2.T
         fstr = field_tex_str[self.section[1]]
         return dict(
             mX=X1, mY=mY, poloidal_spectrum=YT1, mmode=mmode,
@@ -1079,6 +1121,64 @@ class SnapshotFieldSpectrumTimeDigger(SnapshotFieldSpectrumDigger):
             time=time, fstr=r'$%s$' % fstr,
         ), acckwargs
 
+    def _get_spectra_idents(self, keys):
+        '''
+        Return raw files info of groups of *keys* in manifest,
+        or None if no manifest.
+        '''
+        if 'manifest' not in self.pckloader:
+            return None
+        manifest = json.loads(self.pckloader.get('manifest'))
+        idents = []
+        for key in keys:
+            files = manifest.get(key.split('/')[0])
+            idents.append(json.dumps(files) if files else None)
+        return idents
+
+    def _get_time_spectrum(self, keys, mmode, pmode, mtgrid1, mtoroidal,
+                           smooth, norm):
+        '''
+        Return spectra of fluxdata *keys*, shape (len(keys), mmode|pmode).
+        Spectra got before are reused if their raw files are unchanged,
+        so only new snapshots of a running case are calculated.
+        They are kept in the class for the last 8 pckloader paths and
+        parameters, use :meth:`clear_spectrum_memo` to free them.
+        '''
+        params = (self.pckloader.path, mmode, pmode, mtgrid1, mtoroidal,
+                  smooth, norm)
+        memo = self._get_spectrum_memo(params)
+        with self._spectrum_memo_lock:
+            memo_copy = dict(memo)
+        idents = self._get_spectra_idents(keys) or [None]*len(keys)
+        YT1, YT2 = np.empty((len(keys), mmode)), np.empty((len(keys), pmode))
+        todo = []
+        for idx, (key, ident) in enumerate(zip(keys, idents)):
+            old = memo_copy.get(key)
+            if ident is not None and old is not None and old[0] == ident:
+                YT1[idx], YT2[idx] = old[1:]
+            else:
+                todo.append(idx)
+        if len(todo) < len(keys):
+            dlog.info('Reuse %d spectra calculated before.'
+                      % (len(keys) - len(todo)))
+        for c0 in range(0, len(todo), self._chunksize):
+            chunk = todo[c0:c0+self._chunksize]
+            dlog.info('Calculating [%d/%d] %s' % (
+                c0 + len(chunk), len(todo), keys[chunk[-1]]))
+            fluxdata = self.pckloader.get_many(*[keys[i] for i in chunk])
+            if any(d.shape != (mtgrid1, mtoroidal) for d in fluxdata):
+                dlog.error("Invalid fluxdata shape!")
+                return None
+            Y1, Y2, _, _ = self._get_spectrum(
+                mmode, pmode, np.array(fluxdata), mtgrid1 - 1, mtoroidal,
+                smooth, norm)
+            YT1[chunk], YT2[chunk] = Y1, Y2
+            with self._spectrum_memo_lock:
+                for i, idx in enumerate(chunk):
+                    if idents[idx] is not None:
+                        memo[keys[idx]] = (idents[idx], Y1[i], Y2[i])
+        return YT1, YT2
+
     def _post_dig(self, results):
         r = results
         ax1_calc = dict(X=r['time'], Y=r['mX'], Z=r['poloidal_spectrum'],
@@ -1148,8 +1248,8 @@ class SnapshotFieldFluxTimeDigger(Digger):
             if idx % _idxlog == 0 or idx == i1 - 1:
                 dlog.info('Collecting [%d/%d] %s' % (
                     idx+1-i0, i1 - i0, self.srckeys[idx]))
-            fluxdata = self.pckloader.get(self.srckeys[idx])
-            data.append(fluxdata[:, izeta])
+            data.append(self.pckloader.get_slice(
+                self.srckeys[idx], np.s_[:, izeta]))
         data = np.array(data).T  # (alpha, time)
         y = data.shape[0]
         alpha = np.arange(0, y) / (y-1) * 2 * np.pi  # [0,2pi]
@@ -1209,8 +1309,8 @@ class SnapshotFieldPoloidalTimeDigger(Digger):
             if idx % _idxlog == 0 or idx == i1 - 1:
                 dlog.info('Collecting [%d/%d] %s' % (
                     idx+1-i0, i1 - i0, self.srckeys[idx]))
-            poloidata = self.pckloader.get(self.srckeys[idx])
-            data.append(poloidata[:, ipsi])
+            data.append(self.pckloader.get_slice(
+                self.srckeys[idx], np.s_[:, ipsi]))
         data = np.array(data).T  # (theta, time)
         y = data.shape[0]
         theta = np.arange(0, y) / (y-1) * 2 * np.pi  # [0,2pi]
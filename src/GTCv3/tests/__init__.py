@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import unittest
+import numpy
+
+from ...loaders import get_pckloader
+from ..data1d import Data1dFluxDigger
+from ..rzf import Data1dDensityDigger
+
+MPSI, NDSTEP, NDSTEP_DENSITY = 20, 50, 49
+DATA = {
+    'gtc': {'tstep': 0.01, 'ndiag': 4},
+    'data1d': {
+        'mpsi+1': MPSI + 1,
+        'ndstep': NDSTEP,
+        'i-particle-flux': numpy.random.rand(MPSI + 1, NDSTEP),
+        # data1d_density.out is shorter than data1d.out
+        'i-density': numpy.random.rand(MPSI + 1, NDSTEP_DENSITY),
+    },
+}
+
+
+class TestData1dDigger(unittest.TestCase):
+    '''
+    Test window of data1d diggers
+    '''
+
+    def setUp(self):
+        self.pck = get_pckloader(DATA)
+
+    def dig(self, Digger, srckey, **kwargs):
+        core = [c for c in Digger.generate_cores(self.pck)
+                if c.srckeys[0] == srckey][0]
+        return core.dig(**kwargs)[0]
+
+    def test_flux_window(self):
+        res = self.dig(Data1dFluxDigger, 'data1d/i-particle-flux')
+        self.assertEqual(res['X'].size, NDSTEP)
+        self.assertEqual(res['Y'].size, MPSI + 1)
+        self.assertEqual(res['Z'].shape, (MPSI + 1, NDSTEP))
+
+    def test_shorter_density_window(self):
+        res = self.dig(Data1dDensityDigger, 'data1d/i-density')
+        self.assertEqual(res['X'].size, NDSTEP_DENSITY)
+        self.assertEqual(res['Z'].shape, (MPSI + 1, NDSTEP_DENSITY))
+        self.assertEqual(res['extrema'].size, NDSTEP_DENSITY)
+        res = self.dig(Data1dDensityDigger, 'data1d/i-density',
+                       tcutoff=[0.1, 1.0], pcutoff=[2, 10])
+        self.assertEqual(res['Z'].shape, (res['Y'].size, res['X'].size))
+        self.assertEqual(res['Y'].size, 9)
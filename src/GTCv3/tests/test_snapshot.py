@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import json
+import unittest
+import unittest.mock
+import numpy
+
+from ...loaders import get_pckloader
+from ..snapshot import SnapshotFieldSpectrumTimeDigger as TimeDigger
+
+MTGRID1, MTOROIDAL = 33, 8
+
+
+def snap_data(steps):
+    data = {'gtc': {'tstep': 0.01}, 'manifest': json.dumps({
+        'snap%05d' % s: [['snap%05d.out' % s, 100, 1.0]] for s in steps})}
+    for s in steps:
+        data['snap%05d' % s] = {
+            'fluxdata-phi': numpy.random.rand(MTGRID1, MTOROIDAL),
+            'mtgrid+1': MTGRID1, 'mtoroidal': MTOROIDAL}
+    return data
+
+
+class TestSnapshotSpectrumTime(unittest.TestCase):
+    '''
+    Test spectra kept for incremental calculation.
+    '''
+
+    def setUp(self):
+        TimeDigger.clear_spectrum_memo()
+        self.addCleanup(TimeDigger.clear_spectrum_memo)
+
+    def time_spectrum(self, steps):
+        core = TimeDigger.generate_cores(get_pckloader(snap_data(steps)))[0]
+        keys = core.srckeys[:len(steps)]
+        return core._get_time_spectrum(
+            keys, 6, 2, MTGRID1, MTOROIDAL, False, True)
+
+    def test_spectrum_memo(self):
+        YT1, YT2 = self.time_spectrum([10, 20])
+        self.assertEqual((YT1.shape, YT2.shape), ((2, 6), (2, 2)))
+        get_spectrum = TimeDigger._get_spectrum
+        with unittest.mock.patch.object(
+                TimeDigger, '_get_spectrum',
+                autospec=True, side_effect=get_spectrum) as mock:
+            # only the new snapshot is calculated
+            self.time_spectrum([10, 20, 30])
+            self.assertEqual(mock.call_count, 1)
+            self.assertEqual(mock.call_args[0][3].shape[0], 1)
+            TimeDigger.clear_spectrum_memo()
+            self.time_spectrum([10, 20, 30])
+            self.assertEqual(mock.call_args[0][3].shape[0], 3)
@@ -37,7 +37,7 @@ Source fortran code:
 
 import numpy as np
 from .. import tools
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .gtc import Ndigits_tstep
 from .snapshot import (
@@ -74,25 +74,24 @@ class Theta1dConverter(Converter):
         '''Read 'theta1d.out'.'''
         with self.rawloader.get(self.files) as f:
             clog.debug("Read file '%s'." % self.files)
-            outdata = f.readlines()
+            header = [f.readline() for i in range(3)]
+            nfield, niflux = int(header[1].strip()), int(header[2].strip())
+            _h, outdata = read_text_numbers(f, skiprows=nfield + 2*niflux)
+            header.extend(_h)
 
         sd = {}
         # 1. parameters
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[:3]))
         for i, key in enumerate(self._datakeys[:3]):
-            sd.update({key: int(outdata[i].strip())})
-        nfield = sd['the_nfield']
-        niflux = sd['the_niflux']
+            sd.update({key: int(header[i].strip())})
         clog.debug("Filling datakeys: %s ..." % str(self._datakeys[3:6]))
         idx = 3
-        sd['the_fields'] = [int(i.strip()) for i in outdata[idx:idx+nfield]]
+        sd['the_fields'] = [int(i.strip()) for i in header[idx:idx+nfield]]
         idx = idx + nfield
-        sd['the_ifluxes'] = [int(i.strip()) for i in outdata[idx:idx+niflux]]
-        idx = idx + niflux
-        sd['the_grids'] = [int(i.strip()) for i in outdata[idx:idx+niflux]]
+        sd['the_ifluxes'] = [int(i.strip()) for i in header[idx:idx+niflux]]
         idx = idx + niflux
+        sd['the_grids'] = [int(i.strip()) for i in header[idx:idx+niflux]]
         # 2. data
-        outdata = np.array([float(n.strip()) for n in outdata[idx:]])
         ngrid = sum(sd['the_grids'])
         ndata = nfield*ngrid
         if len(outdata) // ndata != sd['ndstep']:
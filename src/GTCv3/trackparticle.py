@@ -25,7 +25,8 @@ tracking.F90, subroutine write_tracked_particles:270:278-289
 
 import types
 import numpy as np
-from ..cores.converter import Converter, clog
+from .. import tools
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 
 _all_Converters = ['TrackParticleConverter']
@@ -41,6 +42,11 @@ class TrackParticleConverter(Converter):
        Shape of the array data is (mstep/ndiag,7).
        7 quantities of particle:
        istep, X, Z, zeta, rho_para, weight, sqrt(mu).
+
+    Notes
+    -----
+    Numbers in each file are parsed in bulk, then tracked points of all
+    files are grouped by particle tags, sorted by istep.
     '''
     __slots__ = []
     nitems = '+'
@@ -48,46 +54,110 @@ class TrackParticleConverter(Converter):
                     r'.*/(?P<section>trackp)_dir/TRACKP\.\d{5}$']
     _short_files_subs = (0, r'^(.*trackp_dir/TRACKP\.)\d{5}$', r'\1*')
     nparam = 8  # or 9
+    _keyprefix = ['ion', 'electron', 'fastion']
+
+    @staticmethod
+    def _parse_blocks(data, nspecies, nparam):
+        '''
+        Parse blocks (istep, ntrackp(1:nspecies), params) in *data*.
+        Return start indices, ntrackp, istep, species of each particle
+        block and whether *data* ends with a complete block,
+        or None if *data* doesn't match *nparam*.
+        '''
+        blocks = []
+        pos, size = 0, data.size
+        while pos < size:
+            counts = data[pos+1:pos+1+nspecies]
+            if (counts.size < nspecies or np.any(counts < 0)
+                    or np.any(counts != np.floor(counts))):
+                return None
+            istep = data[pos]
+            pos += 1 + nspecies
+            end = pos + int(counts.sum()) * nparam
+            if end > size:
+                return blocks, False  # the last block is being written
+            for p, n in enumerate(counts.astype(int)):
+                if n > 0:
+                    blocks.append((pos, n, istep, p))
+                    pos += n * nparam
+        return blocks, True
+
+    def _read_file(self, f):
+        '''
+        Read one file, return 2d array of tracked points,
+        columns are species, istep and nparam params.
+        '''
+        with self.rawloader.get(f) as fid:
+            clog.debug("Read file '%s'." % f)
+            # exact istep and tags, whatever default float size
+            with tools.nparray_default_bitsize(fsize=64):
+                header, data = read_text_numbers(fid, skiprows=2)
+        nspecies = len(header[1].split())
+        if nspecies == 0:
+            return None
+        data = np.concatenate((
+            [float(header[0])], [float(n) for n in header[1].split()],
+            data))
+        truncated = None
+        for nparam in (self.nparam, self.nparam + 1):
+            res = self._parse_blocks(data, nspecies, nparam)
+            if res is None:
+                continue
+            if res[1]:
+                blocks = res[0]
+                break
+            if truncated is None:
+                truncated = res[0], nparam
+        else:
+            if truncated is None:
+                raise ValueError("Invalid tracked particle data in '%s'!" % f)
+            clog.warning("Skip the incomplete last istep in '%s'." % f)
+            blocks, nparam = truncated
+        if not blocks:
+            return None
+        start, n, istep, species = (np.array(c) for c in zip(*blocks))
+        total = int(n.sum())
+        # index of the first param of each tracked point
+        first = np.repeat(start, n) + nparam * (
+            np.arange(total) - np.repeat(np.cumsum(n) - n, n))
+        points = np.empty((total, 2 + nparam))
+        points[:, 0] = np.repeat(species, n)
+        points[:, 1] = np.repeat(istep, n)
+        points[:, 2:] = data[first[:, None] + np.arange(nparam)]
+        return points
+
+    def _group_points(self, points):
+        '''
+        Group tracked *points* by species and tags, sort them by istep.
+        Return a dict of datakeys and arrays.
+        '''
+        # species, tag1, tag2, istep, params
+        keys = [points[:, 0], points[:, -1], points[:, -2], points[:, 1]]
+        keys += [points[:, c] for c in range(2, points.shape[1] - 2)]
+        order = np.lexsort(keys[::-1])
+        tags = points[:, [0, -1, -2]][order]
+        bounds = np.flatnonzero(np.any(tags[1:] != tags[:-1], axis=1)) + 1
+        dtype = np.array([0.0]).dtype  # respect nparray_default_bitsize
+        lines = points[:, 1:-2][order].astype(dtype, copy=False)
+        sd = {}
+        for idx, line in zip(np.append(0, bounds), np.split(lines, bounds)):
+            p, t1, t2 = tags[idx].astype(int)
+            sd['%s-%d-%d' % (self._keyprefix[p], t1, t2)] = line
+        return sd
 
     def _convert(self):
         '''Read 'trackp_dir/TRACKP.%05d' % mype.'''
-        ion = {}
-        electron = {}
-        fastion = {}
-        Particles = [ion, electron, fastion]
-        keyprefix = ['ion', 'electron', 'fastion']
+        points = {}
         for f in self.files:
-            with self.rawloader.get(f) as fid:
-                clog.debug("Read file '%s'." % f)
-                istep = fid.readline()
-                while istep:
-                    nums = [int(n) for n in fid.readline().split()]
-                    for p, n in enumerate(nums):
-                        particle = Particles[p]
-                        for i in range(n):
-                            param = fid.readline().split()
-                            # nparam floats in 1 or 2 lines
-                            if len(param) < self.nparam:
-                                param += fid.readline().split()
-                            param = [float(_pm) for _pm in param]
-                            key = keyprefix[p]
-                            for k in param[:-3:-1]:
-                                key += '-' + str(int(k))
-                            line = [float(istep)] + param[:-2]
-                            if key in particle:
-                                particle[key].append(line)
-                            else:
-                                particle[key] = [line]
-                    istep = fid.readline()
+            pt = self._read_file(f)
+            if pt is not None:
+                points.setdefault(pt.shape[1], []).append(pt)
         sd = {}
-        for particle in Particles:
-            for key in particle.keys():
-                particle[key].sort()
-                particle[key] = np.array(particle[key])
-            if particle.keys():
-                clog.debug("Filling datakeys: %s ..." %
-                           str(tuple(particle.keys())))
-                sd.update(particle)
+        for ncol in sorted(points):
+            pts = points.pop(ncol)
+            pts = pts[0] if len(pts) == 1 else np.concatenate(pts)
+            sd.update(self._group_points(pts))
+        clog.debug("Filling datakeys: %s ..." % str(tuple(sd.keys())))
         return sd
 
 
@@ -36,7 +36,7 @@ shmilee.F90, subroutine zetapsi3d_diagnosis
 import re
 import numpy as np
 
-from ..cores.converter import Converter, clog
+from ..cores.converter import Converter, clog, read_text_numbers
 from ..cores.digger import Digger, dlog
 from .snapshot import SnapshotFieldmDigger
 from .gtc import Ndigits_tstep
@@ -90,7 +90,7 @@ class ZetaPsi3DConverter(Converter):
             mtoroidal = int(fid.readline())
             # data
             shape = (mzeach, mpsi1, nj, nfield, mtoroidal)
-            outdata = np.array([float(n.strip()) for n in fid.readlines()])
+            _, outdata = read_text_numbers(fid)
         outdata = outdata.reshape(shape, order='F')
         # 1. parameters
         clog.debug("Filling datakeys: %s ..." % 'mzeach, nj, j_list')
@@ -173,14 +173,14 @@ class ZetaPsi3DoldConverter(ZetaPsi3DConverter):
             assert len(fields_name) == nfield
             # data
             shape = (mzeach, mpsi1, nj, nfield)
-            outdata = np.array([float(n.strip()) for n in fid.readlines()])
-            fdata.extend(outdata.reshape(shape, order='F'))
+            _, outdata = read_text_numbers(fid)
+            fdata.append(outdata.reshape(shape, order='F'))
         # tor0001.out ...
         for f in self.files[1:]:
             with self.rawloader.get(f) as fid:
-                outdata = np.array([float(n.strip()) for n in fid.readlines()])
-                fdata.extend(outdata.reshape(shape, order='F'))
-        fdata = np.array(fdata)
+                _, outdata = read_text_numbers(fid)
+                fdata.append(outdata.reshape(shape, order='F'))
+        fdata = np.concatenate(fdata, axis=0)
         mtoroidal = len(self.files)
         assert fdata.shape == (mzeach*mtoroidal, mpsi1, nj, nfield)
         # 1. parameters
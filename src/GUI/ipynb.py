@@ -77,6 +77,8 @@ class IpynbUI(object):
                                 name=self.widgets['processor'].value[1:],
                                 parallel=self.parallel)
         if gdp.pckloader:
+            if self.processor is not None and self.processor is not gdp:
+                self.processor.shutdown()  # stop old worker processes
             self.processor = gdp
             self.grouplabels = {}
             for l in gdp.availablelabels:
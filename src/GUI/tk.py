@@ -225,6 +225,9 @@ class GTkApp(object):
             for n, w in self.cache_figwindows[key].items():
                 log.debug('Destroy window: %s' % n)
                 w.destroy()
+        # stop worker processes
+        for gdp in self.cache_processors.values():
+            gdp.shutdown()
         # close root window
         log.debug('Destroy root window.')
         self.root.destroy()
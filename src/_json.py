@@ -14,7 +14,7 @@ import base64
 import numpy as np
 import gzip
 import tempfile
-from typing import Union, Dict, List
+from typing import Union, Dict, List, Optional
 from .glogger import getGLogger
 from ._zipfile import zipfile_factory, zipfile_copy, ZIP_DEFLATED
 
@@ -384,14 +384,15 @@ class JsonZip(object):
         return self.record_keys
 
     def update(self, records: Dict[KeyType, RecordType],
-               compression: int = ZIP_DEFLATED) -> None:
+               compression: int = ZIP_DEFLATED,
+               compresslevel: Optional[int] = None) -> None:
         '''
         records: dict, like {key: record, ...}
         Duplicate keys point to the last record.
         With compression=ZIP_LZMA, writting may be very slow.
         '''
-        with zipfile_factory(self.path, mode='a',
-                             compression=compression) as z:
+        with zipfile_factory(self.path, mode='a', compression=compression,
+                             compresslevel=compresslevel) as z:
             for key in records:
                 rc = records[key]
                 if type(key) == int:
@@ -407,13 +408,14 @@ class JsonZip(object):
                         self.record_keys.append(key)
 
     def update_from_jsonl(self, jsonl: str, redump: bool = False,
-                          compression: int = ZIP_DEFLATED) -> None:
+                          compression: int = ZIP_DEFLATED,
+                          compresslevel: Optional[int] = None) -> None:
         '''
         Update by records get from jsonl file, and ignore backup records.
         '''
         jl = JsonLines(jsonl)
-        with zipfile_factory(self.path, mode='a',
-                             compression=compression) as z:
+        with zipfile_factory(self.path, mode='a', compression=compression,
+                             compresslevel=compresslevel) as z:
             keys = jl.keys_without_backup()
             n = max(len(keys)//100, 10)
             keys = [keys[i:i + n] for i in range(0, len(keys), n)]
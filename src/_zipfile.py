@@ -12,11 +12,15 @@ import zipfile
 import tempfile
 from .glogger import getGLogger
 
-__all__ = ['zipfile_factory', 'zipfile_copy', 'zipfile_delete']
+__all__ = ['parse_compression',
+           'zipfile_factory', 'zipfile_copy', 'zipfile_delete']
 log = getGLogger('G')
 
 ZIP_LZMA = zipfile.ZIP_LZMA
 ZIP_DEFLATED = zipfile.ZIP_DEFLATED
+ZIP_STORED = zipfile.ZIP_STORED
+# Added in Python 3.14, zstd method 93 of zip format
+ZIP_ZSTANDARD = getattr(zipfile, 'ZIP_ZSTANDARD', None)
 Compress_prefer = 'ZIP_LZMA'  # ZIP_DEFLATED or ZIP_LZMA
 Compress_kwds = dict(allowZip64=True)
 Py_version_tuple = sys.version_info[:3]
@@ -28,6 +32,56 @@ else:
         # Changed in version 3.7: Add the compresslevel parameter.
         Compress_kwds['compresslevel'] = 6
 
+Compress_profiles = {
+    'fast': 'deflate:1',  # converted data on scratch
+    'small': 'lzma',  # archival
+}
+
+
+def parse_compression(spec=None):
+    '''
+    Return ZipFile compression keywords of *spec*.
+
+    Parameters
+    ----------
+    spec: str or None
+        None, default :data:`Compress_kwds` set by :data:`Compress_prefer`;
+        'store', no compression;
+        'deflate' or 'deflate:N', N is level 0-9;
+        'lzma', zipfile uses its fixed preset, no level;
+        'zstd' or 'zstd:N', N is level 1-22, need Python >= 3.14;
+        profile names 'fast' and 'small', see :data:`Compress_profiles`.
+    '''
+    if spec is None:
+        return {k: v for k, v in Compress_kwds.items() if k != 'allowZip64'}
+    spec = Compress_profiles.get(spec, spec)
+    name, _, level = str(spec).partition(':')
+    kwds = None
+    if name == 'store' and not level:
+        kwds = dict(compression=ZIP_STORED)
+    elif name == 'lzma' and not level:
+        if zipfile.lzma:
+            kwds = dict(compression=ZIP_LZMA)
+        else:
+            raise ValueError("Compression 'lzma' is not available!")
+    elif name == 'deflate':
+        if not level:
+            kwds = dict(compression=ZIP_DEFLATED)
+        elif level.isdigit() and int(level) <= 9:
+            kwds = dict(compression=ZIP_DEFLATED, compresslevel=int(level))
+    elif name == 'zstd':
+        if ZIP_ZSTANDARD is None:
+            raise ValueError("Compression 'zstd' needs Python >= 3.14!")
+        if not level:
+            kwds = dict(compression=ZIP_ZSTANDARD)
+        elif level.isdigit() and 1 <= int(level) <= 22:
+            kwds = dict(compression=ZIP_ZSTANDARD, compresslevel=int(level))
+    if kwds is None:
+        raise ValueError("Invalid compression: '%s'!" % spec)
+    if Py_version_tuple >= (3, 7, 0):
+        kwds.setdefault('compresslevel', None)
+    return kwds
+
 
 def zipfile_factory(file, *args, **kwargs):
     """Create a ZipFile. See: `numpy.lib.npyio.zipfile_factory`."""
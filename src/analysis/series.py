@@ -13,6 +13,7 @@ import json
 import math
 import random
 import itertools
+import concurrent.futures
 import numpy as np
 from ..loaders import get_rawloader
 from ..processors import get_processor
@@ -29,9 +30,121 @@ __all__ = [
 log = getGLogger('G.a')
 
 
+def _case_host(path):
+    '''Return host of 'sftp://user@host[:port]##path', or None.'''
+    if path.startswith('sftp://'):
+        return path[7:].split('##')[0].split('@')[-1]
+    return None
+
+
+def _finish_case(idx, result, error, on_done, on_error):
+    '''Call *on_done*, or *on_error* if the case or *on_done* failed.'''
+    if error is None:
+        try:
+            on_done(idx, result)
+            return
+        except Exception as e:
+            error = e
+    on_error(idx, error)
+
+
+def _run_case_tasks(tasks, worker, nworkers=1, host_limit=1,
+                    on_done=None, on_error=None):
+    '''
+    Run *worker*(*args) for each (case index, source path, args)
+    in *tasks*, 1-based index.
+    Call *on_done*(index, result) or *on_error*(index, exception)
+    in the main process when a case is finished. Exceptions raised
+    by *on_done* are also passed to *on_error*.
+
+    If *nworkers* > 1, cases run concurrently in a process pool,
+    at most *host_limit* cases of the same sftp host at one time.
+    If a worker process is killed, cases running in the pool fail with
+    :class:`concurrent.futures.process.BrokenProcessPool`, and
+    a new pool runs the rest.
+    '''
+    if nworkers <= 1 or len(tasks) <= 1:
+        for idx, path, args in tasks:
+            try:
+                result = worker(*args)
+            except Exception as e:
+                _finish_case(idx, None, e, on_done, on_error)
+            else:
+                _finish_case(idx, result, None, on_done, on_error)
+        return
+    pending = list(tasks)
+    nworkers = min(nworkers, len(tasks))
+    while pending:
+        inflight, hostcount = {}, {}
+        with concurrent.futures.ProcessPoolExecutor(nworkers) as executor:
+            broken = False
+            while (pending and not broken) or inflight:
+                for item in list(pending):
+                    if broken or len(inflight) >= nworkers:
+                        break
+                    idx, path, args = item
+                    host = _case_host(path)
+                    if host and hostcount.get(host, 0) >= host_limit:
+                        continue
+                    pending.remove(item)
+                    inflight[executor.submit(worker, *args)] = (idx, host)
+                    if host:
+                        hostcount[host] = hostcount.get(host, 0) + 1
+                done, _ = concurrent.futures.wait(
+                    inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    idx, host = inflight.pop(future)
+                    if host:
+                        hostcount[host] -= 1
+                    error = future.exception()
+                    if isinstance(error, concurrent.futures.BrokenExecutor):
+                        broken = True
+                    result = None if error else future.result()
+                    _finish_case(idx, result, error, on_done, on_error)
+        if pending:
+            log.warning('Worker process died, restart the pool for %d '
+                        'left cases.' % len(pending))
+
+
+def _convert_selected_case(pmap, parallel, kwargs):
+    '''
+    Convert one case of :func:`get_selected_converted_data`.
+    Return time cost (None for skipped case) and converted file size.
+    '''
+    path, dest, exclude = pmap
+    gdpcls = get_processor(name=kwargs.get('name', 'GTCv3'), parallel='off')
+    log.info('Raw data directory: %s' % path)
+    if os.path.exists(dest):
+        test = get_rawloader(dest)
+        tc = test.refind('%s-.*converted.*' % gdpcls.__name__.lower())
+        if tc and test.refind(gdpcls.saltname):
+            log.warning('Skip path %s that has converted data!' % dest)
+            return None, os.path.getsize(os.path.join(dest, tc[0]))
+    log.info('Create directory: %s' % dest)
+    os.makedirs(dest, exist_ok=True)
+    start = time.time()
+    gdp = get_processor(
+        path, parallel=parallel, filenames_exclude=exclude,
+        savedir=dest, Sid=True, **kwargs)
+    todo = [gdp.saltname]
+    todo.extend(gdp.rawloader.refind(r'gtc-\d+\.out'))
+    todo.extend(gdp.rawloader.refind(r'gtc-input.*\.lua'))
+    for file1 in todo:
+        file2 = os.path.join(dest, file1)
+        if os.path.exists(file2):
+            log.warning('Skip file: %s' % file2)
+            continue
+        log.info('Copy file: %s -> %s' % (file1, file2))
+        with gdp.rawloader.get(file1) as f1:
+            with open(file2, 'w') as f2:
+                f2.write(f1.read())
+    end = time.time()
+    return end-start, os.path.getsize(gdp.pcksaver.path)
+
+
 def get_selected_converted_data(pathsmap, parallel='off',
                                 printETA=None, printETAweights=None,
-                                **kwargs):
+                                nworkers=1, host_limit=1, **kwargs):
     r'''
     Get selected GTC raw data from original directory (like sftp://xxx),
     then convert and save to a new directory (like local path).
@@ -51,6 +164,7 @@ def get_selected_converted_data(pathsmap, parallel='off',
             ), next case, ...]
 
     parallel: str, 'off' or 'multiprocess'
+        parallel conversion in each case,
         'sftp://xxx' case needs parallel='off'.
     printETA: function
         custom function to print ETA infor and process & converted file status
@@ -58,87 +172,123 @@ def get_selected_converted_data(pathsmap, parallel='off',
         and a dict of (i=, size=, sumsize=, ETA=).
     printETAweights: list
         weights for the list of time cost of cases
+    nworkers: int
+        number of cases converted concurrently, default 1.
+        If nworkers > 1, *parallel* is ignored and set to 'off' in each case.
+    host_limit: int
+        max number of concurrent cases from the same 'sftp://' host,
+        default 1.
     kwargs: other parameters passed to :meth:`processors.get_processor`
 
     Notes
     -----
     1. Use :meth:`utils.GetPasswd.set` to set password of sftp.
+    2. Time cost, file size and ETA are reported in order of completion.
     '''
     for k in list(kwargs.keys()):
         if k in ('path', 'parallel', 'filenames_exclude', 'savedir', 'Sid'):
             remove = kwargs.pop(k)
-    if 'name' in kwargs:
-        gdpcls = get_processor(name=kwargs.get('name'), parallel='off')
-    else:
-        gdpcls = get_processor(parallel='off')
+    if nworkers > 1:
+        parallel = 'off'
     failed = []
     N = len(pathsmap)
     timecost = []
     filesize = []
-    for i, pmap in enumerate(pathsmap, 1):
-        try:
+    weights = []
+
+    def on_done(idx, result):
+        i = len(filesize) + len(failed) + 1
+        timecost.append(result[0])
+        filesize.append(result[1])
+        if printETAweights:
+            weights.append(printETAweights[idx-1])
+        ETA = 0
+        size, sumsize = filesize[-1], sum(filesize)
+        if printETAweights:
+            val = np.array(tuple(filter(
+                lambda tw: tw[0], zip(timecost, weights))))
+            if len(val) > 0:
+                ETA = np.average(val[:, 0], weights=val[:, 1])*(N-i)
+        else:
+            val = tuple(filter(None, timecost))
+            if len(val) > 0:
+                ETA = np.mean(val)*(N-i)
+        ETA = int(ETA / max(1, min(nworkers, N-i)))
+        print('-'*8, ' Done %d/%d, %.1fM/%.1fM, ETA=%ds'
+              % (i, N, size/1024/1024, sumsize/1024/1024, ETA),
+              '-'*8, flush=True)
+        if printETA and callable(printETA):
+            printETA(timecost, filesize, dict(
+                i=i, size=size, sumsize=sumsize, ETA=ETA))
+
+    def on_error(idx, e):
+        pmap = pathsmap[idx-1]
+        log.error('%s failed: %s' % (pmap[0], e), exc_info=e)
+        failed.append(pmap)
+
+    tasks = [(i, pmap[0], (tuple(pmap), parallel, kwargs))
+             for i, pmap in enumerate(pathsmap, 1)]
+    if nworkers > 1:
+        print('-'*16, '%d cases, %d workers' % (N, nworkers), '-'*16,
+              flush=True)
+        _run_case_tasks(tasks, _convert_selected_case, nworkers=nworkers,
+                        host_limit=host_limit,
+                        on_done=on_done, on_error=on_error)
+    else:
+        for task in tasks:
             print('', flush=True)
-            print('-'*16, '%d/%d' % (i, N), '-'*16, flush=True)
-            path, dest, exclude = pmap
-            log.info('Raw data directory: %s' % path)
-            done = False
-            if os.path.exists(dest):
-                test = get_rawloader(dest)
-                tc = test.refind('%s-.*converted.*' % gdpcls.__name__.lower())
-                if tc and test.refind(gdpcls.saltname):
-                    log.warning('Skip path %s that has converted data!' % dest)
-                    timecost.append(None)
-                    filesize.append(os.path.getsize(
-                        os.path.join(dest, tc[0])))
-                    done = True
-            if not done:
-                log.info('Create directory: %s' % dest)
-                os.makedirs(dest, exist_ok=True)
-                start = time.time()
-                gdp = get_processor(
-                    path, parallel=parallel, filenames_exclude=exclude,
-                    savedir=dest, Sid=True, **kwargs)
-                todo = [gdp.saltname]
-                todo.extend(gdp.rawloader.refind(r'gtc-\d+\.out'))
-                todo.extend(gdp.rawloader.refind(r'gtc-input.*\.lua'))
-                for file1 in todo:
-                    file2 = os.path.join(dest, file1)
-                    if os.path.exists(file2):
-                        log.warning('Skip file: %s' % file2)
-                        continue
-                    log.info('Copy file: %s -> %s' % (file1, file2))
-                    with gdp.rawloader.get(file1) as f1:
-                        with open(file2, 'w') as f2:
-                            f2.write(f1.read())
-                end = time.time()
-                timecost.append(end-start)
-                filesize.append(os.path.getsize(gdp.pcksaver.path))
-            ETA = 0
-            size, sumsize = filesize[-1], sum(filesize)
-            if printETAweights:
-                val = np.array(tuple(filter(
-                    lambda tw: tw[0], zip(timecost, printETAweights[:i]))))
-                if len(val) > 0:
-                    ETA = int(np.average(val[:, 0], weights=val[:, 1])*(N-i))
-            else:
-                val = tuple(filter(None, timecost))
-                if len(val) > 0:
-                    ETA = int(np.mean(val)*(N-i))
-            print('-'*8, ' Done %d/%d, %.1fM/%.1fM, ETA=%ds'
-                  % (i, N, size/1024/1024, sumsize/1024/1024, ETA),
-                  '-'*8, flush=True)
-            if printETA and callable(printETA):
-                printETA(timecost, filesize, dict(
-                    i=i, size=size, sumsize=sumsize, ETA=ETA))
-        except Exception as e:
-            log.error('%s failed: %s' % (pmap[0], e), exc_info=1)
-            failed.append(pmap)
+            print('-'*16, '%d/%d' % (task[0], N), '-'*16, flush=True)
+            _run_case_tasks([task], _convert_selected_case,
+                            on_done=on_done, on_error=on_error)
     return failed
 
 
+def _index_nan_inf(time, *arrs):
+    idx = len(time)
+    for arr in arrs:
+        checkNaN = np.where(np.isnan(arr))[0]
+        if checkNaN.size > 0:
+            idx = min(checkNaN[0], idx)
+        checkInf = np.where(np.isinf(arr))[0]
+        if checkInf.size > 0:
+            idx = min(checkInf[0], idx)
+    return idx if idx < len(time) else None
+
+
+def _get_case_ts_data(path, parallel, ts_key_ver, removeNaN):
+    '''
+    Get saltstr and ts data of one case for :func:`get_label_ts_data`.
+    '''
+    gdp = get_processor(path, parallel=parallel)
+    if ts_key_ver == 'v1':
+        a, b, c = gdp.dig('history/ion_flux', post=False)
+        time = b['time']
+        chi, D = b['energy'], b['particle']
+        a, b, c = gdp.dig('history/phi', post=False)
+        logphirms = np.log(b['fieldrms'])
+        if removeNaN:
+            idx = _index_nan_inf(time, chi, D, logphirms)
+            if idx:
+                time = time[:idx]
+                chi, D = chi[:idx], D[:idx]
+                logphirms = logphirms[:idx]
+        ts_data = dict(time=time, chi_i=chi, d_i=D, logphirms=logphirms)
+    else:
+        a, b, c = gdp.dig('history/phi', post=False)
+        time = b['time']
+        phi00, phi00rms = b['field00'], b['field00rms']
+        if removeNaN:
+            idx = _index_nan_inf(time, phi00, phi00rms)
+            if idx:
+                time = time[:idx]
+                phi00, phi00rms = phi00[:idx], phi00rms[:idx]
+        ts_data = dict(time=time, phi00=phi00, phi00rms=phi00rms)
+    return gdp.saltstr, ts_data
+
+
 def get_label_ts_data(casepaths, path_replace=None, name_replace=None,
                       skip_lost=True, ts_key_ver='v1', removeNaN=True,
-                      savepath=None, savefmt='ls-json'):
+                      savepath=None, savefmt='ls-json', nworkers=1):
     '''
     Get time series data from GTC cases, save to json or other data labeling
     format.
@@ -165,20 +315,13 @@ def get_label_ts_data(casepaths, path_replace=None, name_replace=None,
         save results to savepath, then upload to your labeling platform
     savefmt: str, save format
         'ls-json' is saving to json for the Label Studio Platform
+    nworkers: int
+        number of cases processed concurrently, default 1
     '''
-    ts_data_list = []
-
-    def index_nan_inf(time, *arrs):
-        idx = len(time)
-        for arr in arrs:
-            checkNaN = np.where(np.isnan(arr))[0]
-            if checkNaN.size > 0:
-                idx = min(checkNaN[0], idx)
-            checkInf = np.where(np.isinf(arr))[0]
-            if checkInf.size > 0:
-                idx = min(checkInf[0], idx)
-        return idx if idx < len(time) else None
-
+    if ts_key_ver not in ('v1', 'v2'):
+        log.error("Unsupported ts_key_ver: '%s'!" % ts_key_ver)
+        return
+    tasks = []
     for path in casepaths:
         if not os.path.exists(os.path.join(path, 'gtc.out')):
             if skip_lost:
@@ -186,41 +329,29 @@ def get_label_ts_data(casepaths, path_replace=None, name_replace=None,
                 continue
             else:
                 raise IOError("Lost 'gtc.out' in '%s'!" % path)
-        gdp = get_processor(path)
+        parallel = 'off' if nworkers > 1 else 'multiprocess'
+        tasks.append((len(tasks) + 1, path,
+                      (path, parallel, ts_key_ver, removeNaN)))
+    results = {}
+
+    def on_done(idx, result):
+        results[idx] = result
+
+    def on_error(idx, e):
+        raise e
+
+    _run_case_tasks(tasks, _get_case_ts_data, nworkers=nworkers,
+                    on_done=on_done, on_error=on_error)
+    ts_data_list = []
+    for idx, path, args in tasks:
+        saltstr, ts_data = results[idx]
         if path_replace and callable(path_replace):
             path = path_replace(path)
         name = os.path.basename(os.path.realpath(path))  # a/b/ -> b
         if name_replace and callable(name_replace):
             name = name_replace(path)
-        # ts_data
-        if ts_key_ver == 'v1':
-            a, b, c = gdp.dig('history/ion_flux', post=False)
-            time = b['time']
-            chi, D = b['energy'], b['particle']
-            a, b, c = gdp.dig('history/phi', post=False)
-            logphirms = np.log(b['fieldrms'])
-            if removeNaN:
-                idx = index_nan_inf(time, chi, D, logphirms)
-                if idx:
-                    time = time[:idx]
-                    chi, D = chi[:idx], D[:idx]
-                    logphirms = logphirms[:idx]
-            ts_data = dict(time=time, chi_i=chi, d_i=D, logphirms=logphirms)
-        elif ts_key_ver == 'v2':
-            a, b, c = gdp.dig('history/phi', post=False)
-            time = b['time']
-            phi00, phi00rms = b['field00'], b['field00rms']
-            if removeNaN:
-                idx = index_nan_inf(time, phi00, phi00rms)
-                if idx:
-                    time = time[:idx]
-                    phi00, phi00rms = phi00[:idx], phi00rms[:idx]
-            ts_data = dict(time=time, phi00=phi00, phi00rms=phi00rms)
-        else:
-            log.error("Unsupported ts_key_ver: '%s'!" % ts_key_ver)
-            return
         ts_data_list.append(dict(
-            path=path, name=name, saltstr=gdp.saltstr, ts=ts_data))
+            path=path, name=name, saltstr=saltstr, ts=ts_data))
     if savepath:
         if savefmt == 'ls-json':
             ls_ts_list = [
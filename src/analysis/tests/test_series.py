@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import os
+import time
+import unittest
+
+from ..series import _run_case_tasks
+
+
+def _sleep_worker(idx, delay, fail=None):
+    if fail == 'kill':
+        os._exit(1)
+    start = time.time()
+    time.sleep(delay)
+    if fail == 'raise':
+        raise ValueError('case %d failed' % idx)
+    return idx, start, time.time()
+
+
+class TestRunCaseTasks(unittest.TestCase):
+    '''
+    Test function _run_case_tasks.
+    '''
+
+    def run_tasks(self, paths, fails=None, nworkers=3, host_limit=1,
+                  bad_done=()):
+        fails = fails or {}
+        tasks = [(i, p, (i, 0.2, fails.get(i)))
+                 for i, p in enumerate(paths, 1)]
+        done, failed = {}, {}
+
+        def on_done(idx, result):
+            if idx in bad_done:
+                raise RuntimeError('on_done of case %d failed' % idx)
+            done[idx] = result
+
+        def on_error(idx, e):
+            failed[idx] = e
+
+        _run_case_tasks(tasks, _sleep_worker, nworkers=nworkers,
+                        host_limit=host_limit,
+                        on_done=on_done, on_error=on_error)
+        return done, failed
+
+    def test_host_limit(self):
+        paths = ['sftp://u@h1##c1', 'sftp://u@h1##c2', 'sftp://u@h2##c3',
+                 '/local/c4']
+        done, failed = self.run_tasks(paths)
+        self.assertEqual(sorted(done), [1, 2, 3, 4])
+        self.assertEqual(failed, {})
+        # cases of host h1 run one by one
+        (_, s1, e1), (_, s2, e2) = sorted([done[1], done[2]])
+        self.assertTrue(s2 >= e1 or s1 >= e2)
+        # others run together with them
+        self.assertTrue(min(done[3][1], done[4][1]) < max(e1, e2))
+
+    def test_failures(self):
+        for nworkers in (1, 3):
+            done, failed = self.run_tasks(
+                ['/c1', '/c2', '/c3', '/c4'], fails={2: 'raise'},
+                nworkers=nworkers, bad_done=(3,))
+            self.assertEqual(sorted(done), [1, 4])
+            self.assertEqual(sorted(failed), [2, 3])
+            self.assertIsInstance(failed[2], ValueError)
+            self.assertIsInstance(failed[3], RuntimeError)
+
+    def test_killed_worker(self):
+        done, failed = self.run_tasks(
+            ['/c1', '/c2', '/c3', '/c4', '/c5'], fails={1: 'kill'},
+            nworkers=2)
+        # cases in the broken pool fail, others run in a new pool
+        self.assertTrue(1 in failed)
+        self.assertEqual(sorted(list(done) + list(failed)),
+                         [1, 2, 3, 4, 5])
+        self.assertTrue({4, 5}.issubset(done))
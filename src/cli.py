@@ -69,9 +69,10 @@ def get_parser_base():
                         help="Assign processor to work, "
                         "(default: %(default)s)")
     optgrp.add_argument('--parallel', type=str,
-                        choices=['off', 'multiprocess'],  # 'mpi4py'],
+                        choices=['off', 'multiprocess', 'mpi4py'],
                         default='multiprocess',
                         help="Parallel processing or not, "
+                        "use 'mpi4py' under mpirun, "
                         "(default: %(default)s)")
     optgrp.add_argument('-h', '--help', action='store_true',
                         help='Show this help message and exit')
@@ -99,8 +100,15 @@ def get_parser_convert(subparsers, parents=[]):
     optgrp.add_argument('--savetype', type=str, default='.npz',
                         choices=pcksaver_types[1:],
                         help="Extension of savefile, (default: %(default)s)")
+    optgrp.add_argument('--compression', type=str, metavar='Profile',
+                        help="Compression of savefile, 'fast', 'small', "
+                        "'store', 'deflate:N', 'lzma', 'zstd:N', 'lzf' "
+                        "or 'gzip:N', (default: savetype's default)")
     optgrp.add_argument('--overwrite', action='store_true',
                         help='Overwrite existing savefile')
+    optgrp.add_argument('--incremental', action='store_true',
+                        help='Convert only new or changed raw files, '
+                        'append them to existing savefile')
     return parser
 
 
@@ -120,9 +128,18 @@ def get_parser_plot(subparsers, parents=[]):
     optgrp.add_argument(
         '--datagroups_exclude', type=str, action='append', metavar='Pattern',
         help='Regular expressions to exclude datagroups in pickled data')
+    optgrp.add_argument('--cache', type=str, metavar='Policy',
+                        help="Cache policy of pickled data loader, "
+                        "'off', 'lru:N' or 'nbytes:N[KMG]', "
+                        "(default: unbounded)")
     optgrp.add_argument('--select', type=str,
                         action='append', metavar='Pattern',
                         help="Patterns for selecting figures to plot")
+    optgrp.add_argument('--digcache', type=str, nargs='?', const=True,
+                        metavar='Dir',
+                        help="Cache dig results in a directory shared by "
+                        "cases, (default Dir: %s)"
+                        % os.path.join(__userbase__, 'digcache'))
     optgrp.add_argument('--style', type=str,
                         action='append', metavar='Style',
                         help="Style name of figures")
@@ -133,13 +150,38 @@ def get_parser_plot(subparsers, parents=[]):
     return parser
 
 
+def get_parser_watch(subparsers, parents=[]):
+    '''Create the parser for the "watch" sub-command.'''
+    parser = subparsers.add_parser(
+        'watch',
+        usage='%(prog)s [options]... casepath',
+        description="Script that watches raw data of a running case, "
+                    "converts new and changed raw files to the %s file, "
+                    "then digs or plots selected figures using them. "
+                    "It also accepts 'plot' options." % pcksaver_typestr,
+        add_help=False,
+        parents=parents,
+    )
+    optgrp = parser.add_argument_group('watch options')
+    optgrp.add_argument('--interval', type=float, default=60, metavar='S',
+                        help="Max seconds between two checks, "
+                        "(default: %(default)s)")
+    optgrp.add_argument('--settle', type=float, default=10, metavar='S',
+                        help="Seconds a raw file must stay unchanged "
+                        "before converting it, (default: %(default)s)")
+    optgrp.add_argument('--plot', action='store_true',
+                        help="Plot selected figures, not only dig them")
+    return parser
+
+
 def get_parser():
     '''Assemble top-level parser and sub-command parsers.'''
     top, subparsers = get_parser_top()
     base = get_parser_base()
     convert = get_parser_convert(subparsers, parents=[base])
     plot = get_parser_plot(subparsers, parents=[convert])
-    return {'top': top, 'convert': convert, 'plot': plot}
+    watch = get_parser_watch(subparsers, parents=[plot])
+    return {'top': top, 'convert': convert, 'plot': plot, 'watch': watch}
 
 
 def cli_script():
@@ -197,10 +239,20 @@ def cli_script():
             else:
                 sys.exit()
         plot_style = None
+    if args.subcmd == 'watch':
+        if args.parallel == 'mpi4py':
+            log.error("Subcommand 'watch' doesn't support 'mpi4py'!")
+            sys.exit(1)
+        if len(args.casepath) > 1:
+            log.error("Subcommand 'watch' follows only one case!")
+            sys.exit(1)
+        if not args.select:
+            log.warning("No figures selected, only convert raw data.")
 
     N = len(args.casepath)
     for i, path in enumerate(args.casepath, 1):
         log.info("Case(%d/%d) path: %s" % (i, N, path))
+        gdp = None
         try:
             if args.subcmd == 'convert':
                 gdp = get_processor(
@@ -211,11 +263,13 @@ def cli_script():
                     filenames_exclude=args.filenames_exclude,
                     savedir=args.savedir,
                     savetype=args.savetype,
+                    compression=args.compression,
                     overwrite=args.overwrite,
+                    incremental=args.incremental,
                     Sid=True,
                 )
                 if (gdp.pcksaver is None
-                        or not os.path.isfile(gdp.pcksaver.path)):
+                        or not os.path.exists(gdp.pcksaver.path)):
                     log.error("Failed to convert %s!" % path)
             elif args.subcmd == 'plot':
                 gdp = get_processor(
@@ -226,10 +280,14 @@ def cli_script():
                     filenames_exclude=args.filenames_exclude,
                     savedir=args.savedir,
                     savetype=args.savetype,
+                    compression=args.compression,
                     overwrite=args.overwrite,
+                    incremental=args.incremental,
                     Sid=False,
                     datagroups_exclude=args.datagroups_exclude,
                     add_visplter='mpl::',
+                    pckloader_cache=args.cache,
+                    digcache=args.digcache,
                 )
                 if gdp.pckloader is None or gdp.visplter is None:
                     log.error("Failed to plot %s!" % path)
@@ -250,8 +308,7 @@ def cli_script():
                 prefix = os.path.splitext(gdp.pckloader.path)[0]
                 prefix = os.path.splitext(prefix)[0]
                 figdir = '%s-figures-%s' % (prefix, time.strftime('%F-%H'))
-                if not os.path.isdir(figdir):
-                    os.mkdir(figdir)
+                os.makedirs(figdir, exist_ok=True)  # maybe by other ranks
                 M = len(figurelabels)
                 if args.parallel == 'off':
                     for j, _fl in enumerate(sorted(figurelabels), 1):
@@ -271,8 +328,45 @@ def cli_script():
                     gdp.multi_visplt(
                         *figurelabels, savename='figlabel',
                         saveext=args.figext, savepath=figdir)
+            elif args.subcmd == 'watch':
+                from .processors.watcher import CaseWatcher
+                gdp = get_processor(
+                    path,
+                    name=args.processor,
+                    parallel=args.parallel,
+                    add_desc=args.add_desc,
+                    filenames_exclude=args.filenames_exclude,
+                    savedir=args.savedir,
+                    savetype=args.savetype,
+                    compression=args.compression,
+                    overwrite=args.overwrite,
+                    incremental=True,
+                    Sid=False,
+                    datagroups_exclude=args.datagroups_exclude,
+                    add_visplter='mpl::' if args.plot else None,
+                    pckloader_cache=args.cache,
+                    digcache=args.digcache,
+                )
+                if gdp.pckloader is None:
+                    log.error("Failed to watch %s!" % path)
+                    continue
+                figdir = None
+                if args.plot:
+                    if args.style:
+                        gdp.visplter.style = gdp.visplter.check_style(
+                            args.style)
+                    prefix = os.path.splitext(gdp.pckloader.path)[0]
+                    prefix = os.path.splitext(prefix)[0]
+                    figdir = '%s-figures-watch' % prefix
+                watcher = CaseWatcher(
+                    gdp, select=args.select, interval=args.interval,
+                    settle=args.settle, figdir=figdir, figext=args.figext)
+                watcher.run()
             else:
                 pass
         except Exception:
             log.error("Failed to pick up case %s!" % path, exc_info=1)
+        finally:
+            if gdp is not None:
+                gdp.shutdown()  # stop worker processes of this case
     sys.exit()
@@ -7,14 +7,44 @@ Contains Converter core class.
 '''
 
 import re
+import warnings
+import numpy as np
 
 from .base import BaseCore, AppendDocstringMeta
 from ..glogger import getGLogger
 
-__all__ = ['Converter']
+__all__ = ['Converter', 'read_text_numbers']
 clog = getGLogger('C')
 
 
+def read_text_numbers(fileobj, skiprows=0):
+    '''
+    Read the first *skiprows* lines in *fileobj* as header, then parse
+    all the remaining whitespace separated numbers with NumPy C parser.
+    Return a list of header lines and a 1d float array.
+
+    Notes
+    -----
+    1. The float dtype of array respects
+       :func:`gdpy3.tools.nparray_default_bitsize`.
+    2. If the C parser fails, fall back to Python :func:`float`,
+       which raises the same error as before for malformed text.
+    '''
+    header = [fileobj.readline() for i in range(skiprows)]
+    body = fileobj.read()
+    try:
+        with warnings.catch_warnings():
+            # numpy<2.x warns, numpy>=2.x raises ValueError
+            warnings.simplefilter('error', DeprecationWarning)
+            data = np.fromstring(body, dtype=np.float64, sep=' ')
+    except (ValueError, DeprecationWarning):
+        clog.debug("Fall back to Python float parsing ...")
+        data = np.array([float(n) for n in body.split()], dtype=np.float64)
+    # np.array may be changed by nparray_default_bitsize
+    dtype = np.array([0.0]).dtype
+    return header, data.astype(dtype, copy=False)
+
+
 class Converter(BaseCore, metaclass=AppendDocstringMeta):
     '''
     Convert raw data in files to pickled data.
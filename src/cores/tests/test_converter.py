@@ -2,10 +2,13 @@
 
 # Copyright (c) 2019-2020 shmilee
 
+import io
 import unittest
+import numpy
 
 from . import RawLoader
-from ..converter import Converter
+from ..converter import Converter, read_text_numbers
+from ...tools import nparray_default_bitsize
 
 
 class TestConverter(unittest.TestCase):
@@ -59,3 +62,18 @@ class TestConverter(unittest.TestCase):
         self.assertEqual(cores[0].group, 's0')
         self.assertEqual(cores[0].convert(), None)
         self.assertEqual(cores[0].short_files, 'p/s0_t*.out')
+
+    def test_read_text_numbers(self):
+        text = '  3\n 2.5\n 1.0E+00\n-2.0e-01\n\n  NaN\n 4 5\n'
+        header, data = read_text_numbers(io.StringIO(text), skiprows=2)
+        self.assertEqual(header, ['  3\n', ' 2.5\n'])
+        self.assertEqual(data.dtype, numpy.float64)
+        numpy.testing.assert_array_equal(
+            data, [1.0, -0.2, numpy.nan, 4.0, 5.0])
+        with nparray_default_bitsize(size=32):
+            header, data = read_text_numbers(io.StringIO(text))
+        self.assertEqual(header, [])
+        self.assertEqual(data.dtype, numpy.float32)
+        self.assertEqual(data.size, 7)
+        with self.assertRaises(ValueError):
+            read_text_numbers(io.StringIO(' 1.0\n 2.0-100\n'))
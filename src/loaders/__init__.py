@@ -38,7 +38,9 @@ It contains two kinds of loaders.
    :meth:`PckLoader.find`,
    :meth:`PckLoader.refind`,
    :meth:`PckLoader.update`,   
-   :meth:`PckLoader.all_in_loader`.
+   :meth:`PckLoader.all_in_loader`,
+   :meth:`PckLoader.clear_cache`,
+   :meth:`PckLoader.cache_stats`.
 '''
 
 import os
@@ -51,9 +53,9 @@ rawloader_names = ['DirRawLoader', 'TarRawLoader', 'ZipRawLoader',
                    'SftpRawLoader']
 rawloader_types = ['directory', 'tarfile', 'zipfile', 'sftp.directory']
 pckloader_names = ['CachePckLoader', 'NpzPckLoader', 'Hdf5PckLoader',
-                   'JsonlPckLoader', 'JsonzPckLoader']
+                   'JsonlPckLoader', 'JsonzPckLoader', 'NpydPckLoader']
 pckloader_types = ['.cache', '.npz', '.hdf5',
-                   '.jsonl', '.jsonz']
+                   '.jsonl', '.jsonz', '.npyd']
 
 
 def get_rawloader(path, dirnames_exclude=None, filenames_exclude=None):
@@ -99,7 +101,8 @@ def is_rawloader(obj):
     return isinstance(obj, base.BaseRawLoader)
 
 
-def get_pckloader(path, virtualdata=None, datagroups_exclude=None):
+def get_pckloader(path, virtualdata=None, datagroups_exclude=None,
+                  cache=None):
     '''
     Given a file path or dict cache, return a pickled loader instance.
     Raises IOError if path not found, ValueError if path type not supported.
@@ -112,14 +115,20 @@ def get_pckloader(path, virtualdata=None, datagroups_exclude=None):
     3. '.hdf5' file
     4. '.jsonl' file
     5. '.jsonz' file
+    6. '.npyd' directory
+
+    *cache* is the cache policy of loader, like 'off', 'lru:128',
+    'nbytes:4G', default None, unbounded. See :class:`base.PckCache`.
     '''
 
     if is_dict_like(path):
         from .cachepck import CachePckLoader as Loader
     elif isinstance(path, str):
         path = os.path.expanduser(path)
-        if os.path.isfile(path):
-            ext = os.path.splitext(path)[1]
+        ext = os.path.splitext(path)[1]
+        if ext == '.npyd' and os.path.isdir(path):
+            from .npydpck import NpydPckLoader as Loader
+        elif os.path.isfile(path):
             if ext == '.npz':
                 from .npzpck import NpzPckLoader as Loader
             elif ext == '.hdf5':
@@ -137,7 +146,8 @@ def get_pckloader(path, virtualdata=None, datagroups_exclude=None):
     else:
         raise ValueError("Var *path* should be str or dict object!")
     return Loader(
-        path, virtualdata=virtualdata, datagroups_exclude=datagroups_exclude)
+        path, virtualdata=virtualdata, datagroups_exclude=datagroups_exclude,
+        cache=cache)
 
 
 def is_pckloader(obj):
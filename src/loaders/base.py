@@ -8,12 +8,32 @@ Contains loader base class.
 
 import os
 import re
+import sys
+import hashlib
 import contextlib
+import collections
+import concurrent.futures
 
 from ..glogger import getGLogger
 
-__all__ = ['BaseLoader', 'BaseRawLoader', 'BasePckLoader']
+__all__ = ['BaseLoader', 'BaseRawLoader', 'BasePckLoader', 'PckCache']
 log = getGLogger('L')
+_MISSING = object()
+_EXECUTOR = {}
+
+
+def _get_executor():
+    '''
+    Return the thread pool shared by loaders to read datakeys concurrently.
+    One pool per process, threads of a parent process are lost in fork.
+    '''
+    pid = os.getpid()
+    if pid not in _EXECUTOR:
+        _EXECUTOR.clear()
+        _EXECUTOR[pid] = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(8, os.cpu_count() or 1),
+            thread_name_prefix='gdpy3-loader')
+    return _EXECUTOR[pid]
 
 
 class BaseLoader(object):
@@ -26,6 +46,8 @@ class BaseLoader(object):
     '''
     __slots__ = ['path', 'pathobj']
     loader_type = 'base'
+    # slots not pickled, they are reset by :meth:`_special_open`
+    _transient_slots = ('pathobj',)
 
     def __init__(self, path):
         if self._check_path_access(path):
@@ -142,10 +164,9 @@ class BaseLoader(object):
         '''
         Check if all the *items* are in this loader.
         '''
-        loaderkeys = self.keys()
         result = True
         for i in items:
-            if i not in loaderkeys:
+            if i not in self:
                 # do not break, warning all lost keys!
                 log.warning("Key '%s' not in %s!" % (i, self.path))
                 result = False
@@ -163,7 +184,7 @@ class BaseLoader(object):
         return [(name, getattr(self, name))
                 for cls in type(self).__mro__
                 for name in getattr(cls, '__slots__', [])
-                if name != 'pathobj']
+                if name not in self._transient_slots]
 
     def __setstate__(self, state):
         for name, value in state:
@@ -171,6 +192,145 @@ class BaseLoader(object):
         self.pathobj = self._special_open()
 
 
+class PckCache(object):
+    '''
+    Cache of values got from :class:`BasePckLoader`.
+
+    Attributes
+    ----------
+    policy: str
+        'unbounded', keep all values;
+        'lru', keep at most *maxsize* recently used values;
+        'nbytes', keep recently used values in at most *maxsize* bytes;
+        'off', keep nothing.
+    maxsize: int or None
+    nbytes: int
+        total size of cached values
+    hits, misses, evictions: int
+        statistics of cache lookups, get by :meth:`stats`
+
+    Parameters
+    ----------
+    spec: str or None
+        'unbounded'(None), 'off', 'lru:N', 'nbytes:N',
+        N is an integer, 'nbytes' accepts suffix K, M, G, like 'nbytes:4G'.
+    '''
+    __slots__ = ['policy', 'maxsize', 'nbytes', '_data', '_sizes',
+                 'hits', 'misses', 'evictions']
+    policies = ('unbounded', 'off', 'lru', 'nbytes')
+    _units = {'K': 1024, 'M': 1024**2, 'G': 1024**3}
+
+    def __init__(self, spec=None):
+        policy, maxsize = self.parse_spec(spec)
+        self.policy, self.maxsize = policy, maxsize
+        self._data = collections.OrderedDict()
+        self._sizes = {}
+        self.nbytes = 0
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    @classmethod
+    def parse_spec(cls, spec):
+        '''Return policy and maxsize in cache *spec* str.'''
+        if spec is None:
+            return 'unbounded', None
+        policy, _, size = str(spec).partition(':')
+        if policy not in cls.policies:
+            raise ValueError("Cache policy must be in '%s', not '%s'!"
+                             % (', '.join(cls.policies), policy))
+        if policy in ('lru', 'nbytes'):
+            unit = cls._units.get(size[-1:].upper(), 1) if size else 1
+            if unit > 1:
+                size = size[:-1]
+            if policy == 'lru' and unit > 1 or not size.isdigit():
+                raise ValueError("Invalid cache size in '%s'!" % spec)
+            return policy, int(size) * unit
+        return policy, None
+
+    @property
+    def spec(self):
+        if self.maxsize is None:
+            return self.policy
+        return '%s:%d' % (self.policy, self.maxsize)
+
+    @staticmethod
+    def sizeof(value):
+        '''Size of *value* in bytes, array uses its nbytes.'''
+        nbytes = getattr(value, 'nbytes', None)
+        if isinstance(nbytes, int):
+            return nbytes
+        return sys.getsizeof(value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def get(self, key, default=None):
+        '''Return cached value of *key* and count it as a hit or miss.'''
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.policy in ('lru', 'nbytes'):
+            self._data.move_to_end(key)
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if self.policy == 'off':
+            return
+        self.pop(key, None)
+        size = self.sizeof(value)
+        if self.policy == 'nbytes' and size > self.maxsize:
+            return
+        self._sizes[key] = size
+        self.nbytes += size
+        self._data[key] = value
+        if self.policy == 'lru':
+            while len(self._data) > self.maxsize:
+                self._evict()
+        elif self.policy == 'nbytes':
+            while self.nbytes > self.maxsize:
+                self._evict()
+
+    def _evict(self):
+        key, value = self._data.popitem(last=False)
+        self.nbytes -= self._sizes.pop(key, 0)
+        self.evictions += 1
+        log.debug("Evict key '%s' from cache." % key)
+
+    def pop(self, key, default=None):
+        self.nbytes -= self._sizes.pop(key, 0)
+        return self._data.pop(key, default)
+
+    def clear(self):
+        '''Remove all cached values, keep statistics.'''
+        self._data.clear()
+        self._sizes.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        '''Return a dict of cache policy, size and statistics.'''
+        return dict(policy=self.policy, maxsize=self.maxsize,
+                    length=len(self._data), nbytes=self.nbytes,
+                    hits=self.hits, misses=self.misses,
+                    evictions=self.evictions)
+
+    def __repr__(self):
+        return '<{0} {1} with {2} values>'.format(
+            type(self).__name__, self.spec, len(self._data))
+
+
 class BaseRawLoader(BaseLoader):
     r'''
     Load raw data from a directory or archive file.
@@ -199,7 +359,8 @@ class BaseRawLoader(BaseLoader):
     2. File-like object which returned by *get()* must has close method,
        and read, readline, or readlines.
     '''
-    __slots__ = ['filenames', 'dirnames_exclude', 'filenames_exclude']
+    __slots__ = ['filenames', 'dirnames_exclude', 'filenames_exclude',
+                 '_fileset']
 
     def __init__(self, path, dirnames_exclude=None, filenames_exclude=None):
         super(BaseRawLoader, self).__init__(path)
@@ -213,7 +374,7 @@ class BaseRawLoader(BaseLoader):
 
     def update(self):
         self.close()
-        self.filenames = None
+        self.filenames, self._fileset = None, frozenset()
         try:
             log.debug("Open path %s." % self.path)
             pathobj = self._special_open()
@@ -221,6 +382,7 @@ class BaseRawLoader(BaseLoader):
             filenames = self._special_getkeys(pathobj)
             self.pathobj = pathobj
             self.filenames = tuple(sorted(filenames))
+            self._fileset = frozenset(self.filenames)
         except (IOError, ValueError):
             log.error("Failed to read path %s." % self.path, exc_info=1)
             raise
@@ -228,13 +390,16 @@ class BaseRawLoader(BaseLoader):
     def keys(self):
         return self.filenames
 
+    def __contains__(self, item):
+        return item in self._fileset
+
     @contextlib.contextmanager
     def get(self, key):
         '''
         Get file-like object by filename *key*.
         A function for with statement context managers.
         '''
-        if key not in self.filenames:
+        if key not in self._fileset:
             raise KeyError("%s is not in '%s'" % (key, self.path))
         try:
             log.debug("Getting file '%s' from %s ..." % (key, self.path))
@@ -249,6 +414,33 @@ class BaseRawLoader(BaseLoader):
                 log.debug("Close file %s in path %s." % (key, self.path))
                 fileobj.close()
 
+    def _special_getstat(self, pathobj, key):
+        '''
+        Return (size in bytes, modification time) of file *key*.
+        '''
+        raise NotImplementedError()
+
+    def getstat(self, key):
+        '''
+        Get (size, mtime) of filename *key*, without reading the file.
+        *size* is in bytes, *mtime* is seconds since the epoch.
+        '''
+        if key not in self._fileset:
+            raise KeyError("%s is not in '%s'" % (key, self.path))
+        return self._special_getstat(self.pathobj, key)
+
+    def getsize(self, key):
+        '''Get size of filename *key* in bytes.'''
+        return self.getstat(key)[0]
+
+    def gethash(self, key, blocksize=2**20):
+        '''Get SHA1 hex digest of content of filename *key*.'''
+        sha1 = hashlib.sha1()
+        with self.get(key) as f:
+            for block in iter(lambda: f.read(blocksize), ''):
+                sha1.update(block.encode('utf-8'))
+        return sha1.hexdigest()
+
     def beside_path(self, name):
         '''Get a path for *name*, join with :attr:`path`'''
         return os.path.join(self.path, name)
@@ -273,8 +465,14 @@ class BasePckLoader(BaseLoader):
     description: str or None
         description of the data, if 'description' is in datakeys
     desc: alias description
-    cache: dict
-        cached datakeys from file
+    cache: :class:`PckCache`
+        cached values got from file, with hit/miss/eviction statistics
+    parallel_get: bool
+        class attribute, True if datakeys can be read in threads by
+        :meth:`_special_get_threadsafe`, used by :meth:`get_many`
+        and :meth:`prefetch`
+    recording: dict or None
+        keys got or checked after :meth:`start_recording`
 
     Parameters
     ----------
@@ -286,10 +484,17 @@ class BasePckLoader(BaseLoader):
     datagroups_exclude: list
         a list of function or regular expression to exclude datagroups,
         example: [r'sanp\d+$', 'bigdata']
+    cache: str
+        cache policy spec of :class:`PckCache`, default None, unbounded.
+        example: 'off', 'lru:128', 'nbytes:4G'
     '''
     __slots__ = ['datakeys', 'datagroups', 'datagroups_exclude',
                  'virtualdata', 'virtualkeys',
-                 'desc', 'description', 'cache']
+                 'desc', 'description', 'cache',
+                 '_allkeys', '_datakeyset', '_virtualkeyset', '_groupkeys',
+                 '_prefetching', 'recording']
+    _transient_slots = ('pathobj', '_prefetching', 'recording')
+    parallel_get = False
 
     def _special_getgroups(self, pathobj):
         '''
@@ -297,10 +502,14 @@ class BasePckLoader(BaseLoader):
         '''
         return set(os.path.dirname(k) for k in self.datakeys)
 
-    def __init__(self, path, virtualdata=None, datagroups_exclude=None):
+    def __init__(self, path, virtualdata=None, datagroups_exclude=None,
+                 cache=None):
         super(BasePckLoader, self).__init__(path)
         self.virtualdata = virtualdata or {}
         self.datagroups_exclude = self.gen_match_conditions(datagroups_exclude)
+        self.cache = PckCache(cache)
+        self._prefetching = {}
+        self.recording = None
         self.update()
 
     def update(self):
@@ -340,23 +549,63 @@ class BasePckLoader(BaseLoader):
             if os.path.dirname(k) in self.datagroups and callable(v))
         if self.virtualkeys:
             log.debug("Setting virtualkeys: %s" % (self.virtualkeys,))
-        self.cache = {}
+        self._allkeys = self.datakeys + self.virtualkeys
+        self._datakeyset = frozenset(self.datakeys)
+        self._virtualkeyset = frozenset(self.virtualkeys)
+        self._groupkeys = self._index_groupkeys(self._allkeys)
+        self.cache.clear()
+        self._prefetching = {}
+
+    def __getstate__(self):
+        # cached values are not pickled, the copy has an empty cache
+        return [(name, PckCache(value.spec) if name == 'cache' else value)
+                for name, value in super(BasePckLoader, self).__getstate__()]
+
+    def __setstate__(self, state):
+        self._prefetching = {}
+        self.recording = None
+        super(BasePckLoader, self).__setstate__(state)
+
+    @staticmethod
+    def _index_groupkeys(keys):
+        '''
+        Return a dict of group prefix and keys under it.
+        Key 'g/sg/k' is indexed by both 'g' and 'g/sg'.
+        '''
+        index = {}
+        for k in keys:
+            stop = k.find('/')
+            while stop > 0:
+                index.setdefault(k[:stop], []).append(k)
+                stop = k.find('/', stop + 1)
+        return {g: tuple(ks) for g, ks in index.items()}
 
     def keys(self):
-        return self.datakeys + self.virtualkeys
+        return self._allkeys
+
+    def __contains__(self, item):
+        if self.recording is not None:
+            self.recording.setdefault(item, False)
+        return item in self._datakeyset or item in self._virtualkeyset
 
     def groups(self):
         return self.datagroups
 
     def __getitem__(self, key, /):
-        if key in self.cache:
-            return self.cache[key]
+        if self.recording is not None:
+            self.recording[key] = True
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
         try:
-            if key in self.virtualkeys:
+            if key in self._virtualkeyset:
                 log.debug("Getting virtual key '%s' in %s ..."
                           % (key, self.path))
                 value = self.virtualdata[key](self)
-            elif key in self.datakeys:
+            elif key in self._prefetching:
+                log.debug("Getting prefetched key '%s' ..." % key)
+                value = self._prefetching.pop(key).result()
+            elif key in self._datakeyset:
                 log.debug("Getting key '%s' from %s ..." % (key, self.path))
                 value = self._special_get(self.pathobj, key)
             else:
@@ -370,53 +619,229 @@ class BasePckLoader(BaseLoader):
 
     def get(self, key, default=None, /):
         ''' Get value by ``key`. '''
-        if key in self.keys():
+        if key in self:
             try:
                 return self.__getitem__(key)
             except Exception:
                 pass  # TODO get kwargs['default'], raise ValueError
         return default
 
+    def _special_get_threadsafe(self, key):
+        '''
+        Return value of datakey *key*, safe to be called in threads.
+        Loaders with :attr:`parallel_get` override this,
+        opening their own file handle in each thread.
+        '''
+        raise NotImplementedError()
+
+    def _get_datavalues(self, keys):
+        '''
+        Return a dict of datakeys *keys* and values.
+        Prefetched values are taken, others are read concurrently
+        if :attr:`parallel_get`.
+        '''
+        futures, todo = {}, []
+        for key in dict.fromkeys(keys):
+            if key in self._prefetching:
+                futures[key] = self._prefetching.pop(key)
+            else:
+                todo.append(key)
+        if self.parallel_get:
+            todopar = [k for k in todo if k in self._datakeyset]
+            if len(todopar) > 1:
+                log.debug("Getting %d keys from %s in threads ..."
+                          % (len(todopar), self.path))
+                executor = _get_executor()
+                for key in todopar:
+                    futures[key] = executor.submit(
+                        self._special_get_threadsafe, key)
+                todo = [k for k in todo if k not in futures]
+        values = {}
+        try:
+            for key in todo:
+                log.debug("Getting key '%s' from %s ..." % (key, self.path))
+                values[key] = self._special_get(self.pathobj, key)
+            for key, future in futures.items():
+                values[key] = future.result()
+        except (IOError, ValueError):
+            log.error("Failed to get '%s' from %s!" %
+                      (key, self.path), exc_info=1)
+            raise
+        return values
+
     def get_many(self, *keys):
         '''
         Get values by ``keys``. Return a tuple of values.
         '''
-        result = [self.cache[k] if k in self.cache else None for k in keys]
-        idxtodo = [i for i, k in enumerate(result) if k is None]
+        if self.recording is not None:
+            self.recording.update(dict.fromkeys(keys, True))
+        result = [self.cache.get(k, _MISSING) for k in keys]
+        idxtodo = [i for i, v in enumerate(result) if v is _MISSING]
         if len(idxtodo) == 0:
             return tuple(result)
+        values = self._get_datavalues(
+            [keys[i] for i in idxtodo if keys[i] not in self._virtualkeyset])
         try:
             for i in idxtodo:
                 key = keys[i]
-                if key in self.virtualkeys:
+                if key in values:
+                    value = values[key]
+                else:
                     log.debug("Getting virtual key '%s' in %s ..."
                               % (key, self.path))
                     value = self.virtualdata[key](self)
-                else:
-                    log.debug("Getting key '%s' from %s ..." %
-                              (key, self.path))
-                    value = self._special_get(self.pathobj, key)
                 result[i] = value
                 self.cache[key] = value
         except (IOError, ValueError):
-            if 'key' in dir():
-                log.error("Failed to get '%s' from %s!" %
-                          (key, self.path), exc_info=1)
-            else:
-                log.error("Failed to open '%s'!" % self.path, exc_info=1)
+            log.error("Failed to get '%s' from %s!" %
+                      (key, self.path), exc_info=1)
             raise
         return tuple(result)
 
+    def prefetch(self, *keys):
+        '''
+        Start reading datakeys ``keys`` in background threads,
+        do not wait. Values are stored in :attr:`cache` when they are
+        got later by :meth:`__getitem__` or :meth:`get_many`.
+        Cached, virtual keys and loaders without :attr:`parallel_get`
+        are skipped. Return a tuple of keys being prefetched.
+        '''
+        if not self.parallel_get:
+            return ()
+        todo = [k for k in dict.fromkeys(keys)
+                if k in self._datakeyset and k not in self._prefetching
+                and k not in self.cache]
+        if todo:
+            log.debug("Prefetching %d keys from %s ..."
+                      % (len(todo), self.path))
+            executor = _get_executor()
+            for key in todo:
+                self._prefetching[key] = executor.submit(
+                    self._special_get_threadsafe, key)
+        return tuple(todo)
+
+    def _special_get_slice(self, pathobj, key, slices):
+        '''
+        Return part of value of datakey *key* selected by *slices*.
+        Default, get the whole value with :attr:`cache`, then slice it.
+        Loaders which can read part of an array directly override this.
+        '''
+        return self.__getitem__(key)[slices]
+
+    def get_slice(self, key, slices):
+        '''
+        Get part of array value by ``key`` and ``slices``,
+        like ``numpy.s_[:, 10:20]``.
+        For '.hdf5', '.npyd' loaders, only the selected part is read,
+        and it is not cached.
+        '''
+        if self.recording is not None:
+            self.recording[key] = True
+        if key in self.cache or key in self._virtualkeyset:
+            return self.__getitem__(key)[slices]
+        if key not in self._datakeyset:
+            raise KeyError("%s is not in '%s'" % (key, self.path))
+        try:
+            log.debug("Getting slice %s of key '%s' from %s ..."
+                      % (slices, key, self.path))
+            return self._special_get_slice(self.pathobj, key, slices)
+        except (IOError, ValueError):
+            log.error("Failed to get slice of '%s' from %s!" %
+                      (key, self.path), exc_info=1)
+            raise
+
+    def get_many_slices(self, slices, *keys):
+        '''
+        Get part of values by ``keys`` with the same ``slices``.
+        Return a tuple of values.
+        '''
+        return tuple(self.get_slice(k, slices) for k in keys)
+
+    def _special_getsize(self, pathobj, key):
+        '''
+        Return stored size of datakey *key* in bytes, or None if unknown.
+        '''
+        return None
+
+    def getsize(self, key):
+        '''
+        Get size of value of ``key`` in bytes, from metadata of the file
+        if possible, otherwise 0. The value is not read.
+        '''
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return PckCache.sizeof(value)
+        if key not in self._datakeyset:
+            return 0
+        try:
+            size = self._special_getsize(self.pathobj, key)
+        except Exception:
+            log.debug("Failed to get size of '%s' from %s!"
+                      % (key, self.path), exc_info=1)
+            size = None
+        return size or 0
+
+    def _special_getshape(self, pathobj, key):
+        '''
+        Return shape of array datakey *key*, or None if unknown.
+        '''
+        return None
+
+    def getshape(self, key):
+        '''
+        Get shape of array value of ``key``, from metadata of the file
+        if possible, otherwise the value is read. A scalar value has
+        shape ().
+        '''
+        if self.recording is not None:
+            self.recording[key] = True
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING and key in self._datakeyset:
+            try:
+                shape = self._special_getshape(self.pathobj, key)
+            except Exception:
+                log.debug("Failed to get shape of '%s' from %s!"
+                          % (key, self.path), exc_info=1)
+                shape = None
+            if shape is not None:
+                return tuple(shape)
+        if value is _MISSING:
+            value = self.__getitem__(key)
+        return tuple(getattr(value, 'shape', ()))
+
     def get_by_group(self, group):
         '''
         Get all values by ``keys`` in group.
         Return a dict of keys' basenames and values.
         '''
-        allkeys = self.refind('^%s/' % re.escape(group))
+        allkeys = self._groupkeys.get(group, ())
         basekeys = [os.path.basename(k) for k in allkeys]
         resultstuple = self.get_many(*allkeys)
         results = {k: v for k, v in zip(basekeys, resultstuple)}
         return results
 
+    def start_recording(self):
+        '''
+        Start recording keys got by :meth:`__getitem__`, :meth:`get_many`,
+        :meth:`get_slice` etc. and keys checked by :meth:`__contains__`.
+        '''
+        self.recording = {}
+
+    def stop_recording(self):
+        '''
+        Stop recording, return a dict of recorded keys,
+        True if the value is got, False if only the key is checked.
+        '''
+        recording, self.recording = self.recording or {}, None
+        return recording
+
     def clear_cache(self):
-        self.cache = {}
+        self.cache.clear()
+
+    def cache_stats(self):
+        '''Return a dict of cache policy, size and hit/miss statistics.'''
+        return self.cache.stats()
+
+    def set_cache(self, spec):
+        '''Drop cached values, use a new cache policy *spec*.'''
+        self.cache = PckCache(spec)
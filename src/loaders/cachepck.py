@@ -74,3 +74,12 @@ class CachePckLoader(BasePckLoader):
             return pathobj[key[:gstop]][key[gstop+1:]]
         else:
             raise ValueError('Wrong key "%s"!' % key)
+
+    def _special_getsize(self, pathobj, key):
+        return self.cache.sizeof(self._special_get(pathobj, key))
+
+    def _special_getshape(self, pathobj, key):
+        return getattr(self._special_get(pathobj, key), 'shape', ())
+
+    def _special_get_slice(self, pathobj, key, slices):
+        return self._special_get(pathobj, key)[slices]
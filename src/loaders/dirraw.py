@@ -83,3 +83,9 @@ class DirRawLoader(BaseRawLoader):
         if os.name == 'nt':
             key = self._WinFilenames[key]
         return open(pathlib.PurePath(self.path).joinpath(key))
+
+    def _special_getstat(self, pathobj, key):
+        if os.name == 'nt':
+            key = self._WinFilenames[key]
+        st = os.stat(pathlib.PurePath(self.path).joinpath(key))
+        return st.st_size, st.st_mtime
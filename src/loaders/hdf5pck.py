@@ -43,6 +43,11 @@ class Hdf5PckLoader(BasePckLoader):
     >>> datakey = 'group/key'
     >>> h5file[datakey][()]
     >>> h5file[datakey][...]
+
+    Q: How to read part of a large array?
+    A: Use :meth:`get_dataset` or :meth:`get_slice`, only the chunks
+    of the selected hyperslab are read and decompressed.
+    >>> loader.get_slice('history/fieldtime-phi', numpy.s_[:, 100:200])
     '''
     __slots__ = []
     loader_type = '.hdf5'
@@ -84,3 +89,20 @@ class Hdf5PckLoader(BasePckLoader):
             return val.tobytes()
         else:
             return val
+
+    def _special_getsize(self, pathobj, key):
+        return pathobj[key].nbytes
+
+    def _special_getshape(self, pathobj, key):
+        return pathobj[key].shape
+
+    def get_dataset(self, key):
+        '''
+        Return lazy :class:`h5py.Dataset` of *key*, data are read on slicing.
+        '''
+        if key not in self._datakeyset:
+            raise KeyError("%s is not in '%s'" % (key, self.path))
+        return self.pathobj[key]
+
+    def _special_get_slice(self, pathobj, key, slices):
+        return pathobj[key][slices]
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Contains npy-directory pickled data loader class.
+'''
+
+import os
+import numpy
+
+from ..glogger import getGLogger
+from ..utils import inherit_docstring
+from .base import BasePckLoader
+
+__all__ = ['NpydPckLoader']
+log = getGLogger('L')
+
+
+@inherit_docstring(BasePckLoader, parse=None, template=None)
+class NpydPckLoader(BasePckLoader):
+    '''
+    Load pickled data from ``.npyd`` directory of ``.npy`` files.
+    Return a dictionary-like object.
+
+    Attributes
+    ----------
+    {Attributes}
+
+    Parameters
+    ----------
+    {Parameters}
+
+    Notes
+    -----
+    Q: How to read data from .npyd directory?
+    A: memory-map file 'group/key.npy' read-only, no copy, no decompression
+    >>> numpy.load('/tmp/test.npyd/group/key.npy', mmap_mode='r')
+
+    Only the pages actually read are loaded, and they are shared
+    by all processes through the page cache.
+    Arrays with Python objects can not be mapped, they are loaded normally.
+    '''
+    __slots__ = []
+    loader_type = '.npyd'
+
+    def _special_check_path(self):
+        if os.path.isdir(self.path):
+            return True
+        else:
+            log.error("'%s' is not a directory!" % self.path)
+            return False
+
+    def _special_open(self):
+        return self.path
+
+    def _special_close(self, pathobj):
+        pass
+
+    def _special_getkeys(self, pathobj):
+        keys = []
+        for root, dirs, files in os.walk(pathobj):
+            dirs.sort()
+            rel = os.path.relpath(root, pathobj)
+            prefix = '' if rel == '.' else rel.replace(os.sep, '/') + '/'
+            keys.extend(prefix + f[:-4] for f in sorted(files)
+                        if f.endswith('.npy'))
+        return keys
+
+    def _load(self, pathobj, key):
+        fname = os.path.join(pathobj, *key.split('/')) + '.npy'
+        try:
+            return numpy.load(fname, mmap_mode='r')
+        except ValueError:
+            # Array can't be memory-mapped: Python objects in dtype
+            return numpy.load(fname, allow_pickle=True)
+
+    def _special_getsize(self, pathobj, key):
+        return os.path.getsize(os.path.join(pathobj, *key.split('/')) + '.npy')
+
+    def _special_getshape(self, pathobj, key):
+        shape = self._load(pathobj, key).shape
+        return () if numpy.prod(shape) == 1 else shape
+
+    def _special_get(self, pathobj, key):
+        value = self._load(pathobj, key)
+        if value.size == 1:
+            value = value.item()
+        return value
+
+    def _special_get_slice(self, pathobj, key, slices):
+        # copy selected part, then the file map can be released
+        return numpy.array(self._load(pathobj, key)[slices])
@@ -8,6 +8,7 @@ Contains Npz pickled file loader class.
 
 import numpy
 import zipfile
+import threading
 
 from ..glogger import getGLogger
 from ..utils import inherit_docstring
@@ -37,9 +38,15 @@ class NpzPckLoader(BasePckLoader):
     >>> npzfile = numpy.load('/tmp/test.npz')
     >>> datakey = 'group/key'
     >>> npzfile[datakey]
+
+    :meth:`get_many` and :meth:`prefetch` decompress members in threads,
+    each thread reads the file by its own :class:`zipfile.ZipFile`.
     '''
-    __slots__ = []
+    __slots__ = ['_zflocal', '_zfhandles']
+    _transient_slots = BasePckLoader._transient_slots + (
+        '_zflocal', '_zfhandles')
     loader_type = '.npz'
+    parallel_get = True
 
     def _special_check_path(self):
         if zipfile.is_zipfile(self.path):
@@ -49,10 +56,15 @@ class NpzPckLoader(BasePckLoader):
             return False
 
     def _special_open(self):
+        self._zflocal = threading.local()
+        self._zfhandles = []
         return numpy.load(self.path, allow_pickle=True)
 
     def _special_close(self, pathobj):
         pathobj.close()
+        for zf in self._zfhandles:
+            zf.close()
+        self._zfhandles = []
 
     def _special_getkeys(self, pathobj):
         return sorted(dict.fromkeys(pathobj.files))
@@ -62,3 +74,35 @@ class NpzPckLoader(BasePckLoader):
         if value.size == 1:
             value = value.item()
         return value
+
+    def _special_getsize(self, pathobj, key):
+        info = pathobj.zip.NameToInfo.get(key + '.npy')
+        return info.file_size if info else None
+
+    def _special_getshape(self, pathobj, key):
+        member = key + '.npy'
+        if member not in pathobj.zip.NameToInfo:
+            return None
+        with pathobj.zip.open(member) as fp:
+            version = numpy.lib.format.read_magic(fp)
+            if version == (1, 0):
+                shape = numpy.lib.format.read_array_header_1_0(fp)[0]
+            else:
+                shape = numpy.lib.format.read_array_header_2_0(fp)[0]
+        # same as _special_get, value of size 1 is a scalar
+        return () if numpy.prod(shape) == 1 else shape
+
+    def _special_get_threadsafe(self, key):
+        zf = getattr(self._zflocal, 'zipfile', None)
+        if zf is None:
+            zf = zipfile.ZipFile(self.path)
+            self._zflocal.zipfile = zf
+            self._zfhandles.append(zf)
+        member = key + '.npy'
+        if member not in zf.NameToInfo:
+            return zf.read(key)
+        with zf.open(member) as fp:
+            value = numpy.lib.format.read_array(fp, allow_pickle=True)
+        if value.size == 1:
+            value = value.item()
+        return value
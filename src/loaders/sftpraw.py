@@ -128,6 +128,10 @@ class SftpRawLoader(BaseRawLoader):
         return io.TextIOWrapper(
             pathobj.open(self._sep.join([self.rmt_path, key]), 'r'))
 
+    def _special_getstat(self, pathobj, key):
+        st = pathobj.stat(self._sep.join([self.rmt_path, key]))
+        return st.st_size, float(st.st_mtime)
+
     def beside_path(self, name):
         return os.path.join(tempfile.tempdir, '%s-%s' % (
             self.rmt_path.replace('/', '-'), name))
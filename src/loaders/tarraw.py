@@ -62,5 +62,9 @@ class TarRawLoader(BaseRawLoader):
         # BufferedReader -> TextIOWrapper encoding='UTF-8'
         return io.TextIOWrapper(pathobj.extractfile(key))
 
+    def _special_getstat(self, pathobj, key):
+        info = pathobj.getmember(key)
+        return info.size, float(info.mtime)
+
     def beside_path(self, name):
         return '-'.join([self.path[:self.path.rfind('.tar')], name])
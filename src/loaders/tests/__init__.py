@@ -3,6 +3,8 @@
 # Copyright (c) 2018-2020 shmilee
 
 import os
+import hashlib
+import shutil
 import tempfile
 import numpy
 
@@ -67,6 +69,17 @@ class RawLoaderTest(object):
         with self.assertRaises(ValueError):
             f2.read()
 
+    def loader_getstat(self):
+        loader = self.RawLoader(self.RawPath)
+        size, mtime = loader.getstat('d1/f2.out')
+        self.assertEqual(size, len('test2'))
+        self.assertTrue(isinstance(mtime, float) and mtime > 0)
+        self.assertEqual(loader.getsize('f1.out'), len('test1'))
+        self.assertEqual(loader.gethash('f1.out'),
+                         hashlib.sha1(b'test1').hexdigest())
+        with self.assertRaises(KeyError):
+            loader.getstat('lost-file')
+
 
 class PckLoaderTest(object):
     ''' Common test methods for PckLoader '''
@@ -79,6 +92,8 @@ class PckLoaderTest(object):
     def tearDown(self):
         if os.path.isfile(self.tmpfile):
             os.remove(self.tmpfile)
+        elif os.path.isdir(self.tmpfile):
+            shutil.rmtree(self.tmpfile)
 
     def loader_init(self, path=None):
         loader = self.PckLoader(path or self.tmpfile)
@@ -93,3 +108,55 @@ class PckLoaderTest(object):
             numpy.array_equal(loader.get('test/array'), DATA['test/array']))
         self.assertEqual(loader.get('test/float'), 3.1415)
         self.assertEqual(loader.get('te/st/int'), 1)
+
+    def loader_get_slice(self, path=None, cached=False):
+        loader = self.PckLoader(path or self.tmpfile)
+        arr = DATA['test/array']
+        self.assertTrue(numpy.array_equal(
+            loader.get_slice('test/array', numpy.s_[1:, 1]), arr[1:, 1]))
+        self.assertEqual(len(loader.cache), 1 if cached else 0)
+        a0, v0 = loader.get_many_slices(
+            numpy.s_[:2], 'test/array', 'test/vector')
+        self.assertTrue(numpy.array_equal(a0, arr[:2]))
+        self.assertTrue(numpy.array_equal(v0, DATA['test/vector'][:2]))
+        with self.assertRaises(KeyError):
+            loader.get_slice('lost/key', numpy.s_[:2])
+
+    def loader_getsize(self, path=None, known=True):
+        loader = self.PckLoader(path or self.tmpfile)
+        size = loader.getsize('test/array')
+        if known:
+            self.assertTrue(size >= DATA['test/array'].nbytes)
+        else:
+            self.assertEqual(size, 0)
+        self.assertEqual(loader.getsize('lost/key'), 0)
+        loader.get('test/array')  # cached value
+        self.assertEqual(loader.getsize('test/array'),
+                         DATA['test/array'].nbytes)
+
+    def loader_getshape(self, path=None):
+        loader = self.PckLoader(path or self.tmpfile)
+        self.assertEqual(loader.getshape('test/array'), (3, 2))
+        self.assertEqual(loader.getshape('test/vector'), (4,))
+        self.assertEqual(loader.getshape('test/float'), ())
+        self.assertFalse('test/array' in loader.cache)
+        loader.get('test/vector')  # cached value
+        self.assertEqual(loader.getshape('test/vector'), (4,))
+        with self.assertRaises(KeyError):
+            loader.getshape('lost/key')
+
+    def loader_recording(self, path=None):
+        loader = self.PckLoader(path or self.tmpfile)
+        loader.get('test/float')
+        loader.start_recording()
+        self.assertTrue('bver' in loader)
+        loader.get('test/float')  # cached value
+        loader.get_many('te/st/int', 'test/vector')
+        loader.get_slice('test/array', numpy.s_[:1])
+        self.assertFalse('lost/key' in loader)
+        self.assertDictEqual(loader.stop_recording(), {
+            'bver': False, 'test/float': True, 'te/st/int': True,
+            'test/vector': True, 'test/array': True, 'lost/key': False})
+        self.assertIsNone(loader.recording)
+        loader.get('bver')
+        self.assertDictEqual(loader.stop_recording(), {})
@@ -6,8 +6,10 @@ import os
 import unittest
 import tempfile
 import contextlib
+import pickle
+import numpy
 
-from ..base import BaseRawLoader, BasePckLoader
+from ..base import BaseRawLoader, BasePckLoader, PckCache
 
 
 class ImpBaseRawLoader(BaseRawLoader):
@@ -167,6 +169,9 @@ class TestBasePckLoader(unittest.TestCase):
     def test_pckloader_get_by_group(self):
         loader = ImpBasePckLoader(self.tmpfile)
         self.assertEqual(loader.get_by_group('g3'), {'k3': 3, 'k33': 33})
+        self.assertEqual(loader.get_by_group('g4'), {'k4': 4})
+        self.assertEqual(loader.get_by_group('g4/sg4'), {'k4': 4})
+        self.assertEqual(loader.get_by_group('g'), {})
 
     def test_pckloader_find(self):
         loader = ImpBasePckLoader(self.tmpfile)
@@ -193,3 +198,57 @@ class TestBasePckLoader(unittest.TestCase):
             datagroups_exclude=[r'^g2$'])
         self.assertEqual(loader['g3/max'], 33)
         self.assertTrue('g2/k2+1' not in loader)
+
+    def test_pckloader_cache_policy(self):
+        loader = ImpBasePckLoader(self.tmpfile, cache='off')
+        self.assertEqual(loader.get_many('k1', 'g2/k2'), (1, 2))
+        self.assertEqual(len(loader.cache), 0)
+        loader = ImpBasePckLoader(self.tmpfile, cache='lru:2')
+        self.assertEqual(loader.get_many('k1', 'g2/k2', 'g3/k3'), (1, 2, 3))
+        self.assertEqual(list(loader.cache), ['g2/k2', 'g3/k3'])
+        self.assertEqual(loader['g2/k2'], 2)
+        self.assertEqual(loader['k1'], 1)
+        self.assertEqual(list(loader.cache), ['g2/k2', 'k1'])
+        stats = loader.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'],
+                          stats['evictions']), (1, 4, 2))
+        loader.clear_cache()
+        self.assertEqual(len(loader.cache), 0)
+        self.assertEqual(loader.cache_stats()['hits'], 1)
+
+    def test_pckloader_pickle_cache(self):
+        loader = ImpBasePckLoader(self.tmpfile, cache='lru:2')
+        self.assertEqual(loader.get_many('k1', 'g2/k2'), (1, 2))
+        copy = pickle.loads(pickle.dumps(loader))
+        self.assertEqual(len(loader.cache), 2)
+        self.assertEqual(len(copy.cache), 0)
+        self.assertEqual(copy.cache.spec, 'lru:2')
+        self.assertEqual(copy['g2/k2'], 2)
+
+
+class TestPckCache(unittest.TestCase):
+    '''
+    Test class PckCache
+    '''
+
+    def test_cache_spec(self):
+        self.assertEqual(PckCache().spec, 'unbounded')
+        self.assertEqual(PckCache('lru:8').maxsize, 8)
+        self.assertEqual(PckCache('nbytes:2k').maxsize, 2048)
+        self.assertEqual(PckCache('nbytes:1G').spec, 'nbytes:%d' % 1024**3)
+        for spec in ('lru', 'lru:2M', 'nbytes:-1', 'lfu:10'):
+            with self.assertRaises(ValueError):
+                PckCache(spec)
+
+    def test_cache_nbytes(self):
+        cache = PckCache('nbytes:1200')
+        a, b = numpy.zeros(50), numpy.zeros(80)
+        cache['a'], cache['b'] = a, b
+        self.assertEqual(cache.nbytes, 1040)
+        cache['big'] = numpy.zeros(200)
+        self.assertFalse('big' in cache)
+        self.assertIs(cache['a'], a)
+        cache['c'] = numpy.zeros(60)
+        self.assertEqual(list(cache), ['a', 'c'])
+        self.assertEqual(cache.nbytes, 880)
+        self.assertEqual(cache.stats()['evictions'], 1)
@@ -17,3 +17,15 @@ class TestCachePckLoader(PckLoaderTest, unittest.TestCase):
 
     def test_cacheloader_get(self):
         self.loader_get(DATA_C)
+
+    def test_cacheloader_get_slice(self):
+        self.loader_get_slice(DATA_C)
+
+    def test_cacheloader_getsize(self):
+        self.loader_getsize(DATA_C)
+
+    def test_cacheloader_getshape(self):
+        self.loader_getshape(DATA_C)
+
+    def test_cacheloader_recording(self):
+        self.loader_recording(DATA_C)
@@ -42,3 +42,6 @@ class TestDirRawLoader(RawLoaderTest, unittest.TestCase):
 
     def test_dirloader_get(self):
         self.loader_get()
+
+    def test_dirloader_getstat(self):
+        self.loader_getstat()
@@ -42,3 +42,15 @@ class TestHdf5PckLoader(PckLoaderTest, unittest.TestCase):
 
     def test_hdf5loader_get(self):
         self.loader_get()
+
+    def test_hdf5loader_get_slice(self):
+        self.loader_get_slice()
+
+    def test_hdf5loader_getsize(self):
+        self.loader_getsize()
+
+    def test_hdf5loader_getshape(self):
+        self.loader_getshape()
+        loader = self.PckLoader(self.tmpfile)
+        self.assertTrue(isinstance(loader.get_dataset('test/array'),
+                                   h5py.Dataset))
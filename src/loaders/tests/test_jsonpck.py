@@ -23,6 +23,9 @@ class TestJsonlPckLoader(PckLoaderTest, unittest.TestCase):
     def test_jsonlloader_get(self):
         self.loader_get()
 
+    def test_jsonlloader_get_slice(self):
+        self.loader_get_slice(cached=True)
+
 
 class TestJsonzPckLoader(PckLoaderTest, unittest.TestCase):
     ''' Test class JsonzPckLoader '''
@@ -38,3 +41,6 @@ class TestJsonzPckLoader(PckLoaderTest, unittest.TestCase):
 
     def test_jsonzloader_get(self):
         self.loader_get()
+
+    def test_jsonzloader_get_slice(self):
+        self.loader_get_slice(cached=True)
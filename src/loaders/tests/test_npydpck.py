@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import unittest
+import numpy
+
+from . import DATA, PckLoaderTest
+from ..npydpck import NpydPckLoader
+from ...savers.npydpck import NpydPckSaver
+
+
+class TestNpydPckLoader(PckLoaderTest, unittest.TestCase):
+    ''' Test class NpydPckLoader '''
+    PckLoader = NpydPckLoader
+
+    def setUp(self):
+        super(TestNpydPckLoader, self).setUp()
+        with NpydPckSaver(self.tmpfile) as saver:
+            saver.write('', {k: v for k, v in DATA.items() if '/' not in k})
+            saver.write('test', {'array': DATA['test/array'],
+                                 'vector': DATA['test/vector'],
+                                 'float': DATA['test/float'],
+                                 'obj': [1, 'a', None]})
+            saver.write('te/st', {'int': DATA['te/st/int']})
+
+    def test_npydloader_init(self):
+        loader = self.PckLoader(self.tmpfile)
+        self.assertSetEqual(set(loader.datakeys),
+                            set(DATA.keys()) | {'test/obj'})
+        self.assertSetEqual(set(loader.datagroups), {'test', 'te/st'})
+        self.assertMultiLineEqual(loader.description, DATA['description'])
+
+    def test_npydloader_get(self):
+        self.loader_get()
+
+    def test_npydloader_get_slice(self):
+        self.loader_get_slice()
+        loader = self.PckLoader(self.tmpfile)
+        self.assertIsInstance(loader.get('test/array'), numpy.memmap)
+        self.assertEqual(loader.get('test/obj').tolist(), [1, 'a', None])
+
+    def test_npydloader_getsize(self):
+        self.loader_getsize()
+
+    def test_npydloader_getshape(self):
+        self.loader_getshape()
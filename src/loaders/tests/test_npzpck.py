@@ -22,3 +22,35 @@ class TestNpzPckLoader(PckLoaderTest, unittest.TestCase):
 
     def test_npzloader_get(self):
         self.loader_get()
+
+    def test_npzloader_get_slice(self):
+        self.loader_get_slice(cached=True)
+
+    def test_npzloader_getsize(self):
+        self.loader_getsize()
+
+    def test_npzloader_getshape(self):
+        self.loader_getshape()
+
+    def test_npzloader_recording(self):
+        self.loader_recording()
+
+    def test_npzloader_get_many_parallel(self):
+        loader = self.PckLoader(self.tmpfile)
+        keys = ('test/array', 'test/vector', 'test/float', 'te/st/int')
+        values = loader.get_many(*keys)
+        for k, v in zip(keys, values):
+            numpy.testing.assert_array_equal(v, DATA[k])
+        self.assertTrue(all(k in loader.cache for k in keys))
+        # prefetch, then get from futures
+        loader.set_cache('off')
+        self.assertEqual(loader.prefetch('test/array', 'no/key', 'test/float'),
+                         ('test/array', 'test/float'))
+        self.assertEqual(loader.prefetch('test/array'), ())
+        numpy.testing.assert_array_equal(
+            loader['test/array'], DATA['test/array'])
+        self.assertEqual(loader.get_many('test/float')[0], 3.1415)
+        self.assertEqual(loader._prefetching, {})
+        self.assertEqual(len(loader.cache), 0)
+        loader.close()
+        self.assertEqual(loader._zfhandles, [])
@@ -23,3 +23,6 @@ class TestTarRawLoader(RawLoaderTest, unittest.TestCase):
 
     def test_tarloader_get(self):
         self.loader_get()
+
+    def test_tarloader_getstat(self):
+        self.loader_getstat()
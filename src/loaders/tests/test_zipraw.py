@@ -23,3 +23,6 @@ class TestZipRawLoader(RawLoaderTest, unittest.TestCase):
 
     def test_ziploader_get(self):
         self.loader_get()
+
+    def test_ziploader_getstat(self):
+        self.loader_getstat()
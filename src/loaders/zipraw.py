@@ -8,6 +8,7 @@ Contains ZipFile raw loader class.
 
 import os
 import io
+import time
 import zipfile
 
 from ..glogger import getGLogger
@@ -61,5 +62,9 @@ class ZipRawLoader(BaseRawLoader):
         # BufferedReader -> TextIOWrapper encoding='UTF-8'
         return io.TextIOWrapper(pathobj.open(key))
 
+    def _special_getstat(self, pathobj, key):
+        info = pathobj.getinfo(key)
+        return info.file_size, time.mktime(info.date_time + (0, 0, -1))
+
     def beside_path(self, name):
         return '-'.join([self.path[:self.path.rfind('.zip')], name])
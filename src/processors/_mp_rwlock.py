@@ -10,18 +10,56 @@ Copyright (c) unhappydog
 
 import os
 import time
+import multiprocessing
 
 __all__ = ['MP_RWLock']
 
 
+class _SharedPids(object):
+    '''
+    Fixed-size list of pids in shared memory, slot 0 is free.
+    Only used while holding the condition lock of _RWLockCore.
+    '''
+
+    def __init__(self, ctx, size):
+        self.array = ctx.Array('i', size, lock=False)
+
+    def __contains__(self, pid):
+        return pid in self.array[:]
+
+    def append(self, pid):
+        for i, p in enumerate(self.array):
+            if p == 0:
+                self.array[i] = pid
+                return
+        raise RuntimeError("too many owners of RWLock")
+
+    def remove(self, pid):
+        for i, p in enumerate(self.array):
+            if p == pid:
+                self.array[i] = 0
+                return
+        raise ValueError("%d not in owners" % pid)
+
+    def pop_all(self):
+        pids = [p for p in self.array if p != 0]
+        self.array[:] = [0] * len(self.array)
+        return pids
+
+    def extend(self, pids):
+        for p in pids:
+            self.append(p)
+
+
 class _RWLockCore(object):
-    def __init__(self, manager):
-        self.cond = manager.Condition()
+    def __init__(self, ctx=None, size=256):
+        ctx = ctx or multiprocessing.get_context()
+        self.cond = ctx.Condition()
         # positive is shared count, negative exclusive count
-        self.state = manager.Value('i', 0)
-        self.waiting = manager.Value('i', 0)
-        # threads will be few, so a list is not inefficient
-        self.owning = manager.list()
+        self.state = ctx.Value('i', 0, lock=False)
+        self.waiting = ctx.Value('i', 0, lock=False)
+        # pids owning the lock, with recursion
+        self.owning = _SharedPids(ctx, size)
 
     # Acquire the lock in read mode.
     def acquire_read(self, timeout=None):
@@ -114,8 +152,7 @@ class _RWLockCore(object):
         with self.cond:
             if os.getpid() not in self.owning:
                 raise RuntimeError("cannot release an un-acquired lock")
-            r = self.owning
-            self.owning = []
+            r = self.owning.pop_all()
             self.state.value = 0
             self.cond.notify_all()
         return r
@@ -124,7 +161,8 @@ class _RWLockCore(object):
         # Reclaim the exclusive lock at the old recursion level
         self.acquire_write()
         with self.cond:
-            self.owning = x
+            self.owning.pop_all()
+            self.owning.extend(x)
             self.state.value = -len(x)
 
 
@@ -180,11 +218,16 @@ class MP_RWLock(object):
     A RWLock maintains a pair of associated locks, one for read-only operations
     and one for writing. The read lock may be held simultaneously by multiple
     reader threads, so long as there are no writers. The write lock is exclusive.
+
+    The state is kept in shared memory with native semaphores, not in a
+    Manager process. So, like :class:`multiprocessing.Lock`, it must be
+    inherited by child processes, e.g. passed as *initargs* of a Pool.
+    *size* is the max number of (recursive) owners.
     """
     core = _RWLockCore
 
-    def __init__(self, manager):
-        core = self.core(manager)
+    def __init__(self, ctx=None, size=256):
+        core = self.core(ctx=ctx, size=size)
         self._reader_lock = _ReaderLock(core)
         self._writer_lock = _WriterLock(core)
 
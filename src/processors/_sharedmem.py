@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Send large numpy arrays between processes through shared memory.
+
+The sender copies each large array into a new
+:class:`multiprocessing.shared_memory.SharedMemory` block, and sends only
+a small :class:`SharedArray` descriptor. The receiver maps the block,
+no copy, and the block stays mapped until all arrays using it are freed.
+Blocks are unlinked by the receiver (worker to main process),
+or by the sender after all tasks are done (main process to workers).
+
+Call :func:`start_tracker` in the main process before starting workers,
+then all processes share one resource tracker, and blocks created by
+a worker are not removed when the worker exits.
+'''
+
+import ctypes
+import numpy
+from multiprocessing import shared_memory, resource_tracker
+
+__all__ = ['SharedArray', 'start_tracker',
+           'share_arrays', 'attach_arrays', 'unlink_blocks']
+
+
+class SharedArray(object):
+    '''Descriptor of an array in a shared memory block.'''
+    __slots__ = ['name', 'shape', 'dtype']
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def __repr__(self):
+        return '<SharedArray %s %s %s>' % (self.name, self.shape, self.dtype)
+
+
+class _Mapping(object):
+    '''Keep a shared memory block mapped while arrays use it.'''
+
+    def __init__(self, shm, desc):
+        self.shm = shm
+        # get address without keeping an export of shm.buf,
+        # then shm can be closed when the last array is freed
+        cbuf = ctypes.c_char.from_buffer(shm.buf)
+        address = ctypes.addressof(cbuf)
+        del cbuf
+        self.__array_interface__ = dict(
+            version=3, shape=desc.shape, typestr=desc.dtype.str,
+            descr=desc.dtype.descr, data=(address, False))
+
+    def __del__(self):
+        self.shm.close()
+
+
+def start_tracker():
+    '''Start the resource tracker which is inherited by workers.'''
+    resource_tracker.ensure_running()
+
+
+def _walk(obj, func):
+    '''Apply *func* to items in nested dict, list and tuple.'''
+    if isinstance(obj, dict):
+        return {k: _walk(v, func) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_walk(v, func) for v in obj]
+    elif type(obj) is tuple:
+        return tuple(_walk(v, func) for v in obj)
+    else:
+        return func(obj)
+
+
+def share_arrays(obj, min_nbytes, blocks=None):
+    '''
+    Copy arrays in *obj* to shared memory, replace them with descriptors.
+
+    Parameters
+    ----------
+    obj: ndarray or dict, list, tuple contains arrays
+    min_nbytes: int or None
+        only arrays not smaller than this are shared, None to do nothing
+    blocks: list, optional
+        append names of new blocks to it, then they can be unlinked
+        by :func:`unlink_blocks`
+
+    Returns
+    -------
+    new obj, same arrays are shared once
+    '''
+    if min_nbytes is None:
+        return obj
+    memo = {}
+
+    def share(val):
+        if (not isinstance(val, numpy.ndarray) or val.dtype.hasobject
+                or val.nbytes == 0 or val.nbytes < min_nbytes):
+            return val
+        if id(val) not in memo:
+            shm = shared_memory.SharedMemory(create=True, size=val.nbytes)
+            try:
+                dst = numpy.ndarray(val.shape, val.dtype, buffer=shm.buf)
+                dst[...] = val
+                del dst
+            finally:
+                shm.close()
+            if blocks is not None:
+                blocks.append(shm.name)
+            memo[id(val)] = (SharedArray(shm.name, val.shape, val.dtype), val)
+        return memo[id(val)][0]
+    return _walk(obj, share)
+
+
+def attach_arrays(obj, unlink=True):
+    '''
+    Map shared arrays in *obj*, replace descriptors with arrays.
+
+    Parameters
+    ----------
+    unlink: bool
+        unlink blocks after mapping, as the owner of them
+    '''
+    memo = {}
+
+    def attach(val):
+        if not isinstance(val, SharedArray):
+            return val
+        if val.name not in memo:
+            shm = shared_memory.SharedMemory(name=val.name)
+            if unlink:
+                shm.unlink()
+            memo[val.name] = numpy.asarray(_Mapping(shm, val))
+        return memo[val.name]
+    return _walk(obj, attach)
+
+
+def unlink_blocks(blocks):
+    '''Unlink shared memory blocks by names.'''
+    for name in blocks:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+    del blocks[:]
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Contains on-disk dig results cache class, shared by processors.
+'''
+
+import os
+import time
+import json
+import pickle
+import hashlib
+import numpy
+
+from ..__about__ import __userbase__, __gversion__
+from ..glogger import getGLogger
+
+__all__ = ['DigCache']
+plog = getGLogger('P')
+
+
+def _hash_value(h, value):
+    '''Update hash object *h* with *value*, type and shape included.'''
+    if isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+        h.update(b'A%s%r' % (value.dtype.str.encode(), value.shape))
+        h.update(numpy.ascontiguousarray(value).view(numpy.uint8).data)
+    elif isinstance(value, (list, tuple)):
+        h.update(b'L%d' % len(value))
+        for v in value:
+            _hash_value(h, v)
+    elif isinstance(value, dict):
+        h.update(b'D%d' % len(value))
+        for k in sorted(value, key=repr):
+            _hash_value(h, k)
+            _hash_value(h, value[k])
+    elif isinstance(value, str):
+        h.update(b'S%d:' % len(value))
+        h.update(value.encode('utf-8', 'surrogatepass'))
+    elif isinstance(value, bytes):
+        h.update(b'B%d:' % len(value))
+        h.update(value)
+    elif value is None or isinstance(value, (bool, int, float, complex,
+                                             numpy.generic)):
+        h.update(b'N%s%r;' % (type(value).__name__.encode(), value))
+    else:
+        h.update(b'P')
+        h.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class DigCache(object):
+    '''
+    Cache dig results on disk, by hashes of the data they are digged from.
+    Processors opening same data, or sibling cases with same data,
+    share the cached results.
+
+    Attributes
+    ----------
+    path: str
+        cache directory, default '__userbase__/digcache'
+    maxbytes: int
+        max total size of cached results, default 1GiB
+    maxage: float
+        max seconds since cached results were last used, default 30 days
+    min_digtime: float
+        only results digged in more seconds than this are cached,
+        default 1.0
+
+    Notes
+    -----
+    1. A dig is identified by gdpy3 version, digger class, figlabel,
+       its kwargs and keys of its digger core. Keys of data got or
+       checked by the dig are recorded in '<dig hash>.keys'.
+       Results are saved in '<data hash>.pickle', data hash is
+       calculated from the dig hash and digests of groups of these data,
+       which are saved by processors when data are converted, see
+       :meth:`data_digest`. Data without digests, like virtual keys,
+       are hashed by their values. So changed data, like after
+       incremental conversion, never get old results.
+    2. Results files not used in :attr:`maxage` seconds are removed.
+       When total size exceeds :attr:`maxbytes`, least recently used
+       results are removed.
+    '''
+    __slots__ = ['path', 'maxbytes', 'maxage', 'min_digtime']
+
+    def __init__(self, path=None, maxbytes=2**30, maxage=30 * 86400,
+                 min_digtime=1.0):
+        self.path = path or os.path.join(__userbase__, 'digcache')
+        self.maxbytes = maxbytes
+        self.maxage = maxage
+        self.min_digtime = min_digtime
+        os.makedirs(self.path, exist_ok=True)
+
+    def __repr__(self):
+        return '<DigCache %s>' % self.path
+
+    @staticmethod
+    def data_digest(data):
+        '''Return SHA1 of converted dict *data*, keys and values.'''
+        h = hashlib.sha1()
+        _hash_value(h, data)
+        return h.hexdigest()
+
+    @staticmethod
+    def dig_hash(digcore, kwargs):
+        '''
+        Return hash of digger class, figlabel, *kwargs*, and keys of
+        *digcore*, which change when new groups are added.
+        '''
+        cls = type(digcore)
+        ident = [__gversion__, '%s.%s' % (cls.__module__, cls.__qualname__),
+                 digcore.figlabel,
+                 digcore.str_dig_kwargs(kwargs, complete=False),
+                 sorted(digcore.srckeys + digcore.extrakeys)]
+        return hashlib.sha1(json.dumps(ident).encode()).hexdigest()
+
+    @staticmethod
+    def _group_digest(digests, key):
+        group = os.path.dirname(key)
+        while group:
+            if group in digests:
+                return digests[group]
+            group = os.path.dirname(group)
+        return None
+
+    @classmethod
+    def data_hash(cls, dighash, pckloader, keys):
+        '''
+        Return hash of *dighash* and data of *keys* in *pckloader*.
+        *keys* is a dict, True if the value is used, False if only
+        the existence is checked.
+        Digests of groups are used, only values of data without
+        a digest are read.
+        '''
+        digests = {}
+        if 'digests' in pckloader:
+            digests = json.loads(pckloader.get('digests'))
+        h = hashlib.sha1(dighash.encode())
+        gotkeys = sorted(k for k, got in keys.items()
+                         if got and k in pckloader)
+        checked = sorted(k for k in keys if k not in gotkeys)
+        for key in checked:
+            _hash_value(h, (key, key in pckloader))
+        readkeys = []
+        for key in gotkeys:
+            digest = cls._group_digest(digests, key)
+            if digest is None or key in pckloader.virtualkeys:
+                readkeys.append(key)
+            else:
+                _hash_value(h, (key, digest))
+        for key, value in zip(readkeys, pckloader.get_many(*readkeys)):
+            _hash_value(h, key)
+            _hash_value(h, value)
+        return h.hexdigest()
+
+    def _file(self, name, ext):
+        return os.path.join(self.path, '%s.%s' % (name, ext))
+
+    def _write(self, path, data, mode='wb'):
+        tmppath = '%s-%d.tmp' % (path, os.getpid())
+        with open(tmppath, mode) as f:
+            f.write(data)
+        os.replace(tmppath, path)
+
+    def _lookup(self, digcore, kwargs):
+        '''
+        Return dig hash, recorded keys, data hash and cached data of
+        *digcore* with *kwargs*. The last three may be None.
+        '''
+        dighash = self.dig_hash(digcore, kwargs)
+        keyspath = self._file(dighash, 'keys')
+        try:
+            with open(keyspath) as f:
+                keys = json.load(f)
+        except (OSError, ValueError):
+            return dighash, None, None, None
+        datahash = self.data_hash(dighash, digcore.pckloader, keys)
+        path = self._file(datahash, 'pickle')
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            os.utime(path)
+            os.utime(keyspath)
+        except FileNotFoundError:
+            return dighash, keys, datahash, None
+        except Exception:
+            plog.warning("Remove invalid dig cache %s!" % path, exc_info=1)
+            self._remove(path)
+            return dighash, keys, datahash, None
+        plog.info("Find %s digged results in %s." % (
+            digcore.figlabel, self))
+        return dighash, keys, datahash, data
+
+    def get(self, digcore, kwargs):
+        '''
+        Return cached (results, kwargstr, digtime, kwoptions) of
+        *digcore* with *kwargs*, or None.
+        '''
+        return self._lookup(digcore, kwargs)[3]
+
+    def put(self, digcore, kwargs, keys, results, kwargstr, digtime,
+            datahash=None):
+        '''
+        Cache *results* of *digcore* with *kwargs*, which are digged
+        from data *keys*. *datahash* of *keys* is calculated if None.
+        '''
+        dighash = self.dig_hash(digcore, kwargs)
+        if datahash is None:
+            datahash = self.data_hash(dighash, digcore.pckloader, keys)
+        path = self._file(datahash, 'pickle')
+        data = (results, kwargstr, digtime, digcore.kwoptions)
+        try:
+            self._write(path, pickle.dumps(
+                data, protocol=pickle.HIGHEST_PROTOCOL))
+            self._write(self._file(dighash, 'keys'), json.dumps(keys), 'w')
+        except Exception:
+            plog.warning("Failed to cache %s digged results in %s!"
+                         % (digcore.figlabel, self), exc_info=1)
+            self._remove(path)
+            return
+        plog.debug("Cache %s digged results in %s." % (digcore.figlabel, path))
+        self.evict()
+
+    def dig(self, digcore, kwargs):
+        '''
+        Get cached results of *digcore* with *kwargs*, or dig and cache
+        them. Return results, kwargstr and digtime, like :meth:`Digger.dig`.
+        '''
+        dighash, oldkeys, datahash, data = self._lookup(digcore, kwargs)
+        if data is not None:
+            results, kwargstr, digtime, kwoptions = data
+            if digcore.kwoptions is None:
+                digcore.kwoptions = kwoptions
+            return results, kwargstr, digtime
+        pckloader = digcore.pckloader
+        pckloader.start_recording()
+        try:
+            results, kwargstr, digtime = digcore.dig(**kwargs)
+        finally:
+            keys = pckloader.stop_recording()
+        if results and digtime >= self.min_digtime:
+            for key in digcore.srckeys + digcore.extrakeys:
+                keys.setdefault(key, False)
+            if keys != oldkeys:
+                datahash = None  # new keys, hash them again
+            self.put(digcore, kwargs, keys, results, kwargstr, digtime,
+                     datahash=datahash)
+        return results, kwargstr, digtime
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        '''Remove old results, and least recently used ones if too many.'''
+        now = time.time()
+        entries, total = [], 0
+        for entry in os.scandir(self.path):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if now - st.st_mtime > self.maxage:
+                self._remove(entry.path)
+            elif entry.name.endswith('.pickle'):
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        if total <= self.maxbytes:
+            return
+        for mtime, size, path in sorted(entries):
+            self._remove(path)
+            total -= size
+            if total <= self.maxbytes:
+                break
+        plog.debug("Evict dig cache %s to %d bytes." % (self, total))
+
+    def clear(self):
+        '''Remove all cached results.'''
+        for entry in os.scandir(self.path):
+            self._remove(entry.path)
@@ -108,7 +108,10 @@ def find_Processor(name, parallel):
             # cache in module scope, useful when multiprocessing
             globals()['Multi%s' % name] = gdpcls
         elif parallel == 'mpi4py':
-            raise ValueError('TODO %s' % parallel)
+            from .mpiprocessor import MPIProcessor
+            gdpcls = type('MPI%s' % name, (base, MPIProcessor),
+                          {'__slots__': []})
+            globals()['MPI%s' % name] = gdpcls
         else:
             raise ValueError('Unsupported parallel-lib: %s' % parallel)
         plog.debug("'lib' scope's global variables: %s" % globals().keys())
@@ -113,14 +113,13 @@ def change_pckdata_ext(path, ext):
     if os.path.exists(newpath):
         plog.warning("Data file %s exists! Nothing to do!" % newpath)
         return
-    oldloader = get_pckloader(path)
+    oldloader = get_pckloader(path, cache='off')
     with get_pcksaver(newpath) as newsaver:
         newsaver.write('/',  _get_info_of_pckdata(oldloader, ext2))
         for grp in oldloader.datagroups:
             results = oldloader.get_by_group(grp)
             plog.info("Copy: %s" % grp)
             newsaver.write(grp, results)
-            oldloader.clear_cache()
     plog.info("Done. %s -> %s." % (path, os.path.basename(newpath)))
 
 
@@ -146,7 +145,7 @@ def change_pckdata_array_bitsize(path, size=32):
     if os.path.exists(newpath):
         plog.warning("New data file %s exists!" % newpath)
         return
-    oldloader = get_pckloader(path)
+    oldloader = get_pckloader(path, cache='off')
     # check size
     oldsize = None
     for k in random.sample(oldloader.keys(), min(256, len(oldloader.keys()))):
@@ -168,7 +167,6 @@ def change_pckdata_array_bitsize(path, size=32):
                         # create new array by new default dtype
                         results[k] = np.array(v)
             newsaver.write(grp, results)
-            oldloader.clear_cache()
     plog.info("Done. %s -> %s." % (path, os.path.basename(newpath)))
 
 
@@ -301,7 +299,7 @@ def remove_digged_data(path, by_groups=None, by_groups_pattern=None):
     if not (ext2 == '.digged' and ext1 in pcksaver_types[1:]):
         plog.error("This is not a digged data path %s!" % path)
         return
-    oldloader = get_pckloader(path)
+    oldloader = get_pckloader(path, cache='off')
     oldgroups = oldloader.groups()
     # groups to remove
     groupstodo = set()
@@ -328,7 +326,6 @@ def remove_digged_data(path, by_groups=None, by_groups_pattern=None):
                 results = oldloader.get_by_group(dl)
                 plog.info("Copy: %s" % dl)
                 newsaver.write(dl, results)
-                oldloader.clear_cache()
     backpath = '%s-backup%s%s' % (root, ext2, ext1)
     plog.info("Backup old digged data: %s -> %s" % (path, backpath))
     oldloader.close()
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Contains mpi4py processor class.
+'''
+
+import functools
+import traceback
+import collections
+try:
+    from mpi4py import MPI
+except ImportError as exc:
+    raise ImportError('MPIProcessor requires mpi4py. But %s' % exc) from None
+
+from .processor import Processor, plog
+from .multiprocessor import MultiProcessor
+from ..loaders import get_pckloader
+from ..utils import inherit_docstring
+
+__all__ = ['MPIProcessor', 'MPITaskPool']
+
+_TAG = 77
+
+
+class MPITaskPool(object):
+    '''
+    Run tasks on MPI ranks, rank 0 is the coordinator.
+
+    Other ranks wait in :meth:`serve`, run tasks sent by rank 0 and send
+    back the returns, until rank 0 calls :meth:`stop`.
+
+    Attributes
+    ----------
+    comm: MPI communicator
+    rank: int
+    size: int
+    '''
+    __slots__ = ['comm', 'rank', 'size', '_idle', '_depth']
+
+    def __init__(self, comm=None):
+        self.comm = comm or MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+        self._idle = []  # ranks waiting for tasks
+        self._depth = 0  # level of nested collective calls on rank 0
+
+    def imap_unordered(self, processor, method, tasks):
+        '''
+        Rank 0 calls *method* of *processor* on other ranks for each task.
+        Yield (tag, return) in order of completion.
+
+        Parameters
+        ----------
+        tasks: list of (tag, args)
+        '''
+        pending = collections.deque(tasks)
+        busy = 0
+        status = MPI.Status()
+        while pending or busy:
+            while pending and self._idle:
+                tag, args = pending.popleft()
+                self.comm.send((tag, method, args),
+                               dest=self._idle.pop(), tag=_TAG)
+                busy += 1
+            msg = self.comm.recv(
+                source=MPI.ANY_SOURCE, tag=_TAG, status=status)
+            self._idle.append(status.Get_source())
+            if msg is None:  # a rank is ready
+                continue
+            busy -= 1
+            tag, error, res = msg
+            if error:
+                raise RuntimeError("Task %s of %s failed in rank %d:\n%s"
+                                   % (tag, method, status.Get_source(), error))
+            yield tag, res
+
+    def serve(self, processor):
+        '''Other ranks run tasks from rank 0, until stopped.'''
+        self.comm.send(None, dest=0, tag=_TAG)
+        while True:
+            task = self.comm.recv(source=0, tag=_TAG)
+            if task is None:
+                break
+            tag, method, args = task
+            try:
+                res = getattr(processor, method)(*args)
+            except Exception:
+                plog.error("Failed to run task %s of %s!" % (tag, method),
+                           exc_info=1)
+                msg = (tag, traceback.format_exc(), None)
+            else:
+                msg = (tag, None, res)
+            self.comm.send(msg, dest=0, tag=_TAG)
+
+    def stop(self):
+        '''Rank 0 waits for all other ranks, then stops them.'''
+        status = MPI.Status()
+        while len(self._idle) < self.size - 1:
+            self.comm.recv(source=MPI.ANY_SOURCE, tag=_TAG, status=status)
+            self._idle.append(status.Get_source())
+        for dest in self._idle:
+            self.comm.send(None, dest=dest, tag=_TAG)
+        self._idle = []
+
+    def run_collective(self, processor, func, default, *args, **kwargs):
+        '''
+        Called by all ranks. Rank 0 runs *func*, and distributes its tasks.
+        Other ranks serve tasks, then return *default*.
+        Only the outermost call on rank 0 stops other ranks.
+        '''
+        if self.rank != 0:
+            self.serve(processor)
+            return default
+        self._depth += 1
+        try:
+            return func(processor, *args, **kwargs)
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.stop()
+
+
+# one task pool for MPI.COMM_WORLD
+_TASKPOOL = None
+
+
+def _get_taskpool():
+    global _TASKPOOL
+    if _TASKPOOL is None:
+        _TASKPOOL = MPITaskPool()
+    return _TASKPOOL
+
+
+def _collective(default):
+    '''
+    Make a method collective, all ranks must call it.
+    The return is only valid on rank 0, other ranks get *default*.
+    '''
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.multiproc <= 1:
+                return method(self, *args, **kwargs)
+            return _get_taskpool().run_collective(
+                self, method, default, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@inherit_docstring(MultiProcessor, parse=None, template=None)
+class MPIProcessor(MultiProcessor):
+    '''
+    MPI Processor class, use it under `mpirun`.
+
+    Attributes
+    ----------
+    {Attributes}
+
+    Notes
+    -----
+    {Notes}
+    8. For :class:`MPIProcessor`, :attr:`multiproc` is the number of
+       MPI processes. Rank 0 coordinates tasks and saves all results,
+       other ranks run converter cores, dig, visplt tasks.
+       All ranks must call :meth:`convert`, :meth:`update`,
+       :meth:`multi_dig`, :meth:`multi_export` and :meth:`multi_visplt`
+       together, their returns are only valid on rank 0.
+       Option *whichlock* and :attr:`sharedmem_nbytes` are ignored.
+    '''
+    __slots__ = []
+    parallel = 'mpi4py'
+    multiproc = MPI.COMM_WORLD.Get_size()
+    sharedmem_nbytes = None
+
+    @property
+    def name(self):
+        return type(self).__name__[3:]
+
+    @property
+    def rank(self):
+        return _get_taskpool().rank
+
+    def shutdown(self):
+        pass
+
+    def _imap_tasks(self, method, tasks):
+        if self.multiproc <= 1:
+            # no other ranks, run tasks here
+            return ((tag, getattr(self, method)(*args)) for tag, args in tasks)
+        return _get_taskpool().imap_unordered(self, method, tasks)
+
+    def _count_task_done(self, total, desc):
+        plog.info("Task: %s (rank %d, total %d) done."
+                  % (desc, self.rank, total))
+
+    def _convert_if_needed(self, overwrite, add_desc, incremental=False):
+        if self.multiproc <= 1:
+            return super(MPIProcessor, self)._convert_if_needed(
+                overwrite, add_desc, incremental=incremental)
+        need = self._need_convert(overwrite) if self.rank == 0 else None
+        if _get_taskpool().comm.bcast(need, root=0):
+            self.convert(add_desc=add_desc)
+        elif incremental:
+            return self._convert_update()
+        return []
+
+    convert = _collective(None)(MultiProcessor.convert)
+    multi_convert = convert
+
+    def _convert_update(self, rescan=True, skip=None):
+        if self.multiproc <= 1:
+            return super(MPIProcessor, self)._convert_update(
+                rescan=rescan, skip=skip)
+        # all ranks use the raw filenames and get the updated groups
+        # of rank 0, then converter indices are same
+        comm = _get_taskpool().comm
+        if rescan and self.rank == 0 and self.rawloader:
+            self.rawloader.update()
+        self.rawloader = comm.bcast(
+            self.rawloader if self.rank == 0 else None, root=0)
+        groups = _collective(None)(MultiProcessor._convert_update)(
+            self, rescan=False, skip=skip)
+        return comm.bcast(groups, root=0)
+
+    def _invalidate_digged(self, groups):
+        # rank 0 rewrites resfile, then other ranks reopen it
+        if self.multiproc <= 1:
+            return super(MPIProcessor, self)._invalidate_digged(groups)
+        if self.rank == 0:
+            labels = super(MPIProcessor, self)._invalidate_digged(groups)
+        _get_taskpool().comm.barrier()
+        if self.rank != 0:
+            labels = self._dependent_digged(groups)
+            self._diggedlabels.difference_update(labels)
+            if self.resfileloader and labels:
+                self.resfileloader = get_pckloader(self.resfilesaver.path)
+        return labels
+
+    def set_prefer_ressaver(self, ext2='digged', oldext2='converted',
+                            overwrite=False):
+        # each rank has its own cache, rank 0 may remove old files first
+        if self.multiproc <= 1 or self.rank == 0:
+            Processor.set_prefer_ressaver(
+                self, ext2=ext2, oldext2=oldext2, overwrite=overwrite)
+        if self.multiproc > 1:
+            _get_taskpool().comm.barrier()
+            if self.rank != 0:
+                Processor.set_prefer_ressaver(
+                    self, ext2=ext2, oldext2=oldext2, overwrite=False)
+
+    @_collective([])
+    def multi_dig(self, *couple_figlabels, whichlock='write',
+                  redig=False, callback=None, post=True):
+        '''
+        Get digged results of *couple_figlabels* on other ranks.
+        See :meth:`MultiProcessor.multi_dig`, *whichlock* is always 'write'.
+        '''
+        return MultiProcessor.multi_dig(
+            self, *couple_figlabels, whichlock='write',
+            redig=redig, callback=callback, post=post)
+
+    multi_export = _collective(None)(MultiProcessor.multi_export)
+    multi_visplt = _collective(([], []))(MultiProcessor.multi_visplt)
@@ -7,17 +7,172 @@ Contains multiprocess processor class.
 '''
 
 import os
+import json
+import pickle
 import multiprocessing
+import multiprocessing.util
 
 from .processor import Processor, plog
 from ._mp_rwlock import MP_RWLock
+from .digcache import DigCache
+from ._sharedmem import (
+    start_tracker, share_arrays, attach_arrays, unlink_blocks)
 from ..glogger import LogWorkInitializer
 from ..tools import nparray_default_bitsize
 from ..loaders import get_pckloader
 from ..utils import inherit_docstring
 
 
-__all__ = ['MultiProcessor']
+__all__ = ['MultiProcessor', 'WorkerPool']
+
+# Manager and log listener shared by all worker pools in this interpreter
+_SHARED = {}
+
+
+def _get_shared():
+    '''
+    Return the shared (manager, loginitializer) of this process.
+    They are started lazily and stopped at exit.
+    '''
+    pid = os.getpid()
+    if _SHARED.get('pid') != pid:
+        # new interpreter, or a forked child which has no manager server
+        manager = multiprocessing.Manager()
+        loginitializer = LogWorkInitializer(manager)
+        _SHARED.update(pid=pid, manager=manager,
+                       loginitializer=loginitializer)
+        # run before the manager's own finalizer (exitpriority=0),
+        # also in forked processes which skip atexit
+        multiprocessing.util.Finalize(
+            None, _stop_shared, args=(pid,), exitpriority=10)
+    return _SHARED['manager'], _SHARED['loginitializer']
+
+
+def _stop_shared(pid):
+    if _SHARED.get('pid') == pid:
+        _SHARED['loginitializer'].__exit__(None, None, None)
+        _SHARED['manager'].shutdown()
+        _SHARED.clear()
+
+
+# the processor copy and (count, rwlock) in each worker process
+_WORKER_PROCESSOR = None
+_WORKER_SYNC = None
+
+
+def _init_worker(loginitializer, state, sync):
+    loginitializer()
+    global _WORKER_PROCESSOR, _WORKER_SYNC
+    _WORKER_PROCESSOR = pickle.loads(state)
+    _WORKER_SYNC = sync
+
+
+def _call_worker(task):
+    tag, method, args = task
+    try:
+        return tag, getattr(_WORKER_PROCESSOR, method)(*args)
+    finally:
+        # long-lived workers keep no values after a task,
+        # or their caches grow with all data got in a session
+        pckloader = getattr(_WORKER_PROCESSOR, 'pckloader', None)
+        if pckloader:
+            pckloader.clear_cache()
+
+
+class WorkerPool(object):
+    '''
+    Long-lived worker processes for :class:`MultiProcessor`.
+
+    The processor is pickled once, when the pool starts,
+    then only task arguments are sent to workers. The pool is started
+    lazily, and restarted if the processor's loaders, savers, visplter
+    or worker number are changed.
+
+    Values cached by the pckloader copy in a worker are dropped
+    after each task, and the cached values in the processor's pckloader
+    are not pickled, so memory of workers does not grow with the
+    session.
+
+    Workers inherit native synchronization primitives when the pool starts:
+    a task counter in shared memory and a read-write lock.
+    In workers, they are in the module variable `_WORKER_SYNC`.
+
+    Attributes
+    ----------
+    processes: int
+        number of worker processes
+    count: multiprocessing.Value, number of completed tasks
+    rwlock: MP_RWLock
+    '''
+    __slots__ = ['processes', '_pool', '_shipped', 'count', 'rwlock']
+
+    def __init__(self):
+        self.processes = 0
+        self._pool = None
+        self._shipped = None
+        self.count, self.rwlock = None, None
+
+    @staticmethod
+    def _shipped_state(processor):
+        return (processor.multiproc,
+                getattr(processor, 'rawloader', None),
+                getattr(processor, '_converters', None),
+                getattr(processor, 'pcksaver', None),
+                getattr(processor, 'pckloader', None),
+                getattr(processor, '_diggers', None),
+                getattr(processor, 'ressaver', None),
+                getattr(processor, 'resfilesaver', None),
+                getattr(processor, 'digcache', None),
+                getattr(processor, 'visplter', None))
+
+    def is_current(self, processor):
+        '''Return True if workers have the state of *processor*.'''
+        if self._pool is None:
+            return False
+        return all(a is b for a, b in zip(
+            self._shipped, self._shipped_state(processor)))
+
+    def get(self, processor):
+        '''Return a started :class:`multiprocessing.pool.Pool`.'''
+        if not self.is_current(processor):
+            self.shutdown()
+            _, loginitializer = _get_shared()
+            self.processes = processor.multiproc
+            self.count = multiprocessing.Value('i', 0)
+            self.rwlock = MP_RWLock()
+            # workers share one tracker of shared memory blocks
+            start_tracker()
+            plog.debug('Starting %d worker processes ...' % self.processes)
+            self._pool = multiprocessing.Pool(
+                processes=self.processes, initializer=_init_worker,
+                initargs=(loginitializer, pickle.dumps(processor),
+                          (self.count, self.rwlock)))
+            self._shipped = self._shipped_state(processor)
+        return self._pool
+
+    def imap_unordered(self, processor, method, tasks):
+        '''
+        Call *method* of the worker copy of *processor* for each task,
+        and reset the task counter before.
+        Yield (tag, return) in order of completion.
+
+        Parameters
+        ----------
+        tasks: list of (tag, args)
+        '''
+        pool = self.get(processor)
+        self.count.value = 0
+        return pool.imap_unordered(
+            _call_worker, [(tag, method, args) for tag, args in tasks])
+
+    def shutdown(self):
+        '''Stop worker processes. They will be restarted when needed.'''
+        if self._pool is not None:
+            plog.debug('Stopping %d worker processes ...' % self.processes)
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self._shipped = None
 
 
 @inherit_docstring(Processor, parse=None, template=None)
@@ -34,10 +189,52 @@ class MultiProcessor(Processor):
     {Notes}
     4. :attr:`multiproc` is the max number of worker processes,
        default multiprocessing.cpu_count().
+    5. Worker processes are kept in :attr:`workerpool` and reused by
+       all multi_* methods. Call :meth:`shutdown` to stop them.
+    6. If :attr:`sharedmem_nbytes` is set, ndarrays not smaller than it
+       are sent between processes through shared memory, not pickled.
+       Converted data, dig results and visplt inputs use it.
+       Default None, disabled.
+    7. Convert and dig tasks are dispatched longest-first, idle workers
+       take the next task one by one. Cost of a converter is the size of
+       its raw files. Cost of a digger is the dig time recorded in
+       :attr:`resfileloader`, or the size of its data in :attr:`pckloader`
+       divided by :attr:`cost_bytes_per_second`.
     '''
-    __slots__ = []
+    __slots__ = ['_workerpool']
     parallel = 'multiprocess'
     multiproc = multiprocessing.cpu_count()
+    sharedmem_nbytes = None
+    cost_bytes_per_second = 1e8
+
+    @property
+    def workerpool(self):
+        pool = getattr(self, '_workerpool', None)
+        if pool is None:
+            pool = WorkerPool()
+            self._workerpool = pool
+        return pool
+
+    def shutdown(self):
+        pool = getattr(self, '_workerpool', None)
+        if pool is not None:
+            pool.shutdown()
+
+    def __getstate__(self):
+        # copy for workers, no pool, no resfileloader.
+        # resfileloader may be written by main process, workers reopen it.
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', []):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state.pop('_workerpool', None)
+        state['_resfileloader'] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
 
     @property
     def name(self):
@@ -52,73 +249,123 @@ class MultiProcessor(Processor):
         else:
             plog.error("'number' must be >=1!")
 
-    def _count_task_done(self, lock, count, total, desc):
+    def _imap_tasks(self, method, tasks):
+        '''
+        Call *method* in workers for each task, see
+        :meth:`WorkerPool.imap_unordered`. Yield (tag, return).
+        '''
+        return self.workerpool.imap_unordered(self, method, tasks)
+
+    @staticmethod
+    def _longest_first(tasks, costs):
+        '''Sort *tasks* by *costs* in descending order, stable.'''
+        order = sorted(range(len(tasks)), key=costs.__getitem__,
+                       reverse=True)
+        return [tasks[i] for i in order]
+
+    def _convert_cost(self, core):
+        '''Estimate cost of converter *core*, total size of raw files.'''
+        files = [core.files] if isinstance(core.files, str) else core.files
+        cost = 0
+        for name in files:
+            try:
+                cost += self.rawloader.getsize(name)
+            except Exception:
+                pass
+        return cost
+
+    def _dig_cost(self, figlabel, kwargs):
+        '''
+        Estimate cost of digging *figlabel* with *kwargs* in seconds.
+        Use the dig time recorded in :attr:`resfileloader` if found.
+        '''
+        digcore = self._availablelabels_lib.get(figlabel)
+        if digcore is None:
+            return 0
+        gotfiglabel = '%s/%s' % (
+            figlabel, digcore.str_dig_kwargs(kwargs) or 'DEFAULT')
+        if self.resfileloader:
+            loader = self.resfileloader
+            gotfiglabel = loader.get('%s/_LINK' % gotfiglabel, gotfiglabel)
+            digtime = loader.get('%s/digtime' % gotfiglabel)
+            if digtime is not None:
+                return float(digtime)
+        nbytes = sum(self.pckloader.getsize(key)
+                     for key in digcore.srckeys + digcore.extrakeys)
+        return nbytes / self.cost_bytes_per_second
+
+    def _count_task_done(self, total, desc):
         '''
+        Count and log completed tasks in workers.
+
         Parameters
         ----------
-        lock: multiprocessing lock
-        count: multiprocessing value number of completed tasks
         total: total number of tasks
         desc: description of task
         '''
-        with lock:
+        count = _WORKER_SYNC[0]
+        with count.get_lock():
             count.value += 1
             done = count.value
         plog.info("Task: %s (%d/%d) done." % (desc, done, total))
 
     # # Start Convert Part
 
-    def _convert_worker(self, core, lock, count, total, name_it=True):
+    def _convert_worker(self, index, total, name_it=True):
         '''
+        Convert raw data, return group, data, manifest of raw files
+        and digest of data to the main process.
+
         Parameters
         ----------
-        core: Converter core instance
-        lock: multiprocessing lock
+        index: index of Converter core in :attr:`converters`
+        total: total number of tasks
         name_it: bool
             When using multiprocessing,
             *name_it* is True, processname is set to :attr:`core.groupnote`.
         '''
+        core = self.converters[index]
         if name_it:
             multiprocessing.current_process().name = core.groupnote
+        rawfiles = self._raw_manifest(core)
         with nparray_default_bitsize(size=self.convert_array_bitsize):
             data = core.convert()
-        lock.acquire()
-        try:
-            plog.info("Writing data in group %s ..." % core.group)
-            with self.pcksaver:
-                self.pcksaver.write(core.group, data)
-        finally:
-            self._count_task_done(lock, count, total, 'Convert')
-            lock.release()
+        digest = None if data is None else DigCache.data_digest(data)
+        self._count_task_done(total, 'Convert')
+        return (core.group, share_arrays(data, self.sharedmem_nbytes),
+                rawfiles, digest)
 
-    def convert(self, add_desc=None):
+    def _convert_cores(self, indices, manifest, hashes=None, digests=None):
         '''
         Use multiprocessing to convert raw data.
+        Workers only convert, the main process writes all data
+        in one pcksaver session, in order of completion.
         '''
         if self.multiproc > 1:
-            self._pre_convert(add_desc=add_desc)
-            nworkers = min(self.multiproc, len(self.converters))
-            plog.debug('%d processes to work!' % nworkers)
-            manager = multiprocessing.Manager()  # for control data
-            with LogWorkInitializer(manager) as loginitializer:
-                lock = manager.RLock()
-                count = manager.Value('i', 0, lock=False)
-                total = len(self.converters)
-                with multiprocessing.Pool(
-                        processes=nworkers,
-                        initializer=loginitializer) as pool:
-                    results = [pool.apply_async(
-                        self._convert_worker, (core, lock, count, total))
-                        for core in self.converters]
-                    pool.close()
-                    pool.join()
-            self._post_convert()
+            total = len(indices)
+            tasks = [(idx, (idx, total)) for idx in indices]
+            tasks = self._longest_first(tasks, [
+                self._convert_cost(self.converters[idx]) for idx in indices])
+            # start workers before opening pcksaver
+            it = self._imap_tasks('_convert_worker', tasks)
+            with self.pcksaver:
+                digests = {} if digests is None else digests
+                for idx, (group, data, rawfiles, digest) in it:
+                    if data is None:
+                        continue  # failed, convert it again in next update
+                    plog.info("Writing data in group %s ..." % group)
+                    self.pcksaver.write(group, attach_arrays(data))
+                    manifest.setdefault(group, []).extend(
+                        self._manifest_hashes(rawfiles, hashes))
+                    self._add_digest(digests, group, digest)
+                self._write_manifest(manifest, digests)
         else:
             plog.warning("Max number of worker processes is one, "
                          "use for loop to convert data!")
-            super(MultiProcessor, self).convert(add_desc=add_desc)
+            super(MultiProcessor, self)._convert_cores(
+                indices, manifest, hashes=hashes, digests=digests)
 
-    multi_convert = convert
+    multi_convert = Processor.convert
 
     # # End Convert Part
 
@@ -128,7 +375,7 @@ class MultiProcessor(Processor):
                             overwrite=False):
         super(MultiProcessor, self).set_prefer_ressaver(
             ext2=ext2, oldext2=oldext2, overwrite=overwrite)
-        manager = multiprocessing.Manager()  # for share data
+        manager, _ = _get_shared()  # for share data
         D = manager.dict()
         plog.debug("Changing %s data cache store to '%r'." % (ext2, D))
         self.ressaver.set_store(D)
@@ -150,37 +397,40 @@ class MultiProcessor(Processor):
             return None, "Invalid couple_figlabel type"
 
     def _dig_worker_with_rwlock(self, couple_figlabel, redig, callback, post,
-                                rwlock, lock, count, total, name_it=True):
+                                total, name_it=True):
         '''
         Find old dig results, dig new if needed, then save them.
 
         Parameters
         ----------
         couple_figlabel: figlabel str or dict contains figlabel
-        rwlock: read-write lock
+        total: total number of tasks
         name_it: bool
             When using multiprocessing,
             *name_it* is True, processname is set to *figlabel*.
         '''
+        rwlock = _WORKER_SYNC[1]
         update = 0
         figlabel, kwargs = self._filter_couple_figlabel(couple_figlabel)
         if figlabel is None:
-            self._count_task_done(lock, count, total, 'Dig')
+            self._count_task_done(total, 'Dig')
             return None, kwargs, None, update
         if name_it:
             multiprocessing.current_process().name = figlabel
         try:
             rwlock.reader_lock.acquire()
-            # after reopen resfileloader, then try to find old results
+            # after reload resloader and reopen resfileloader,
+            # then try to find old results
+            self.resloader = get_pckloader(self.ressaver.get_store())
             resfile = self.resfilesaver.get_store()
-            if os.path.isfile(resfile):
+            if os.path.exists(resfile):
                 self.resfileloader = get_pckloader(resfile)
             data = self._before_new_dig(figlabel, redig, kwargs)
         finally:
             rwlock.reader_lock.release()
         digcore, gotfiglabel, results = data
         if digcore is None:
-            self._count_task_done(lock, count, total, 'Dig')
+            self._count_task_done(total, 'Dig')
             return (*data, update)
         if results is None:
             accfiglabel, results, digtime = self._do_new_dig(digcore, kwargs)
@@ -193,51 +443,46 @@ class MultiProcessor(Processor):
                 if self.resfilesaver and digtime > self.dig_acceptable_time:
                     # long execution time
                     self._filesave_new_dig(
-                        accfiglabel, gotfiglabel, results, digcore)
+                        accfiglabel, gotfiglabel, results, digcore,
+                        digtime=digtime)
                     update = 2
             finally:
                 rwlock.writer_lock.release()
         else:
             accfiglabel = gotfiglabel
-        self._count_task_done(lock, count, total, 'Dig')
+        self._count_task_done(total, 'Dig')
         if callable(callback):
             callback(accfiglabel, results)
         if post:
             results = digcore.post_dig(results)
-        return (accfiglabel, results, digcore.post_template,
-                update, figlabel, digcore.kwoptions)
+        return share_arrays((accfiglabel, results, digcore.post_template,
+                             update, figlabel, digcore.kwoptions),
+                            self.sharedmem_nbytes)
 
-    def _dig_worker_with_lock(self, digcore, kwargs, gotfiglabel, callback,
-                              post, lock, count, total, name_it=True):
+    def _dig_worker(self, figlabel, kwargs, callback, post, total,
+                    name_it=True):
         '''
-        Dig new results, and save them.
+        Dig new results, return them to the main process to save.
 
         Parameters
         ----------
-        lock: multiprocessing lock
+        figlabel: figlabel of digger core in :attr:`availablelabels`
+        total: total number of tasks
         name_it: bool
             When using multiprocessing,
             *name_it* is True, processname is set to *figlabel*.
         '''
+        digcore = self._availablelabels_lib[figlabel]
         if name_it:
             multiprocessing.current_process().name = digcore.figlabel
         accfiglabel, results, digtime = self._do_new_dig(digcore, kwargs)
-        try:
-            lock.acquire()
-            self._cachesave_new_dig(accfiglabel, gotfiglabel, results)
-            if self.resfilesaver and digtime > self.dig_acceptable_time:
-                # long execution time
-                self._filesave_new_dig(
-                    accfiglabel, gotfiglabel, results, digcore)
-        finally:
-            self._count_task_done(lock, count, total, 'Dig')
-            lock.release()
+        self._count_task_done(total, 'Dig')
         if callable(callback):
             callback(accfiglabel, results)
-        if post:
-            results = digcore.post_dig(results)
-        return (accfiglabel, results, digcore.post_template,
-                digcore.kwoptions)
+        postresults = digcore.post_dig(results) if post else results
+        return share_arrays((accfiglabel, results, digtime, postresults,
+                             digcore.post_template, digcore.kwoptions),
+                            self.sharedmem_nbytes)
 
     def multi_dig(self, *couple_figlabels, whichlock='write',
                   redig=False, callback=None, post=True):
@@ -252,7 +497,8 @@ class MultiProcessor(Processor):
             couple_figlabel can be figlabel str or dict, like
             {'figlabel': 'group/fignum', 'other kwargs': True}
         whichlock: str, 'write' or 'read-write'
-            default 'write', means only using a write lock
+            default 'write', means workers only dig, and the main process
+            is the single writer which saves all results
         others: see :meth:`dig`
 
         Notes
@@ -265,6 +511,8 @@ class MultiProcessor(Processor):
                 a list or dict for *callback* to store data.
             2). *post*, `post_dig` is expected to complete immediately.
             3). Saving dig-results, savers may be not multiprocess safe.
+                Results are sent back, then saved by the main process
+                in one :attr:`resfilesaver` session.
         2. If using a read write lock to avoid error about unpickle pckloader
            and saving pcksaver together, most codes like *callback*, *post*
            are multiprocessing, except saving results.
@@ -307,72 +555,71 @@ class MultiProcessor(Processor):
                                                       digcore.post_template))
                 # do new_dig figlabels
                 if len(couple_todo) > 0:
-                    nworkers = min(self.multiproc, len(couple_todo))
-                    manager = multiprocessing.Manager()
-                    with LogWorkInitializer(manager) as loginitializer:
-                        plog.debug("Using a write lock!")
-                        lock = manager.RLock()
-                        count = manager.Value('i', 0, lock=False)
-                        total = len(couple_todo)
-                        # While resfilesaver is saving to the path,
-                        # fork will fail to reopen resfileloader.path.
-                        # Fortunately, resfileloader is useless in workers.
-                        self.resfileloader = None
-                        with multiprocessing.Pool(
-                                processes=nworkers,
-                                initializer=loginitializer) as pool:
-                            async_results = [(idx, core, pool.apply_async(
-                                self._dig_worker_with_lock,
-                                (core, kws, gotfgl, callback, post, lock,
-                                    count, total)))
-                                for idx, core, kws, gotfgl in couple_todo]
-                            pool.close()
-                            pool.join()
-                        for idx, core, res in async_results:
-                            data = res.get()
-                            assert multi_results[idx] == idx
-                            multi_results[idx] = data[:3]
+                    plog.debug("Using a single writer!")
+                    total = len(couple_todo)
+                    tasks = [(idx, (core.figlabel, kws, callback, post, total))
+                             for idx, core, kws, gotfgl in couple_todo]
+                    tasks = self._longest_first(tasks, [
+                        self._dig_cost(core.figlabel, kws)
+                        for idx, core, kws, gotfgl in couple_todo])
+                    todo = {idx: (core, gotfgl)
+                            for idx, core, kws, gotfgl in couple_todo}
+                    filesaving = False
+                    try:
+                        for idx, data in self._imap_tasks(
+                                '_dig_worker', tasks):
+                            core, gotfiglabel = todo[idx]
+                            (accfiglabel, results, digtime, postresults,
+                                template, kwoptions) = attach_arrays(data)
                             if core.kwoptions is None:
-                                core.kwoptions = data[3]
-                        self.resloader = get_pckloader(
-                            self.ressaver.get_store())
-                        resfile = self.resfilesaver.get_store()
-                        if os.path.isfile(resfile):
-                            self.resfileloader = get_pckloader(resfile)
+                                core.kwoptions = kwoptions
+                            assert multi_results[idx] == idx
+                            multi_results[idx] = (
+                                accfiglabel, postresults, template)
+                            self._cachesave_new_dig(
+                                accfiglabel, gotfiglabel, results)
+                            if (self.resfilesaver
+                                    and digtime > self.dig_acceptable_time):
+                                # long execution time
+                                if not filesaving:
+                                    self._prepare_resfilesaver()
+                                    self.resfilesaver.iopen()
+                                    filesaving = True
+                                self._filewrite_new_dig(
+                                    accfiglabel, gotfiglabel, results, core,
+                                    digtime=digtime)
+                    finally:
+                        if filesaving:
+                            self.resfilesaver.close()
+                    self.resloader = get_pckloader(
+                        self.ressaver.get_store())
+                    resfile = self.resfilesaver.get_store()
+                    if os.path.exists(resfile):
+                        self.resfileloader = get_pckloader(resfile)
             else:
                 # with 'read-write' lock
-                nworkers = min(self.multiproc, len(couple_figlabels))
-                manager = multiprocessing.Manager()
-                with LogWorkInitializer(manager) as loginitializer:
-                    plog.debug("Using a read-write lock!")
-                    rwlock = MP_RWLock(manager)
-                    lock = manager.RLock()  # for count
-                    count = manager.Value('i', 0, lock=False)
-                    total = len(couple_figlabels)
-                    # resfileloader reopen in workers, not forking
-                    self.resfileloader = None
-                    with multiprocessing.Pool(
-                            processes=nworkers,
-                            initializer=loginitializer) as pool:
-                        async_results = [pool.apply_async(
-                            self._dig_worker_with_rwlock,
-                            (couple_figlabel, redig, callback, post, rwlock,
-                                lock, count, total))
-                            for couple_figlabel in couple_figlabels]
-                        pool.close()
-                        pool.join()
-                    update = 0
-                    for res in async_results:
-                        data = res.get()
-                        multi_results.append(data[:3])
-                        update = max(data[3], update)
-                        if data[3] > 0:
-                            core = self._availablelabels_lib[data[4]]
-                            if core.kwoptions is None:
-                                core.kwoptions = data[5]
+                plog.debug("Using a read-write lock!")
+                total = len(couple_figlabels)
+                tasks = [(idx, (_couple, redig, callback, post, total))
+                         for idx, _couple in enumerate(couple_figlabels)]
+                tasks = self._longest_first(tasks, [
+                    self._dig_cost(*self._filter_couple_figlabel(_couple))
+                    for _couple in couple_figlabels])
+                # resfileloader reopen in workers
+                rw_results = sorted(self._imap_tasks(
+                    '_dig_worker_with_rwlock', tasks))
+                update = 0
+                for idx, data in rw_results:
+                    data = attach_arrays(data)
+                    multi_results.append(data[:3])
+                    update = max(data[3], update)
+                    if data[3] > 0:
+                        core = self._availablelabels_lib[data[4]]
+                        if core.kwoptions is None:
+                            core.kwoptions = data[5]
                 # reset resfileloader in mainprocess
                 resfile = self.resfilesaver.get_store()
-                if os.path.isfile(resfile):
+                if os.path.exists(resfile):
                     self.resfileloader = get_pckloader(resfile)
                 if update > 0:
                     self.resloader = get_pckloader(self.ressaver.get_store())
@@ -492,16 +739,18 @@ class MultiProcessor(Processor):
     # # Start Visplt Part
 
     def _visplt_worker(self, results, revis, savename, saveext, savepath,
-                       mpl_backend, lock, count, total, name_it=True):
+                       mpl_backend, total, name_it=True):
         '''
         Use results create figure, then save it.
 
         Parameters
         ----------
+        total: total number of tasks
         name_it: bool
             When using multiprocessing,
             *name_it* is True, processname is set to figlabel.
         '''
+        results = attach_arrays(results, unlink=False)
         figlabel = results['figlabel']
         if name_it:
             multiprocessing.current_process().name = figlabel
@@ -516,7 +765,7 @@ class MultiProcessor(Processor):
             except Exception:
                 plog.error("%s: Failed to create figure %s!" % (
                     self.name, accfiglabel),  exc_info=1)
-                self._count_task_done(lock, count, total, 'Visplt')
+                self._count_task_done(total, 'Visplt')
                 self.visplter.close_figure('all')
                 return False, accfiglabel, '(500) failed to create'
             else:
@@ -529,18 +778,18 @@ class MultiProcessor(Processor):
                 except Exception:
                     plog.error("%s: Failed to save figure %s!" % (
                         self.name, accfiglabel),  exc_info=1)
-                    self._count_task_done(lock, count, total, 'Visplt')
+                    self._count_task_done(total, 'Visplt')
                     self.visplter.close_figure('all')
                     return False, accfiglabel, '(500) failed to save'
                 else:
-                    self._count_task_done(lock, count, total, 'Visplt')
+                    self._count_task_done(total, 'Visplt')
                     self.visplter.close_figure('all')
                     return True, accfiglabel, fname
         else:
             status, reason = results['status'], results['reason']
             plog.error("%s: Failed to create figure %s: (%d) %s" % (
                 self.name, figlabel, status, reason),  exc_info=1)
-            self._count_task_done(lock, count, total, 'Visplt')
+            self._count_task_done(total, 'Visplt')
             return False, results['accfiglabel'], "(%d) %s" % (status, reason)
 
     def multi_visplt(self, *couple_figlabels, revis=False,
@@ -583,28 +832,21 @@ class MultiProcessor(Processor):
         success, fail = [], []
         if not os.path.isdir(savepath):
             os.mkdir(savepath)
-        nworkers = min(self.multiproc, len(multi_results))
-        manager = multiprocessing.Manager()
-        with LogWorkInitializer(manager) as loginitializer:
-            lock = manager.RLock()
-            count = manager.Value('i', 0, lock=False)
-            total = len(multi_results)
-            with multiprocessing.Pool(
-                    processes=nworkers,
-                    initializer=loginitializer) as pool:
-                async_results = [pool.apply_async(
-                    self._visplt_worker,
-                    (results, revis, savename, saveext, savepath,
-                        mpl_backend, lock, count, total))
-                    for results in multi_results]
-                pool.close()
-                pool.join()
-            for res in async_results:
-                data = res.get()
+        total = len(multi_results)
+        blocks = []  # owned by main process, unlink them after plotting
+        tasks = [(idx, (share_arrays(results, self.sharedmem_nbytes, blocks),
+                        revis, savename, saveext, savepath,
+                        mpl_backend, total))
+                 for idx, results in enumerate(multi_results)]
+        try:
+            for idx, data in sorted(self._imap_tasks(
+                    '_visplt_worker', tasks)):
                 if data[0]:
                     success.append(data[1:])
                 else:
                     fail.append(data[1:])
+        finally:
+            unlink_blocks(blocks)
         return success, fail
 
     # # End Visplt Part
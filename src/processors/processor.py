@@ -9,8 +9,11 @@ Contains processor base class.
 import os
 import re
 import time
+import shutil
+import json
 import pickle
 import hashlib
+import warnings
 
 from .. import __gversion__
 from ..glogger import getGLogger
@@ -19,11 +22,20 @@ from ..loaders import is_rawloader, get_rawloader, is_pckloader, get_pckloader
 from ..savers import is_pcksaver, get_pcksaver, pcksaver_types
 from ..cores.exporter import Exporter
 from ..visplters import get_visplter, is_visplter
+from .digcache import DigCache
 
 __all__ = ['Processor']
 plog = getGLogger('P')
 
 
+def _remove_pckpath(path):
+    '''Remove pickled data file, or directory like '.npyd'.'''
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
 class Processor(object):
     '''
     Serial Processor class.
@@ -47,6 +59,9 @@ class Processor(object):
     diggedlabels: set
         figlabels/kwargstr digged in ressaver or resfilesaver
         like 'group/fignum/a=1,b=2'
+    digcache: :class:`DigCache` object or None
+        on-disk cache of dig results, keyed by hashes of data used,
+        shared by processors and cases
 
     exporters: dict
         exporters generated
@@ -76,6 +91,10 @@ class Processor(object):
     def name(self):
         return type(self).__name__
 
+    def shutdown(self):
+        '''Release worker processes etc. Nothing to do in serial mode.'''
+        pass
+
     # # Start Convert Part
 
     __slots__.extend(['_rawloader', '_pcksaver', '_converters', '_saltstr'])
@@ -140,7 +159,8 @@ class Processor(object):
 
     pcksaver = property(_get_pcksaver, _set_pcksaver)
 
-    def set_prefer_pcksaver(self, savetype, savedir, ext2='converted'):
+    def set_prefer_pcksaver(self, savetype, savedir, ext2='converted',
+                            compression=None):
         '''
         Set preferable pcksaver path in savedir or beside raw data.
 
@@ -152,6 +172,9 @@ class Processor(object):
             directory of pcksaver.path, None -> raw data directory
         ext2: str
             second extension, like name.(converted).npz
+        compression: str
+            compression profile of pcksaver, like 'fast', 'small',
+            see :func:`gdpy3.savers.get_pcksaver`, default None
         '''
         if not self.rawloader:
             raise IOError("%s: Need a rawloader object!" % self.name)
@@ -181,7 +204,9 @@ class Processor(object):
         # assemble
         savepath = '%s-%s.%s%s' % (prefix, salt[:6], ext2, savetype)
         self._saltstr = salt
-        self.pcksaver = get_pcksaver(savepath)
+        if savetype == '.cache':
+            compression = None
+        self.pcksaver = get_pcksaver(savepath, compression=compression)
 
     @property
     def saltstr(self):
@@ -225,16 +250,239 @@ class Processor(object):
         plog.info("%s are converted to %s!"
                   % (self._rawsummary,  self.pcksaver.path))
 
+    def _need_convert(self, overwrite):
+        '''Return True if pcksaver.path doesn't exist or is removed.'''
+        if os.path.exists(self.pcksaver.path):
+            if overwrite:
+                plog.warning("Remove old %s data file: %s!"
+                             % ('converted', self.pcksaver.path))
+                _remove_pckpath(self.pcksaver.path)
+                return True
+            return False
+        return True
+
+    def _convert_if_needed(self, overwrite, add_desc, incremental=False):
+        '''
+        Convert raw data if needed, or only new and changed raw data
+        if *incremental*. Return the updated groups.
+        '''
+        if self._need_convert(overwrite):
+            self.convert(add_desc=add_desc)
+        elif incremental:
+            return self._convert_update()
+        return []
+
+    def _raw_manifest(self, core):
+        '''
+        Return [filename, size, mtime] of raw files of converter *core*.
+        Call it before converting, then bytes appended to a live file
+        during the conversion are still new in next update.
+        '''
+        files = [core.files] if isinstance(core.files, str) else core.files
+        return [[name, *self.rawloader.getstat(name)] for name in files]
+
+    @staticmethod
+    def _manifest_hashes(rawfiles, hashes):
+        '''
+        Append SHA1 in *hashes*, a dict of filenames and their
+        [size, mtime, sha1], to [filename, size, mtime] of *rawfiles*,
+        only if size and mtime are the same. Return *rawfiles*.
+        '''
+        for entry in rawfiles:
+            known = (hashes or {}).get(entry[0])
+            if known and list(known[:2]) == entry[1:3]:
+                entry.append(known[2])
+        return rawfiles
+
+    def _read_manifest(self, name='manifest'):
+        '''
+        Return manifest in pcksaver.path, a dict of groups and their raw
+        files info get by :meth:`_raw_manifest`, or None if not found.
+        Set *name* 'digests' to get digests of converted groups.
+        '''
+        try:
+            pckloader = get_pckloader(self.pcksaver.get_store(), cache='off')
+        except Exception:
+            plog.error("%s: Invalid pckloader path '%s'!"
+                       % (self.name, self.pcksaver.path), exc_info=1)
+            return None
+        try:
+            if name in pckloader:
+                return json.loads(pckloader.get(name))
+            return None
+        finally:
+            pckloader.close()
+
+    def _changed_groups(self, manifest, skip=(), hashes=None):
+        '''
+        Return groups of converters whose raw files are new or changed,
+        compared with *manifest*. Files of same size and mtime are
+        unchanged, files of same size and new mtime are checked by SHA1,
+        which is computed only then, and saved in dict *hashes*.
+        Files without SHA1 in *manifest* are changed in this case.
+        Files with same SHA1 get their new mtime in *manifest*,
+        so they are not hashed again.
+        Groups which have files in *skip* are not returned.
+        '''
+        groupfiles = {}
+        for core in self.converters:
+            files = [core.files] if isinstance(core.files, str) else core.files
+            groupfiles.setdefault(core.group, []).extend(files)
+        changed = []
+        for group, files in groupfiles.items():
+            if skip and not skip.isdisjoint(files):
+                plog.debug("Skip group %s, wait for its raw files." % group)
+                continue
+            old = {e[0]: e for e in manifest.get(group, [])}
+            if set(files) != set(old):
+                changed.append(group)
+                continue
+            for name in files:
+                entry = old[name]
+                size, mtime = self.rawloader.getstat(name)
+                if size == entry[1] and mtime == entry[2]:
+                    continue
+                if size == entry[1]:
+                    sha1 = self.rawloader.gethash(name)
+                    if hashes is not None:
+                        hashes[name] = [size, mtime, sha1]
+                    if sha1 == (entry[3:] or [None])[0]:
+                        entry[1:] = [size, mtime, sha1]
+                        continue
+                changed.append(group)
+                break
+        return changed
+
+    def _convert_cores(self, indices, manifest, hashes=None, digests=None):
+        '''
+        Convert raw data by converters of *indices*, write data,
+        updated *manifest* and *digests* of groups in pcksaver.
+        Known SHA1 of raw files are in *hashes*, see :meth:`_changed_groups`.
+        '''
+        digests = {} if digests is None else digests
+        with nparray_default_bitsize(size=self.convert_array_bitsize):
+            with self.pcksaver:
+                for idx in indices:
+                    core = self.converters[idx]
+                    rawfiles = self._raw_manifest(core)
+                    data = core.convert()
+                    if data is None:
+                        continue  # failed, convert it again in next update
+                    self.pcksaver.write(core.group, data)
+                    manifest.setdefault(core.group, []).extend(
+                        self._manifest_hashes(rawfiles, hashes))
+                    self._add_digest(digests, core.group,
+                                     DigCache.data_digest(data))
+                self._write_manifest(manifest, digests)
+
+    @staticmethod
+    def _add_digest(digests, group, digest):
+        '''Add *digest* of data converted by one core in *group*.'''
+        digests[group] = sorted(digests.get(group, []) + [digest])
+
+    def _write_manifest(self, manifest, digests):
+        '''
+        Write *manifest* and *digests* of groups in opened pcksaver.
+        Digests are content hashes of converted data, used by
+        :class:`DigCache` to identify data without reading them.
+        '''
+        self.pcksaver.write('/', {'manifest': json.dumps(manifest),
+                                  'digests': json.dumps(digests)})
+
     def convert(self, add_desc=None):
         '''
         Convert raw data in rawloader.path, and save them in pcksaver.
         '''
         self._pre_convert(add_desc=add_desc)
-        with nparray_default_bitsize(size=self.convert_array_bitsize):
-            with self.pcksaver:
-                for core in self.converters:
-                    self.pcksaver.write(core.group, core.convert())
+        self._convert_cores(range(len(self.converters)), {})
+        self._post_convert()
+
+    def _convert_update(self, rescan=True, skip=None):
+        '''
+        Convert new or changed raw data, append them to pcksaver.path.
+        Return the updated groups. See :meth:`update`.
+        '''
+        if not self.rawloader or not self.pcksaver:
+            plog.error("%s: Need a rawloader and a pcksaver object!"
+                       % self.name)
+            return []
+        if rescan:
+            self.rawloader.update()
+            self.rawloader = self.rawloader  # regenerate converters
+        manifest = self._read_manifest()
+        if manifest is None:
+            plog.warning("No manifest in %s, convert all raw data again!"
+                         % self.pcksaver.path)
+            manifest = {}
+        digests = self._read_manifest('digests') or {}
+        oldmanifest = json.dumps(manifest)
+        # SHA1 of unchanged files are kept
+        hashes = {e[0]: e[1:] for files in manifest.values()
+                  for e in files if len(e) > 3}
+        groups = self._changed_groups(
+            manifest, skip=set(skip or ()), hashes=hashes)
+        if not groups:
+            plog.info("%s are not changed." % self._rawsummary)
+            if json.dumps(manifest) != oldmanifest:  # refreshed mtime
+                with self.pcksaver:
+                    self._write_manifest(manifest, digests)
+                self.pcksaver.compact()
+            return []
+        plog.info("Update %d groups in %s: %s."
+                  % (len(groups), self.pcksaver.path, ', '.join(groups)))
+        for group in groups:
+            manifest.pop(group, None)
+            digests.pop(group, None)
+        with warnings.catch_warnings():
+            # old members of npz are removed by compact below
+            warnings.filterwarnings('ignore', 'Duplicate name',
+                                    UserWarning)
+            self._convert_cores(
+                [idx for idx, core in enumerate(self.converters)
+                 if core.group in groups], manifest,
+                hashes=hashes, digests=digests)
+        if self.pcksaver.compact():
+            plog.info("Old data removed from %s." % self.pcksaver.path)
         self._post_convert()
+        return groups
+
+    def update(self, rescan=True, skip=None):
+        '''
+        Convert new or changed raw data, like a running simulation's
+        new snapshots, and append them to converted data.
+        Then digged results which depend on them are removed.
+        Return the updated groups.
+
+        A '.npz' converted file is rebuilt after each update to drop
+        the old groups, so each update costs a copy of the whole file.
+        A '.jsonl' file only grows. Recommend '.hdf5' or '.npyd' for
+        cases updated often, see :class:`CaseWatcher`.
+
+        Parameters
+        ----------
+        rescan: bool
+            update raw filenames in rawloader, and converters
+        skip: list
+            raw filenames not to convert now, like files still being
+            written, their groups are converted in later updates
+        '''
+        # hdf5 file can't be opened for writing, if it is opened
+        # by pckloader, diggers, or by workers
+        self.shutdown()
+        pckloader = self.pckloader
+        if pckloader:
+            pckloader.close()
+            self.pckloader = None
+        try:
+            groups = self._convert_update(rescan=rescan, skip=skip)
+        finally:
+            if pckloader:
+                pckloader.clear_cache()
+                pckloader.update()
+                self.pckloader = pckloader  # regenerate diggers
+        if groups and self.pckloader and self.ressaver:
+            self._invalidate_digged(groups)
+        return groups
 
     # # End Convert Part
 
@@ -242,7 +490,8 @@ class Processor(object):
 
     __slots__.extend(['_pckloader', '_ressaver', '_resfilesaver',
                       '_diggers', '_availablelabels_lib', '_availablelabels',
-                      '_resloader', '_resfileloader', '_diggedlabels'])
+                      '_resloader', '_resfileloader', '_diggedlabels',
+                      '_digcache'])
     DiggerCores = []
     dig_acceptable_time = 30
 
@@ -350,6 +599,19 @@ class Processor(object):
     def diggedlabels(self):
         return self._diggedlabels
 
+    def _get_digcache(self):
+        return getattr(self, '_digcache', None)
+
+    def _set_digcache(self, digcache):
+        if digcache is None or isinstance(digcache, DigCache):
+            self._digcache = digcache
+        elif digcache is True:
+            self._digcache = DigCache()
+        else:
+            self._digcache = DigCache(str(digcache))
+
+    digcache = property(_get_digcache, _set_digcache)
+
     def set_prefer_ressaver(self, ext2='digged', oldext2='converted',
                             overwrite=False):
         '''
@@ -382,18 +644,18 @@ class Processor(object):
                 respath = '%s%s' % (saverstr, ext)
                 resfilesaver = get_pcksaver(respath)
                 self.resfilesaver = resfilesaver
-                if os.path.isfile(respath):
+                if os.path.exists(respath):
                     if overwrite:
                         plog.warning("Remove old %s data file: %s!"
                                      % (ext2, respath))
-                        os.remove(respath)
+                        _remove_pckpath(respath)
                     else:
                         resfileloader = get_pckloader(respath)
                         if resfileloader.groups() == ():  # is empty
                             plog.info("Clear empty %s data file: %s."
                                       % (ext2, respath))
                             resfileloader.close()
-                            os.remove(respath)
+                            _remove_pckpath(respath)
                         else:
                             self.resfileloader = resfileloader
                 # lazy write new resfilesaver file
@@ -403,6 +665,63 @@ class Processor(object):
             else:
                 plog.info("Default %s data path is %s." % (ext2, respath))
 
+    def _dependent_figlabels(self, groups):
+        '''Return figlabels whose diggers use data in *groups*.'''
+        prefixes = tuple('%s/' % g for g in groups)
+        return [dc.figlabel for dc in self.diggers
+                if any(k.startswith(prefixes)
+                       for k in dc.srckeys + dc.extrakeys)]
+
+    def _dependent_digged(self, groups):
+        '''Return digged labels which depend on data in *groups*.'''
+        figlabels = tuple(
+            '%s/' % f for f in self._dependent_figlabels(groups))
+        return sorted(label for label in self.diggedlabels
+                      if label.startswith(figlabels))
+
+    def _rewrite_resfile(self, labels):
+        '''Rewrite resfilesaver.path without results of digged *labels*.'''
+        loader = self.resfileloader
+        prefixes = tuple('%s/' % l for l in labels)
+        groupkeys = {}
+        for key in loader.datakeys:
+            if not key.startswith(prefixes):
+                group = os.path.dirname(key) or '/'
+                groupkeys.setdefault(group, []).append(key)
+        path = self.resfilesaver.path
+        root, ext = os.path.splitext(path)
+        tmppath = '%s-%d.tmp%s' % (root, os.getpid(), ext)
+        tmpsaver = get_pcksaver(tmppath)
+        with tmpsaver:
+            for group, keys in groupkeys.items():
+                values = loader.get_many(*keys)
+                tmpsaver.write(group, {os.path.basename(k): v
+                                       for k, v in zip(keys, values)})
+        loader.close()
+        _remove_pckpath(path)
+        os.replace(tmppath, path)
+        self.resfileloader = get_pckloader(path)
+
+    def _invalidate_digged(self, groups):
+        '''
+        Remove digged results which depend on data in *groups*,
+        from :attr:`ressaver` and :attr:`resfilesaver`. Return their labels.
+        '''
+        labels = self._dependent_digged(groups)
+        if not labels:
+            return labels
+        plog.info("Remove %d digged results which depend on updated data."
+                  % len(labels))
+        self._diggedlabels.difference_update(labels)
+        store = self.ressaver.get_store()
+        for label in labels:
+            store.pop(label, None)
+        self.resloader = get_pckloader(store)
+        if self.resfileloader and set(labels).intersection(
+                self.resfileloader.datagroups):
+            self._rewrite_resfile(labels)
+        return labels
+
     def _before_new_dig(self, figlabel, redig, kwargs):
         '''Get digcore, try old dig results'''
         if not self.pckloader:
@@ -444,13 +763,17 @@ class Processor(object):
                 # reload kwoptions
                 digcore.kwoptions = pickle.loads(
                     results.pop('kwoptions', None))
+                results.pop('digtime', None)
             return digcore, gotfiglabel, results
         else:
             return digcore, gotfiglabel, None
 
     def _do_new_dig(self, digcore, kwargs):
-        '''Dig new results.'''
-        results, acckwargstr, digtime = digcore.dig(**kwargs)
+        '''Dig new results, or get them from :attr:`digcache`.'''
+        if self.digcache is not None:
+            results, acckwargstr, digtime = self.digcache.dig(digcore, kwargs)
+        else:
+            results, acckwargstr, digtime = digcore.dig(**kwargs)
         if not acckwargstr:
             acckwargstr = 'DEFAULT'
         accfiglabel = '%s/%s' % (digcore.figlabel, acckwargstr)
@@ -465,29 +788,41 @@ class Processor(object):
                 # link double cache
                 self.ressaver.write(gotfiglabel, dict(_LINK=accfiglabel))
 
-    def _filesave_new_dig(self, accfiglabel, gotfiglabel, results, digcore):
-        '''Save dig results in file, link DEFAULT to accfiglabel.'''
-        # also save kwoptions
-        kwopts = dict(kwoptions=pickle.dumps(digcore.kwoptions))
-        # prepare resfilesaver info in new file
-        if not os.path.isfile(self.resfilesaver.get_store()):
+    def _prepare_resfilesaver(self):
+        '''Write resfilesaver info in new file.'''
+        if not os.path.exists(self.resfilesaver.get_store()):
             with self.resfilesaver:
                 self.resfilesaver.write('/', {
                     'saltstr': self.saltstr,
                     'processor': self.name})
-        with self.resfilesaver:
-            shortpath = os.path.basename(self.resfilesaver.path)
+
+    def _filewrite_new_dig(self, accfiglabel, gotfiglabel, results, digcore,
+                           digtime=None):
+        '''Write dig results in opened resfilesaver.'''
+        # also save kwoptions, and digtime for scheduling later digs
+        kwopts = dict(kwoptions=pickle.dumps(digcore.kwoptions))
+        if digtime is not None:
+            kwopts['digtime'] = float(digtime)
+        shortpath = os.path.basename(self.resfilesaver.path)
+        plog.info('Save %s digged results in %s.' % (
+            accfiglabel, shortpath))
+        self.resfilesaver.write(accfiglabel, results)
+        self.resfilesaver.write(accfiglabel, kwopts)
+        if (gotfiglabel.endswith('/DEFAULT')
+                and not accfiglabel.endswith('/DEFAULT')):
+            # link double cache
             plog.info('Save %s digged results in %s.' % (
-                accfiglabel, shortpath))
-            self.resfilesaver.write(accfiglabel, results)
-            self.resfilesaver.write(accfiglabel, kwopts)
-            if (gotfiglabel.endswith('/DEFAULT')
-                    and not accfiglabel.endswith('/DEFAULT')):
-                # link double cache
-                plog.info('Save %s digged results in %s.' % (
-                    gotfiglabel, shortpath))
-                self.resfilesaver.write(
-                    gotfiglabel, dict(_LINK=accfiglabel))
+                gotfiglabel, shortpath))
+            self.resfilesaver.write(
+                gotfiglabel, dict(_LINK=accfiglabel))
+
+    def _filesave_new_dig(self, accfiglabel, gotfiglabel, results, digcore,
+                          digtime=None):
+        '''Save dig results in file, link DEFAULT to accfiglabel.'''
+        self._prepare_resfilesaver()
+        with self.resfilesaver:
+            self._filewrite_new_dig(
+                accfiglabel, gotfiglabel, results, digcore, digtime=digtime)
 
     def dig(self, figlabel, redig=False, callback=None, post=True, **kwargs):
         '''
@@ -521,7 +856,8 @@ class Processor(object):
             if self.resfilesaver and digtime > self.dig_acceptable_time:
                 # long execution time
                 self._filesave_new_dig(
-                    accfiglabel, gotfiglabel, results, digcore)
+                    accfiglabel, gotfiglabel, results, digcore,
+                    digtime=digtime)
                 self.resfileloader = get_pckloader(
                     self.resfilesaver.get_store())
         else:
@@ -768,7 +1104,9 @@ class Processor(object):
     def __init__(self, path, add_desc=None,
                  dirnames_exclude=None, filenames_exclude=None,
                  savedir=None, savetype='.npz', overwrite=False, Sid=False,
-                 datagroups_exclude=None, add_visplter='mpl::'):
+                 datagroups_exclude=None, add_visplter='mpl::',
+                 pckloader_cache=None, compression=None, incremental=False,
+                 digcache=None):
         '''
         Pick up raw data or converted data in *path*,
         set processor's rawloader, pcksaver and pckloader, etc.
@@ -786,7 +1124,7 @@ class Processor(object):
             function or regular expressions to exclude filenames in rawloader
         savedir: str, default same as raw data
             directory path of converted data
-        savetype: '.npz', '.hdf5' or '.jsonl', '.jsonz'
+        savetype: '.npz', '.hdf5', '.jsonl', '.jsonz' or '.npyd'
             extension of pcksaver.path, default '.npz'
             when pcksaver.path isn't writable, use '.cache'
         overwrite: bool
@@ -800,7 +1138,23 @@ class Processor(object):
             regular expressions to exclude datagroups in pckloader
         add_visplter: str
             add visplter by type *add_visplter*, default 'mpl::'
+        pckloader_cache: str
+            cache policy of pckloader, like 'off', 'lru:128', 'nbytes:4G',
+            default None, unbounded
+        compression: str
+            compression profile of pcksaver, 'fast' for scratch, 'small'
+            for archival, or 'store', 'deflate:N', 'lzma', 'zstd:N' for
+            .npz, .jsonz, and 'lzf', 'gzip:N' for .hdf5.
+            Default None, use saver's default.
+        incremental: bool
+            If pcksaver.path exists, convert only new or changed raw data,
+            append them, and remove digged results which depend on them.
+            Default False.
+        digcache: :class:`DigCache`, str or True
+            on-disk cache of dig results, or its directory path,
+            True for default path. Default None, not use it.
         '''
+        self.digcache = digcache
         root, ext1 = os.path.splitext(path)
         root, ext2 = os.path.splitext(root)
         if (ext2 == '' and ext1 in pcksaver_types[1:]
@@ -816,7 +1170,7 @@ class Processor(object):
             plog.warning("This is a digged data path %s!" % path)
             path = '%s%s%s' % (root, '.converted', ext1)
             plog.warning("Try converted data path %s beside it!" % path)
-            if os.path.isfile(path):
+            if os.path.exists(path):
                 root, ext1 = os.path.splitext(path)
                 root, ext2 = os.path.splitext(root)
             else:
@@ -830,7 +1184,8 @@ class Processor(object):
             try:
                 self.pckloader = get_pckloader(
                     path, datagroups_exclude=datagroups_exclude,
-                    virtualdata=self._default_pckloader_virtual_data)
+                    virtualdata=self._default_pckloader_virtual_data,
+                    cache=pckloader_cache)
             except Exception:
                 plog.error("%s: Invalid pckloader path '%s'!"
                            % (self.name, path), exc_info=1)
@@ -858,7 +1213,8 @@ class Processor(object):
                            % (self.name, path), exc_info=1)
                 return
             try:
-                self.set_prefer_pcksaver(savetype, savedir, ext2='converted')
+                self.set_prefer_pcksaver(savetype, savedir, ext2='converted',
+                                         compression=compression)
             except Exception:
                 plog.error("%s: Failed to set pcksaver object!"
                            % self.name, exc_info=1)
@@ -867,29 +1223,29 @@ class Processor(object):
                       ('converted', self.pcksaver.path))
             if Sid and self.pcksaver._extension not in pcksaver_types[1:]:
                 return
-            if os.path.isfile(self.pcksaver.path):
-                if overwrite:
-                    plog.warning("Remove old %s data file: %s!"
-                                 % ('converted', self.pcksaver.path))
-                    os.remove(self.pcksaver.path)
-                    self.convert(add_desc=add_desc)
-            else:
-                self.convert(add_desc=add_desc)
-            if Sid and self.pcksaver._extension in pcksaver_types[1:]:
+            updated = self._convert_if_needed(
+                overwrite, add_desc, incremental=incremental)
+            if (Sid and self.pcksaver._extension in pcksaver_types[1:]
+                    and not updated):
                 return
             try:
                 self.pckloader = get_pckloader(
                     self.pcksaver.get_store(), datagroups_exclude=datagroups_exclude,
-                    virtualdata=self._default_pckloader_virtual_data)
+                    virtualdata=self._default_pckloader_virtual_data,
+                    cache=pckloader_cache)
             except Exception:
                 plog.error("%s: Invalid pckloader path '%s'!"
                            % (self.name, path), exc_info=1)
                 return
             try:
                 self.set_prefer_ressaver(ext2='digged', overwrite=overwrite)
+                if updated:
+                    self._invalidate_digged(updated)
             except Exception:
                 plog.error("%s: Failed to set ressaver object!"
                            % self.name, exc_info=1)
+            if Sid:
+                return
         # set visplter
         if add_visplter:
             self.visplter = get_visplter(str(add_visplter) + path)
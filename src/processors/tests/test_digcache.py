@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import os
+import unittest
+import unittest.mock
+import tempfile
+import shutil
+
+from .. import get_processor
+from ..lib import register_Processor
+from ..digcache import DigCache
+from ...cores.digger import Digger
+from ...loaders import get_pckloader
+from .core import TestDigger
+
+register_Processor('TDP', '.tests', 'T')
+
+
+class SnapSumDigger(Digger):
+    __slots__ = []
+    nitems = '+'
+    itemspattern = [r'^(?P<section>snap)\d{3}/v$']
+
+    def _set_fignum(self, numseed=None):
+        self._fignum = 'sum'
+
+    def _dig(self, kwargs):
+        values = self.pckloader.get_many(*self.srckeys)
+        return dict(n=len(values), total=float(sum(values))), {}
+
+
+class TestDigCache(unittest.TestCase):
+    '''
+    Test DigCache class.
+    '''
+
+    def setUp(self):
+        self.tmp = tempfile.mktemp(suffix='-test')
+        self.cases = [os.path.join(self.tmp, c) for c in ('c1', 'c2')]
+        for case in self.cases:
+            os.makedirs(case)
+            self.write_raw(case, '10\n20\n30\n40')
+        self.digcache = DigCache(os.path.join(self.tmp, 'digcache'),
+                                 min_digtime=0)
+        self.figlabel = 'test/mnpq'
+
+    def tearDown(self):
+        if os.path.isdir(self.tmp):
+            shutil.rmtree(self.tmp)
+
+    def write_raw(self, case, text):
+        with open(os.path.join(case, 'test.out'), mode='w') as f:
+            f.write(text)
+
+    def cached_files(self, ext):
+        return [f for f in os.listdir(self.digcache.path)
+                if f.endswith(ext)]
+
+    def get_processor(self, case, **kwargs):
+        return get_processor(case, name='TDP', parallel='off',
+                             digcache=self.digcache, **kwargs)
+
+    def test_digcache_sibling_case(self):
+        gdp = self.get_processor(self.cases[0])
+        label, results, tmpl = gdp.dig(self.figlabel, post=False)
+        self.assertEqual(len(self.cached_files('.keys')), 1)
+        self.assertEqual(len(self.cached_files('.pickle')), 1)
+        # same data in another case, no dig
+        gdp2 = self.get_processor(self.cases[1])
+        with unittest.mock.patch.object(
+                TestDigger, '_dig', side_effect=RuntimeError('no dig')):
+            label2, results2, tmpl = gdp2.dig(self.figlabel, post=False)
+        self.assertEqual(label2, label)
+        self.assertEqual(results2, results)
+
+    def test_digcache_changed_data(self):
+        gdp = self.get_processor(self.cases[0], incremental=True)
+        label, results, tmpl = gdp.dig(self.figlabel, post=False)
+        self.write_raw(self.cases[0], '1\n2\n3\n4')
+        gdp.update()
+        label2, results2, tmpl = gdp.dig(self.figlabel, post=False)
+        self.assertEqual(results2['title'], '(1,2,3,4)')
+        self.assertEqual(len(self.cached_files('.pickle')), 2)
+        # both cached results are found by their data
+        self.write_raw(self.cases[0], '10\n20\n30\n40')
+        gdp.update()
+        with unittest.mock.patch.object(
+                TestDigger, '_dig', side_effect=RuntimeError('no dig')):
+            label3, results3, tmpl = gdp.dig(self.figlabel, post=False)
+        self.assertEqual(results3, results)
+
+    def test_digcache_new_group(self):
+        data = {'snap000': {'v': 1.0}, 'snap001': {'v': 2.0}}
+        core = SnapSumDigger.generate_cores(get_pckloader(data))[0]
+        results, kwstr, t = self.digcache.dig(core, {})
+        self.assertEqual(results, dict(n=2, total=3.0))
+        # incremental update adds a group
+        data['snap002'] = {'v': 4.0}
+        core = SnapSumDigger.generate_cores(get_pckloader(data))[0]
+        self.assertIsNone(self.digcache.get(core, {}))
+        results, kwstr, t = self.digcache.dig(core, {})
+        self.assertEqual(results, dict(n=3, total=7.0))
+
+    def test_digcache_group_digests(self):
+        gdp = self.get_processor(self.cases[0])
+        self.assertTrue('digests' in gdp.pckloader)
+        label, results, tmpl = gdp.dig(self.figlabel, post=False)
+        gdp.pckloader.clear_cache()
+        gdp2 = self.get_processor(self.cases[1])
+        gdp2.pckloader.clear_cache()
+        with unittest.mock.patch.object(
+                TestDigger, '_dig', side_effect=RuntimeError('no dig')):
+            label2, results2, tmpl = gdp2.dig(self.figlabel, post=False)
+        self.assertEqual(results2, results)
+        # data are identified by digests, not read
+        self.assertFalse('test/m' in gdp2.pckloader.cache)
+
+    def test_digcache_evict(self):
+        gdp = self.get_processor(self.cases[0])
+        gdp.dig(self.figlabel)
+        self.digcache.maxbytes = 0
+        self.digcache.evict()
+        self.assertEqual(self.cached_files('.pickle'), [])
+        self.digcache.maxage = -1
+        self.digcache.evict()
+        self.assertEqual(os.listdir(self.digcache.path), [])
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import time
+import unittest
+import multiprocessing
+
+from .._mp_rwlock import MP_RWLock
+
+
+def _reader(rwlock, count, barrier):
+    with rwlock.reader_lock:
+        with count.get_lock():
+            count.value += 1
+        barrier.wait(timeout=10)  # all readers hold the lock together
+
+
+def _writer(rwlock, count):
+    with rwlock.writer_lock:
+        old = count.value
+        time.sleep(0.01)
+        count.value = old + 1
+
+
+class TestMPRWLock(unittest.TestCase):
+    '''
+    Test class MP_RWLock
+    '''
+
+    def test_shared_readers(self):
+        rwlock = MP_RWLock()
+        count = multiprocessing.Value('i', 0)
+        barrier = multiprocessing.Barrier(3)
+        procs = [multiprocessing.Process(
+            target=_reader, args=(rwlock, count, barrier)) for i in range(3)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=20)
+            self.assertEqual(p.exitcode, 0)
+        self.assertEqual(count.value, 3)
+
+    def test_exclusive_writers(self):
+        rwlock = MP_RWLock()
+        count = multiprocessing.Value('i', 0, lock=False)
+        procs = [multiprocessing.Process(
+            target=_writer, args=(rwlock, count)) for i in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=20)
+        self.assertEqual(count.value, 4)
+
+    def test_recursion(self):
+        rwlock = MP_RWLock(size=4)
+        with rwlock.writer_lock:
+            with rwlock.reader_lock:
+                with rwlock.writer_lock:
+                    pass
+        with rwlock.reader_lock:
+            with self.assertRaises(RuntimeError):
+                rwlock.writer_lock.acquire()
+        with self.assertRaises(RuntimeError):
+            rwlock.reader_lock.release()
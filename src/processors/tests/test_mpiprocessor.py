@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import os
+import sys
+import types
+import queue
+import pickle
+import importlib
+import threading
+import unittest
+import unittest.mock
+import tempfile
+import shutil
+try:
+    import mpi4py
+    HAVE_MPI4PY = True
+except ImportError:
+    HAVE_MPI4PY = False
+
+from .. import get_processor
+from ..lib import *
+
+register_Processor('TDP', '.tests', 'T')
+
+
+class FakeStatus(object):
+    source = None
+
+    def Get_source(self):
+        return self.source
+
+
+class FakeComm(object):
+    '''
+    Communicator of one simulated rank, ranks are threads.
+    Messages are pickled like MPI, and received in order by source.
+    '''
+
+    def __init__(self, boxes, rank):
+        self.boxes = boxes
+        self.rank = rank
+        self.stash = []
+
+    def Get_rank(self):
+        return self.rank
+
+    def Get_size(self):
+        return len(self.boxes)
+
+    def send(self, obj, dest=0, tag=0):
+        self.boxes[dest].put((self.rank, tag, pickle.dumps(obj)))
+
+    def recv(self, source=-1, tag=-1, status=None):
+        while True:
+            for msg in self.stash:
+                if source in (-1, msg[0]) and tag in (-1, msg[1]):
+                    self.stash.remove(msg)
+                    if status is not None:
+                        status.source = msg[0]
+                    return pickle.loads(msg[2])
+            # no deadlock in tests
+            self.stash.append(self.boxes[self.rank].get(timeout=10))
+
+    @classmethod
+    def world(cls, size):
+        boxes = [queue.Queue() for _ in range(size)]
+        return [cls(boxes, rank) for rank in range(size)]
+
+
+FakeMPI = types.ModuleType('mpi4py.MPI')
+FakeMPI.COMM_WORLD = FakeComm.world(1)[0]
+FakeMPI.Status = FakeStatus
+FakeMPI.ANY_SOURCE = -1
+
+
+def _import_mpiprocessor():
+    '''Import module mpiprocessor, use FakeMPI if no mpi4py.'''
+    name = __name__.rsplit('.', 2)[0] + '.mpiprocessor'
+    if HAVE_MPI4PY:
+        return importlib.import_module(name)
+    fake = types.ModuleType('mpi4py')
+    fake.MPI = FakeMPI
+    # sys.modules are restored, module with FakeMPI is not left
+    with unittest.mock.patch.dict(sys.modules, {
+            'mpi4py': fake, 'mpi4py.MPI': FakeMPI}):
+        return importlib.import_module(name)
+
+
+class TaskProcessor(object):
+    '''Methods called by tasks.'''
+
+    def square(self, x):
+        return x * x
+
+    def fail(self, x):
+        raise ValueError('bad %s' % x)
+
+
+class TestMPITaskPool(unittest.TestCase):
+    '''
+    Test MPITaskPool protocol with simulated ranks in threads.
+    '''
+
+    def setUp(self):
+        mod = _import_mpiprocessor()
+        self.MPITaskPool = mod.MPITaskPool
+        patcher = unittest.mock.patch.object(mod, 'MPI', FakeMPI)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.processor = TaskProcessor()
+
+    def run_ranks(self, size, func):
+        '''
+        Call *func*(processor, pool) by run_collective on all ranks.
+        Return the return of rank 0, or raise its exception.
+        '''
+        pools = [self.MPITaskPool(comm) for comm in FakeComm.world(size)]
+        threads = [threading.Thread(
+            target=pool.run_collective,
+            args=(self.processor, func, None, pool)) for pool in pools[1:]]
+        for t in threads:
+            t.start()
+        try:
+            return pools[0].run_collective(
+                self.processor, func, None, pools[0])
+        finally:
+            # all other ranks are stopped
+            for t in threads:
+                t.join(timeout=10)
+                self.assertFalse(t.is_alive())
+            self.assertEqual(pools[0]._idle, [])
+            self.assertEqual(pools[0]._depth, 0)
+
+    def test_taskpool_imap_unordered(self):
+        tasks = [(i, (i,)) for i in range(7)]
+
+        def func(processor, pool):
+            return dict(pool.imap_unordered(processor, 'square', tasks))
+
+        for size in (2, 3, 4):
+            self.assertEqual(self.run_ranks(size, func),
+                             {i: i * i for i in range(7)})
+
+    def test_taskpool_error(self):
+        tasks = [(i, (i,)) for i in range(6)]
+
+        def func(processor, pool):
+            return dict(pool.imap_unordered(processor, 'fail', tasks))
+
+        for size in (2, 3, 4):
+            # other busy ranks are waited by stop
+            with self.assertRaises(RuntimeError) as cm:
+                self.run_ranks(size, func)
+            self.assertIn('ValueError: bad', str(cm.exception))
+
+    def test_taskpool_nested(self):
+        tasks = [(i, (i,)) for i in range(5)]
+
+        def inner(processor, pool):
+            return dict(pool.imap_unordered(processor, 'square', tasks))
+
+        def outer(processor, pool):
+            first = pool.run_collective(processor, inner, None, pool)
+            # other ranks are not stopped by the inner call
+            self.assertEqual(pool._depth, 1)
+            second = pool.run_collective(processor, inner, None, pool)
+            return first, second
+
+        for size in (2, 3):
+            first, second = self.run_ranks(size, outer)
+            self.assertEqual(first, {i: i * i for i in range(5)})
+            self.assertEqual(second, first)
+
+
+@unittest.skipUnless(HAVE_MPI4PY, "requires mpi4py")
+class TestMPIProcessor(unittest.TestCase):
+    '''
+    Test MPI Processor class in one process, without mpirun.
+    '''
+
+    def setUp(self):
+        self.tmp = tempfile.mktemp(suffix='-test')
+        os.mkdir(self.tmp)
+        with open(os.path.join(self.tmp, 'test.out'), mode='w') as f:
+            f.write('10\n20\n30\n40')
+        self.figlabel = 'test/mnpq'
+
+    def tearDown(self):
+        if os.path.isdir(self.tmp):
+            shutil.rmtree(self.tmp)
+
+    def test_processor_mpi_dig_visplt(self):
+        gdp = get_processor(self.tmp, name='TDP', parallel='mpi4py')
+        self.assertEqual(gdp.name, 'TDP')
+        self.assertEqual(gdp.parallel, 'mpi4py')
+        out = gdp.multi_dig(self.figlabel)
+        accfiglabel, results, template = out[0]
+        self.assertTrue(accfiglabel in gdp.diggedlabels)
+        success, fail = gdp.multi_visplt(self.figlabel, savepath=self.tmp)
+        self.assertEqual(len(success), 1)
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp, success[0][1])))
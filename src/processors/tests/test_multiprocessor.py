@@ -6,9 +6,10 @@ import os
 import unittest
 import tempfile
 import shutil
+import pickle
 import multiprocessing
 
-from .. import get_processor
+from .. import get_processor, multiprocessor
 from ..lib import *
 
 register_Processor('TDP', '.tests', 'T')
@@ -44,6 +45,20 @@ class TestMultiprocessProcessor(unittest.TestCase):
         accfiglabel, results, template = out[0]
         self.assertTrue(accfiglabel in gdp.resfileloader.datagroups)
 
+    def test_processor_worker_cache(self):
+        gdp = get_processor(self.tmp, name='TDP', parallel='multiprocess')
+        gdp.pckloader.get('test/m')
+        multiprocessor._WORKER_PROCESSOR = pickle.loads(pickle.dumps(gdp))
+        try:
+            worker = multiprocessor._WORKER_PROCESSOR
+            self.assertEqual(len(worker.pckloader.cache), 0)
+            tag, out = multiprocessor._call_worker(
+                (0, 'dig', (self.figlabel,)))
+            self.assertEqual(out[1]['title'], '(10,20,30,40)')
+            self.assertEqual(len(worker.pckloader.cache), 0)
+        finally:
+            multiprocessor._WORKER_PROCESSOR = None
+
     def test_processor_multi_visplt(self):
         gdp = get_processor(self.tmp, name='TDP', parallel='multiprocess')
         accfiglabels = gdp.multi_visplt(self.figlabel, savepath=self.tmp)
@@ -68,3 +83,43 @@ class TestMultiprocessProcessor(unittest.TestCase):
         self.assertListEqual(results['x'], X2[0][1])  # same result
         self.assertListEqual(results['x'], X2[1][1])  # same result
         self.assertNotEqual(X2[0][2], X2[1][2])  # different pid
+
+    def test_processor_workerpool_reuse(self):
+        gdpcls = get_processor(name='TDP', parallel='multiprocess')
+        old_multiproc = gdpcls.multiproc
+        gdpcls.multiproc = 2
+        try:
+            gdp = gdpcls(self.tmp)
+            out1 = gdp.multi_dig(self.figlabel, redig=True)
+            pool = gdp.workerpool._pool
+            self.assertIsNotNone(pool)
+            out2 = gdp.multi_dig(self.figlabel, redig=True,
+                                 whichlock='read-write')
+            self.assertIs(pool, gdp.workerpool._pool)  # reused
+            self.assertEqual(out1[0][0], out2[0][0])
+            self.assertDictEqual(out1[0][1], out2[0][1])
+            gdp.shutdown()
+            self.assertIsNone(gdp.workerpool._pool)
+            out3 = gdp.multi_dig(self.figlabel, redig=True)  # restart
+            self.assertEqual(out1[0][0], out3[0][0])
+            gdp.shutdown()
+        finally:
+            gdpcls.multiproc = old_multiproc
+
+    def test_processor_task_cost(self):
+        gdpcls = get_processor(name='TDP', parallel='multiprocess')
+        gdpcls.dig_acceptable_time = 0
+        gdp = gdpcls(self.tmp)
+        self.assertEqual(gdp._convert_cost(gdp.converters[0]),
+                         os.path.getsize(os.path.join(self.tmp, 'test.out')))
+        cost0 = gdp._dig_cost(self.figlabel, {})
+        self.assertTrue(cost0 > 0)
+        self.assertEqual(gdp._dig_cost('lost/figlabel', {}), 0)
+        accfiglabel = gdp.multi_dig(self.figlabel)[0][0]
+        # dig time recorded in resfile
+        digtime = gdp.resfileloader['%s/digtime' % accfiglabel]
+        self.assertEqual(gdp._dig_cost(self.figlabel, {}), digtime)
+        self.assertNotIn('digtime', gdp.dig(self.figlabel, post=False)[1])
+        self.assertListEqual(
+            gdp._longest_first(['a', 'b', 'c', 'd'], [1, 3, 1, 2]),
+            ['b', 'd', 'a', 'c'])
@@ -4,6 +4,8 @@
 
 import os
 import unittest
+import unittest.mock
+import zipfile
 import tempfile
 import shutil
 
@@ -87,3 +89,69 @@ class TestSerialProcessor(unittest.TestCase):
         accfiglabel = gdp.visplt(self.figlabel, show=False, callback=get_X)
         self.assertEqual(X1[0][0], X2[0][0])
         self.assertListEqual(X1[0][1], X2[0][1])
+
+    def test_processor_update(self):
+        gdpcls = get_processor(name='TDP', parallel='off')
+        gdpcls.dig_acceptable_time = 0
+        gdp = gdpcls(self.tmp)
+        manifest = gdp._read_manifest()
+        self.assertListEqual(list(manifest), ['test'])
+        self.assertEqual(manifest['test'][0][:2], ['test.out', 11])
+        self.assertEqual(len(manifest['test'][0]), 3)  # no SHA1
+        accfiglabel, results, template = gdp.dig(self.figlabel)
+        self.assertTrue(accfiglabel in gdp.resfileloader.datagroups)
+        # unchanged
+        self.assertListEqual(gdp.update(), [])
+        # same content with new mtime, no SHA1 to compare at first
+        rawfile = os.path.join(self.tmp, 'test.out')
+        os.utime(rawfile, (1, 1))
+        self.assertListEqual(gdp.update(), ['test'])
+        self.assertEqual(len(gdp._read_manifest()['test'][0]), 4)
+        os.utime(rawfile, (2, 2))
+        self.assertListEqual(gdp.update(), [])
+        # new mtime is saved, no hash again
+        self.assertEqual(gdp._read_manifest()['test'][0][2], 2)
+        with unittest.mock.patch.object(
+                type(gdp.rawloader), 'gethash',
+                side_effect=RuntimeError('hashed again')):
+            self.assertListEqual(gdp.update(), [])
+        accfiglabel, results, template = gdp.dig(self.figlabel)
+        # changed
+        with open(rawfile, mode='w') as f:
+            f.write('10\n20\n50\n60')
+        self.assertListEqual(gdp.update(), ['test'])
+        self.assertEqual(gdp.pckloader.get('test/p'), 50)
+        with zipfile.ZipFile(gdp.pcksaver.path) as z:
+            names = z.namelist()
+        self.assertEqual(len(names), len(set(names)))  # no old members
+        self.assertFalse(accfiglabel in gdp.diggedlabels)
+        self.assertFalse(accfiglabel in gdp.resfileloader.datagroups)
+        accfiglabel, results, template = gdp.dig(self.figlabel)
+        self.assertEqual(results['title'], '(10,20,50,60)')
+        # incremental init
+        with open(rawfile, mode='w') as f:
+            f.write('10\n20\n70\n80')
+        gdp = gdpcls(self.tmp, incremental=True)
+        self.assertFalse(accfiglabel in gdp.diggedlabels)
+        accfiglabel, results, template = gdp.dig(self.figlabel)
+        self.assertEqual(results['title'], '(10,20,70,80)')
+
+    def test_processor_update_growing(self):
+        gdp = get_processor(self.tmp, name='TDP', parallel='off')
+        rawfile = os.path.join(self.tmp, 'test.out')
+        convert = type(gdp.converters[0]).convert
+
+        def convert_then_grow(core):
+            data = convert(core)
+            with open(rawfile, mode='a') as f:
+                f.write('\n90')
+            return data
+
+        with open(rawfile, mode='w') as f:
+            f.write('10\n20\n30\n50')
+        with unittest.mock.patch.object(
+                type(gdp.converters[0]), 'convert', convert_then_grow):
+            self.assertListEqual(gdp.update(rescan=False), ['test'])
+        # bytes appended during convert are new in next update
+        self.assertListEqual(gdp.update(), ['test'])
+        self.assertListEqual(gdp.update(), [])
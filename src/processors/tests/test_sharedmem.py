@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import os
+import gc
+import unittest
+import multiprocessing
+import numpy
+
+from .._sharedmem import (
+    SharedArray, start_tracker, share_arrays, attach_arrays, unlink_blocks)
+
+
+def _worker(n):
+    a = numpy.arange(n, dtype='f8').reshape(-1, 2)
+    return share_arrays({'a': a, 'b': [a, 1], 'c': numpy.ones(2)}, 64)
+
+
+def _exists(name):
+    return os.path.exists(os.path.join('/dev/shm', name))
+
+
+class TestSharedMem(unittest.TestCase):
+    '''
+    Test shared memory transport of arrays.
+    '''
+
+    def test_share_none(self):
+        data = {'a': numpy.ones(100)}
+        self.assertIs(share_arrays(data, None), data)
+
+    def test_worker_to_main(self):
+        start_tracker()
+        with multiprocessing.Pool(2) as pool:
+            shared = pool.map(_worker, [100, 1000])
+        for n, res in zip([100, 1000], shared):
+            self.assertIsInstance(res['a'], SharedArray)
+            self.assertIs(res['a'], res['b'][0])
+            self.assertIsInstance(res['c'], numpy.ndarray)
+            data = attach_arrays(res)
+            self.assertIs(data['a'], data['b'][0])
+            numpy.testing.assert_array_equal(
+                data['a'], numpy.arange(n, dtype='f8').reshape(-1, 2))
+            view = data['a'][1:]
+            del data
+            gc.collect()
+            self.assertEqual(view[0, 0], 2.0)  # still mapped
+            if os.path.isdir('/dev/shm'):
+                self.assertFalse(_exists(res['a'].name))  # unlinked
+
+    def test_main_to_worker(self):
+        blocks = []
+        a = numpy.arange(50.0)
+        shared = share_arrays([a, (a, 'x')], 8, blocks)
+        self.assertEqual(len(blocks), 1)
+        data = attach_arrays(shared, unlink=False)
+        numpy.testing.assert_array_equal(data[0], a)
+        del data
+        unlink_blocks(blocks)
+        self.assertEqual(blocks, [])
+        if os.path.isdir('/dev/shm'):
+            self.assertFalse(_exists(shared[0].name))
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import os
+import time
+import unittest
+import tempfile
+import shutil
+
+from .. import get_processor
+from ..lib import register_Processor
+from ..watcher import CaseWatcher
+
+register_Processor('TDP', '.tests', 'T')
+
+
+class TestCaseWatcher(unittest.TestCase):
+    '''
+    Test CaseWatcher class.
+    '''
+
+    def setUp(self):
+        self.tmp = tempfile.mktemp(suffix='-test')
+        os.mkdir(self.tmp)
+        self.rawfile = os.path.join(self.tmp, 'test.out')
+        self.write_raw('10\n20\n30\n40', ago=100)
+        self.figlabel = 'test/mnpq'
+
+    def tearDown(self):
+        if os.path.isdir(self.tmp):
+            shutil.rmtree(self.tmp)
+
+    def write_raw(self, text, ago=0):
+        with open(self.rawfile, mode='w') as f:
+            f.write(text)
+        mtime = time.time() - ago
+        os.utime(self.rawfile, (mtime, mtime))
+
+    def test_watcher_unsettled(self):
+        gdp = get_processor(self.tmp, name='TDP', parallel='off',
+                            incremental=True)
+        watcher = CaseWatcher(gdp, settle=10)
+        self.assertEqual(watcher.unsettled(), set())
+        # file is being written
+        self.write_raw('10\n20\n30\n40\n50', ago=100)
+        now = time.time()
+        self.assertEqual(watcher.unsettled(now=now), {'test.out'})
+        self.assertEqual(watcher.unsettled(now=now + 5), {'test.out'})
+        self.assertEqual(watcher.unsettled(now=now + 11), set())
+        gdp.shutdown()
+
+    def test_watcher_check(self):
+        gdp = get_processor(self.tmp, name='TDP', parallel='off',
+                            incremental=True)
+        watcher = CaseWatcher(gdp, select=['test/mnpq'], settle=0)
+        groups, figlabels, unsettled = watcher.check()
+        self.assertEqual(groups, [])
+        self.assertEqual(figlabels, [self.figlabel])
+        self.assertTrue(gdp._dependent_digged(['test']))
+        groups, figlabels, unsettled = watcher.check()
+        self.assertEqual((groups, figlabels), ([], []))
+        # raw data changed
+        self.write_raw('1\n2\n3\n4', ago=100)
+        groups, figlabels, unsettled = watcher.check()
+        self.assertEqual(groups, ['test'])
+        self.assertEqual(figlabels, [self.figlabel])
+        self.assertTrue(gdp._dependent_digged(['test']))
+        self.assertEqual(gdp.pckloader['test/m'], 1)
+        watcher.run(checks=1)
+        gdp.shutdown()
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Contains case watcher class, which follows a running case.
+'''
+
+import os
+import time
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+from .processor import plog
+
+__all__ = ['CaseWatcher']
+
+
+class _Poller(object):
+    '''Wait without events, just sleep.'''
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+        return False
+
+    def close(self):
+        pass
+
+
+class _INotifier(object):
+    '''
+    Wait for file events in a local directory and its subdirectories,
+    events in *debounce* seconds are read together.
+    '''
+
+    def __init__(self, path, debounce=1.0):
+        self.path = path
+        self.debounce = debounce
+        self.inotify = inotify_simple.INotify()
+        f = inotify_simple.flags
+        self.mask = (f.CLOSE_WRITE | f.MOVED_TO | f.CREATE | f.MODIFY
+                     | f.DELETE | f.MOVED_FROM)
+        self.watched = set()
+        self._add_watches()
+
+    def _add_watches(self):
+        # directory tree maxdepth is 2, same as DirRawLoader
+        dirs = [self.path] + [e.path for e in os.scandir(self.path)
+                              if e.is_dir(follow_symlinks=False)]
+        for d in dirs:
+            if d not in self.watched:
+                self.inotify.add_watch(d, self.mask)
+                self.watched.add(d)
+
+    def wait(self, timeout):
+        '''Return True if any events got in *timeout* seconds.'''
+        self._add_watches()
+        events = self.inotify.read(timeout=int(timeout * 1000),
+                                   read_delay=int(self.debounce * 1000))
+        return len(events) > 0
+
+    def close(self):
+        self.inotify.close()
+
+
+class CaseWatcher(object):
+    '''
+    Follow a running case, convert its new and changed raw data,
+    then dig and plot the selected figures which use them.
+
+    Attributes
+    ----------
+    processor: processor object, which has rawloader and pckloader
+    select: list
+        regular expressions to select figlabels, see :meth:`refind`
+    interval: float
+        max seconds between two checks, default 60
+    settle: float
+        seconds which a raw file must keep its size and mtime,
+        before it is converted, default 10
+    figdir: str
+        directory to save figures, default None, not plot
+    figext: str
+        extension of figures, default 'png'
+
+    Notes
+    -----
+    1. A local raw data directory is watched by inotify, if the package
+       `inotify_simple` is available, then events start checks early.
+       Otherwise, and for archives or sftp directory, raw data
+       are listed again in every check.
+    2. Raw files modified in last :attr:`settle` seconds are thought
+       to be still written, like 'history.out' of a running case.
+       Their groups are converted in later checks.
+    3. The first check digs or plots all selected figures,
+       later checks only those which use the updated data.
+    4. Every update of a '.npz' converted file rewrites the whole
+       archive to drop old groups, a '.jsonl' file grows with each
+       update. Use savetype '.hdf5' or '.npyd' to watch long cases.
+    '''
+    __slots__ = ['processor', 'select', 'interval', 'settle',
+                 'figdir', 'figext', '_stats', '_notifier', '_checked']
+
+    def __init__(self, processor, select=None, interval=60, settle=10,
+                 figdir=None, figext='png'):
+        if not (processor.rawloader and processor.pcksaver
+                and processor.pckloader):
+            raise ValueError("%s: Need a rawloader, pcksaver and pckloader!"
+                             % processor.name)
+        if processor.parallel == 'mpi4py':
+            raise ValueError("%s: Can't watch case with MPI!"
+                             % processor.name)
+        if processor.pcksaver._extension in ('.npz', '.jsonl'):
+            plog.warning("%s: Updating %s costs more as it grows, "
+                         "recommend savetype '.hdf5' or '.npyd'."
+                         % (processor.name, processor.pcksaver.path))
+        self.processor = processor
+        self.select = list(select or [])
+        self.interval = interval
+        self.settle = settle
+        self.figdir = figdir
+        self.figext = figext
+        self._stats = {}
+        self._checked = False
+        rawloader = processor.rawloader
+        if inotify_simple and rawloader.loader_type == 'directory':
+            plog.info("Watching %s by inotify." % rawloader.path)
+            self._notifier = _INotifier(rawloader.path)
+        else:
+            plog.info("Watching %s every %ss." % (rawloader.path, interval))
+            self._notifier = _Poller()
+
+    def unsettled(self, now=None):
+        '''
+        Return raw filenames of converters changed in last
+        :attr:`settle` seconds, compared with their stat in last call.
+        '''
+        now = time.time() if now is None else now
+        rawloader = self.processor.rawloader
+        names = set()
+        for core in self.processor.converters:
+            names.update([core.files] if isinstance(core.files, str)
+                         else core.files)
+        stats, unsettled = {}, set()
+        for name in sorted(names):
+            try:
+                st = rawloader.getstat(name)
+            except Exception:
+                unsettled.add(name)  # maybe removed or renamed
+                continue
+            old = self._stats.get(name)
+            # first seen, only mtime is known
+            since = 0 if old is None else (old[1] if old[0] == st else now)
+            stats[name] = (st, since)
+            if now - max(since, st[1]) < self.settle:
+                unsettled.add(name)
+        self._stats = stats
+        return unsettled
+
+    def selected_figlabels(self):
+        figlabels = set()
+        for pattern in self.select:
+            figlabels.update(self.processor.refind(pattern))
+        return sorted(figlabels)
+
+    def dig(self, figlabels):
+        '''Dig figures in *figlabels*.'''
+        gdp = self.processor
+        if gdp.parallel == 'off':
+            for figlabel in figlabels:
+                gdp.dig(figlabel, post=False)
+        else:
+            gdp.multi_dig(*figlabels, post=False)
+
+    def plot(self, figlabels):
+        '''Plot figures in *figlabels*, save them in :attr:`figdir`.'''
+        gdp = self.processor
+        os.makedirs(self.figdir, exist_ok=True)
+        if gdp.parallel == 'off':
+            for figlabel in figlabels:
+                fname = '%s.%s' % (figlabel.replace('/', '-'), self.figext)
+                try:
+                    accfiglabel = gdp.visplt(figlabel, revis=True, show=False)
+                    if accfiglabel:
+                        gdp.visplter.save_figure(
+                            accfiglabel, os.path.join(self.figdir, fname))
+                except Exception:
+                    plog.error("Failed to plot %s!" % figlabel, exc_info=1)
+                gdp.visplter.close_figure('all')
+        else:
+            gdp.multi_visplt(
+                *figlabels, revis=True, savename='figlabel',
+                saveext=self.figext, savepath=self.figdir)
+
+    def check(self):
+        '''
+        Check raw data once, convert new and changed data, then dig or
+        plot the selected figures which use them.
+        Return updated groups, figlabels and raw files still written.
+        '''
+        gdp = self.processor
+        gdp.rawloader.update()
+        gdp.rawloader = gdp.rawloader  # regenerate converters
+        unsettled = self.unsettled()
+        if unsettled:
+            plog.info("Wait for %d raw files being written: %s"
+                      % (len(unsettled), ', '.join(sorted(unsettled))))
+        groups = gdp.update(rescan=False, skip=unsettled)
+        figlabels = self.selected_figlabels()
+        if self._checked:
+            dependent = set(gdp._dependent_figlabels(groups))
+            figlabels = [f for f in figlabels if f in dependent]
+        self._checked = True
+        if figlabels:
+            plog.info("%d figures to update: %s"
+                      % (len(figlabels), ', '.join(figlabels)))
+            if self.figdir:
+                self.plot(figlabels)
+            else:
+                self.dig(figlabels)
+        return groups, figlabels, unsettled
+
+    def run(self, checks=None):
+        '''
+        Check raw data when they change or every :attr:`interval` seconds,
+        until interrupted or *checks* done.
+        '''
+        count = 0
+        try:
+            while True:
+                try:
+                    unsettled = self.check()[2]
+                except Exception:
+                    plog.error("Failed to check %s!"
+                               % self.processor.rawloader.path, exc_info=1)
+                    unsettled = ()
+                count += 1
+                if checks and count >= checks:
+                    break
+                # recheck files being written after they settle
+                timeout = self.interval
+                if unsettled:
+                    timeout = min(timeout, self.settle)
+                self._notifier.wait(timeout)
+        except KeyboardInterrupt:
+            plog.info("Stop watching %s." % self.processor.rawloader.path)
+        finally:
+            self._notifier.close()
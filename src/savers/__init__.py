@@ -23,15 +23,23 @@ from . import base
 __all__ = ['get_pcksaver', 'is_pcksaver']
 log = getGLogger('S')
 pcksaver_names = ['CachePckSaver', 'NpzPckSaver', 'Hdf5PckSaver',
-                  'JsonlPckSaver', 'JsonzPckSaver']
-pcksaver_types = ['.cache', '.npz', '.hdf5', '.jsonl', '.jsonz']
+                  'JsonlPckSaver', 'JsonzPckSaver', 'NpydPckSaver']
+pcksaver_types = ['.cache', '.npz', '.hdf5', '.jsonl', '.jsonz', '.npyd']
 
 
-def get_pcksaver(path):
+def get_pcksaver(path, compression=None):
     '''
     Given a saver path, return a saver instance.
     Raises ValueError if path type not supported.
 
+    Parameters
+    ----------
+    path: str
+    compression: str
+        compression profile for '.npz', '.jsonz' and '.hdf5' savers,
+        like 'fast', 'small', 'store', 'deflate:N', 'lzf', 'gzip:N'.
+        Default None, use saver's default. Ignored by other savers.
+
     Notes
     -----
     *path* types:
@@ -39,7 +47,8 @@ def get_pcksaver(path):
     2. '.npz', file path
     3. '.hdf5', file path
     4. '.jsonl', file path
-    4. '.jsonz', file path
+    5. '.jsonz', file path
+    6. '.npyd', directory path
     '''
     path = str(path)
     ext = os.path.splitext(path)[1]
@@ -48,22 +57,32 @@ def get_pcksaver(path):
                     % ', '.join(pcksaver_types))
         ext = '.npz'
         path = path + ext
+    kwargs = {}
+    if compression is not None:
+        if ext in ('.npz', '.jsonz', '.hdf5'):
+            kwargs['compression'] = compression
+        else:
+            log.warning("Ignore compression '%s' for PckSaver type '%s'!"
+                        % (compression, ext))
 
     if ext == '.cache':
         from .cachepck import CachePckSaver
         saver = CachePckSaver(path)
     elif ext == '.npz':
         from .npzpck import NpzPckSaver
-        saver = NpzPckSaver(os.path.expanduser(path))
+        saver = NpzPckSaver(os.path.expanduser(path), **kwargs)
     elif ext == '.hdf5':
         from .hdf5pck import Hdf5PckSaver
-        saver = Hdf5PckSaver(os.path.expanduser(path))
+        saver = Hdf5PckSaver(os.path.expanduser(path), **kwargs)
     elif ext == '.jsonl':
         from .jsonpck import JsonlPckSaver
         saver = JsonlPckSaver(os.path.expanduser(path))
     elif ext == '.jsonz':
         from .jsonpck import JsonzPckSaver
-        saver = JsonzPckSaver(os.path.expanduser(path))
+        saver = JsonzPckSaver(os.path.expanduser(path), **kwargs)
+    elif ext == '.npyd':
+        from .npydpck import NpydPckSaver
+        saver = NpydPckSaver(os.path.expanduser(path))
     else:
         raise ValueError('Save ha? Who am I? Why am I here?')
     return saver
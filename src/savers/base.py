@@ -149,6 +149,13 @@ class BasePckSaver(object):
             self._close()
             self.status = False
 
+    def compact(self):
+        '''
+        Remove old data left in the closed store by rewritten groups,
+        if the format keeps them. Return True if the store is rebuilt.
+        '''
+        return False
+
     def __enter__(self):
         self.iopen()
         return self
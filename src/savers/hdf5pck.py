@@ -2,6 +2,7 @@
 
 # Copyright (c) 2018-2020 shmilee
 
+import math
 import numpy
 try:
     import h5py
@@ -29,13 +30,95 @@ class Hdf5PckSaver(BasePckSaver):
     Parameters
     ----------
     {Parameters}
+    chunks: 'auto', None or tuple
+        'auto', chunk shape is computed by :meth:`auto_chunks`;
+        None, one chunk for the whole array; tuple, for all arrays.
+    compression: str
+        'none', 'lzf', 'gzip' or 'gzip:N', N is level 0-9, default 'gzip:4'
+        or profile names in :attr:`compression_profiles`
+    shuffle: bool
+        use shuffle filter before compression or not, default True
 
     Notes
     -----
     {Notes}
+    4. Arrays of GTC data use the last axis as time axis, like history
+       and data1d. So 'auto' chunks keep other axes whole and cut along
+       the last axis, then reading a time range only touches its chunks.
     '''
-    __slots__ = []
+    __slots__ = ['chunks', 'compression', 'shuffle']
     _extension = '.hdf5'
+    chunk_target_nbytes = 512 * 1024
+    compression_profiles = {'store': 'none', 'fast': 'lzf', 'small': 'gzip:9'}
+
+    def __init__(self, path, chunks='auto', compression='gzip:4',
+                 shuffle=True):
+        super(Hdf5PckSaver, self).__init__(path)
+        if not (chunks in ('auto', None) or isinstance(chunks, tuple)):
+            raise ValueError("Invalid chunks: %s!" % (chunks,))
+        self.chunks = chunks
+        self.compression = self.parse_compression(compression)
+        self.shuffle = bool(shuffle)
+
+    @classmethod
+    def parse_compression(cls, spec):
+        '''
+        Return h5py create_dataset keywords for compression *spec*.
+        '''
+        spec = cls.compression_profiles.get(spec, spec)
+        name, _, level = str(spec).partition(':')
+        if name == 'none':
+            return {}
+        elif name == 'lzf' and not level:
+            return dict(compression='lzf')
+        elif name == 'gzip':
+            if not level:
+                return dict(compression='gzip')
+            if level.isdigit() and int(level) <= 9:
+                return dict(compression='gzip', compression_opts=int(level))
+        raise ValueError("Invalid compression: '%s'!" % spec)
+
+    @classmethod
+    def auto_chunks(cls, shape, itemsize, target=None):
+        '''
+        Return a chunk shape about *target* bytes for array *shape*.
+        Cut the last(time) axis first, then the leading axes.
+        '''
+        target = target or cls.chunk_target_nbytes
+        chunks = list(shape)
+        nbytes = math.prod(chunks) * itemsize
+        if nbytes <= target:
+            return tuple(shape)
+        # one time step of all other axes
+        rowbytes = nbytes // chunks[-1]
+        if rowbytes <= target:
+            chunks[-1] = max(1, target // rowbytes)
+            return tuple(chunks)
+        chunks[-1] = 1
+        while rowbytes > target:
+            i = chunks.index(max(chunks[:-1]))
+            if chunks[i] == 1:
+                break
+            chunks[i] = (chunks[i] + 1) // 2
+            rowbytes = math.prod(chunks) * itemsize
+        return tuple(chunks)
+
+    def _dataset_kwargs(self, val):
+        kwargs = dict(self.compression)
+        if val.ndim == 0:
+            return {}  # scalar dataset, no chunk or filter
+        if not kwargs and self.chunks in ('auto', None):
+            return kwargs  # contiguous
+        if self.chunks == 'auto':
+            chunks = self.auto_chunks(val.shape, val.dtype.itemsize)
+        elif self.chunks is None or len(self.chunks) != val.ndim:
+            chunks = val.shape  # only one chunk
+        else:
+            chunks = tuple(min(c, n) for c, n in zip(self.chunks, val.shape))
+        kwargs['chunks'] = chunks
+        if self.shuffle and kwargs.get('compression'):
+            kwargs['shuffle'] = True
+        return kwargs
 
     def _open_append(self):
         return h5py.File(self.path, 'r+')
@@ -64,9 +147,7 @@ class Hdf5PckSaver(BasePckSaver):
                     if val.size == 0:
                         continue  # skip empty array []
                     fgrp.create_dataset(key, data=val,
-                                        chunks=val.shape,  # only one chunk
-                                        compression='gzip',
-                                        compression_opts=9)
+                                        **self._dataset_kwargs(val))
                 else:
                     # str -> bytes; bytes -> void
                     if isinstance(val, str):
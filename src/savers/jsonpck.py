@@ -11,6 +11,7 @@ from ..glogger import getGLogger
 from ..utils import inherit_docstring
 from .base import BasePckSaver
 from .._json import JsonLines, JsonZip
+from .._zipfile import parse_compression
 
 __all__ = ['JsonlPckSaver', 'JsonzPckSaver']
 log = getGLogger('S')
@@ -42,13 +43,17 @@ class JsonlPckSaver(BasePckSaver):
     def _open_new(self):
         return JsonLines(self.path)
 
+    def _update_kwds(self):
+        '''Return kwargs of store object's update method.'''
+        return {}
+
     def _write(self, group, data):
         try:
             if group in ('/', ''):
                 records = data
             else:
                 records = {'%s/%s' % (group, k): v for k, v in data.items()}
-            self._storeobj.update(records)
+            self._storeobj.update(records, **self._update_kwds())
         except Exception:
             log.error("Failed to save data of '%s'!" % group, exc_info=1)
 
@@ -68,16 +73,29 @@ class JsonzPckSaver(JsonlPckSaver):
     Parameters
     ----------
     {Parameters}
+    compression: str
+        compression profile, like 'store', 'deflate:N', 'lzma', 'zstd:N',
+        'fast' or 'small', see :func:`gdpy3._zipfile.parse_compression`.
+        Default 'deflate'.
 
     Notes
     -----
     {Notes}
+    4. The compression method of each '.json' member is recorded in the
+       zip headers, so loaders decode any profile without options.
     '''
-    __slots__ = []
+    __slots__ = ['compress_kwds']
     _extension = '.jsonz'
 
+    def __init__(self, path, compression='deflate'):
+        super(JsonzPckSaver, self).__init__(path)
+        self.compress_kwds = parse_compression(compression)
+
     def _open_append(self):
         return JsonZip(self.path)
 
     def _open_new(self):
         return JsonZip(self.path)
+
+    def _update_kwds(self):
+        return self.compress_kwds
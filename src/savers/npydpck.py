@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+'''
+Contains npy-directory pickled data saver class.
+'''
+
+import os
+import numpy as np
+
+from ..glogger import getGLogger
+from ..utils import inherit_docstring
+from .base import BasePckSaver
+
+__all__ = ['NpydPckSaver']
+log = getGLogger('S')
+_np_write_array = np.lib.format.write_array
+
+
+@inherit_docstring(BasePckSaver, parse=None, template=None)
+class NpydPckSaver(BasePckSaver):
+    '''
+    Save dict data with a group name to a directory of uncompressed
+    NumPy ``.npy`` files, one file per datakey.
+
+    Attributes
+    ----------
+    {Attributes}
+
+    Parameters
+    ----------
+    {Parameters}
+
+    Notes
+    -----
+    {Notes}
+    4. Datakey 'group/key' is saved as file 'path/group/key.npy'.
+       The file is written to a temporary name, then renamed,
+       so readers which have mapped the old file are not affected.
+    '''
+    __slots__ = []
+    _extension = '.npyd'
+
+    def _check_path_exists(self):
+        return os.path.isdir(self.path)
+
+    def _open_append(self):
+        return self.path
+
+    def _open_new(self):
+        os.makedirs(self.path)
+        return self.path
+
+    def _close(self):
+        self._storeobj = None
+
+    def _write(self, group, data):
+        try:
+            if group in ('/', ''):
+                grpdir = self._storeobj
+            else:
+                grpdir = os.path.join(self._storeobj, *group.split('/'))
+                os.makedirs(grpdir, exist_ok=True)
+            for key, val in data.items():
+                name = os.path.join(grpdir, key + '.npy')
+                log.debug("Writting %s ..." % name)
+                tmpname = '%s.%d.tmp' % (name, os.getpid())
+                with open(tmpname, 'wb') as f:
+                    _np_write_array(f, np.asanyarray(val), allow_pickle=True)
+                os.replace(tmpname, name)
+        except Exception:
+            log.error("Failed to save data of '%s'!" % group, exc_info=1)
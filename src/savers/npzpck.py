@@ -15,7 +15,7 @@ from ..glogger import getGLogger
 from ..utils import inherit_docstring
 from .base import BasePckSaver
 from .._zipfile import (
-    Py_version_tuple, Compress_kwds,
+    Py_version_tuple, parse_compression,
     zipfile_factory, zipfile_delete
 )
 
@@ -39,10 +39,16 @@ class NpzPckSaver(BasePckSaver):
     {Parameters}
     duplicate_name: bool
         allow "zipfile.py: UserWarning: Duplicate name ..." or not
+    compression: str or None
+        compression profile, like 'store', 'deflate:N', 'lzma', 'zstd:N',
+        'fast' or 'small', see :func:`gdpy3._zipfile.parse_compression`.
+        Default None, use the module setting, ZIP_LZMA.
 
     Notes
     -----
     {Notes}
+    4. The compression method of each '.npy' member is recorded in the
+       zip headers, so loaders decode any profile without options.
 
     References
     ----------
@@ -50,19 +56,21 @@ class NpzPckSaver(BasePckSaver):
     2. /usr/lib/python3.x/site-packages/numpy/lib/npyio.py, funtion zipfile_factory _savez
     3. https://docs.python.org/3/library/zipfile.html#zipfile.ZipFile
     '''
-    __slots__ = ['duplicate_name']
+    __slots__ = ['duplicate_name', 'compress_kwds']
     _extension = '.npz'
 
-    def __init__(self, path, duplicate_name=True):
+    def __init__(self, path, duplicate_name=True, compression=None):
         super(NpzPckSaver, self).__init__(path)
         self.duplicate_name = duplicate_name
-        log.debug('Using ZipFile compression parameters: %s' % Compress_kwds)
+        self.compress_kwds = parse_compression(compression)
+        log.debug('Using ZipFile compression parameters: %s'
+                  % self.compress_kwds)
 
     def _open_append(self):
-        return zipfile_factory(self.path, mode="a")
+        return zipfile_factory(self.path, mode="a", **self.compress_kwds)
 
     def _open_new(self):
-        return zipfile_factory(self.path, mode="w")
+        return zipfile_factory(self.path, mode="w", **self.compress_kwds)
 
     def __zf_open_write(self, name, val):
         """
@@ -74,9 +82,9 @@ class NpzPckSaver(BasePckSaver):
         # fix: https://github.com/python/cpython/blob/3.6/Lib/zipfile.py#L1371
         zinfo = zipfile.ZipInfo(filename=name,
                                 date_time=time.localtime(time.time())[:6])
-        zinfo.compress_type = Compress_kwds['compression']
-        if 'compresslevel' in Compress_kwds:
-            zinfo._compresslevel = Compress_kwds['compresslevel']
+        zinfo.compress_type = self.compress_kwds['compression']
+        if self.compress_kwds.get('compresslevel', None) is not None:
+            zinfo._compresslevel = self.compress_kwds['compresslevel']
         with self._storeobj.open(zinfo, 'w', force_zip64=True) as f:
             _np_write_array(f, np.asanyarray(val), allow_pickle=True)
 
@@ -91,6 +99,21 @@ class NpzPckSaver(BasePckSaver):
             data = f.getvalue()
             self._storeobj.writestr(name, data)
 
+    def compact(self):
+        '''
+        Rebuild the closed archive without old members of duplicate
+        names, the last one is retained. Return True if it is rebuilt.
+        '''
+        if self.status or not self._check_path_exists():
+            return False
+        with zipfile_factory(self.path, mode="r") as z:
+            names = z.namelist()
+        if len(names) == len(set(names)):
+            return False
+        log.debug("Rebuild %s without %d duplicate members ..."
+                  % (self.path, len(names) - len(set(names))))
+        return zipfile_delete(self.path, [])
+
     def _write(self, group, data):
         if not self.duplicate_name:
             prefix = '' if group in ('/', '') else ('%s/' % group)
@@ -3,6 +3,7 @@
 # Copyright (c) 2018-2020 shmilee
 
 import os
+import shutil
 import tempfile
 import numpy
 
@@ -18,6 +19,8 @@ class PckSaverTest(object):
     def tearDown(self):
         if os.path.isfile(self.tmpfile):
             os.remove(self.tmpfile)
+        elif os.path.isdir(self.tmpfile):
+            shutil.rmtree(self.tmpfile)
 
     def saver_iopen_close(self):
         saver = self.PckSaver(self.tmpfile)
@@ -53,3 +53,28 @@ class TestHdf5PckSaver(PckSaverTest, unittest.TestCase):
 
     def test_hdf5saver_with(self):
         self.saver_with()
+
+    def test_hdf5saver_chunks_compression(self):
+        a = numpy.random.rand(100, 2000)
+        with self.PckSaver(self.tmpfile) as saver:
+            self.assertTrue(saver.write('g', {'a': a, 's': numpy.array(1.0)}))
+        with h5py.File(saver.get_store(), 'r') as h5f:
+            self.assertEqual(h5f['g/a'].chunks, (100, 655))
+            self.assertEqual(h5f['g/a'].compression, 'gzip')
+            self.assertTrue(h5f['g/a'].shuffle)
+            self.assertTrue(numpy.array_equal(h5f['g/a'][:, 5:9], a[:, 5:9]))
+            self.assertEqual(h5f['g/s'][()], 1.0)
+        with self.PckSaver(self.tmpfile, chunks=None,
+                           compression='none') as saver:
+            self.assertTrue(saver.write('g', {'a': a}))
+        with h5py.File(saver.get_store(), 'r') as h5f:
+            self.assertIsNone(h5f['g/a'].chunks)
+            self.assertIsNone(h5f['g/a'].compression)
+        with self.assertRaises(ValueError):
+            self.PckSaver(self.tmpfile, compression='gzip:10')
+
+    def test_hdf5saver_auto_chunks(self):
+        auto_chunks = self.PckSaver.auto_chunks
+        self.assertEqual(auto_chunks((10, 20), 8), (10, 20))
+        self.assertEqual(auto_chunks((100, 2000), 8, target=8000), (100, 10))
+        self.assertEqual(auto_chunks((4000, 50), 8, target=8000), (1000, 1))
@@ -3,6 +3,7 @@
 # Copyright (c) 2018-2020 shmilee
 
 import unittest
+import zipfile
 from . import PckSaverTest
 from ..jsonpck import JsonLines, JsonZip, JsonlPckSaver, JsonzPckSaver
 
@@ -61,3 +62,11 @@ class TestJsonzPckSaver(PckSaverTest, unittest.TestCase):
 
     def test_jsonzsaver_with(self):
         self.saver_with()
+
+    def test_jsonzsaver_compression(self):
+        with self.PckSaver(self.tmpfile, compression='store') as saver:
+            self.assertTrue(saver.write('g', {'n': 1}))
+        with zipfile.ZipFile(self.tmpfile) as z:
+            self.assertEqual(z.getinfo('g/n.json').compress_type,
+                             zipfile.ZIP_STORED)
+        self.assertEqual(self.saver_get(self.tmpfile, 'g/n'), [1])
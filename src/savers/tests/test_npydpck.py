@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import os
+import unittest
+import numpy
+from . import PckSaverTest
+from ..npydpck import NpydPckSaver
+
+
+class TestNpydPckSaver(PckSaverTest, unittest.TestCase):
+    ''' Test class NpydPckSaver'''
+    PckSaver = NpydPckSaver
+
+    def test_npydsaver_iopen_close(self):
+        self.saver_iopen_close()
+
+    def test_npydsaver_write(self):
+        self.saver_write()
+
+    def saver_get_keys(self, store):
+        keys = set()
+        for root, dirs, files in os.walk(store):
+            rel = os.path.relpath(root, store).replace(os.sep, '/')
+            prefix = '' if rel == '.' else rel + '/'
+            keys.update(prefix + f[:-4] for f in files if f.endswith('.npy'))
+        return keys
+
+    def saver_get(self, store, *keys):
+        arrs = [numpy.load(os.path.join(store, k + '.npy')) for k in keys]
+        return [a.item() if a.size == 1 else a for a in arrs]
+
+    def test_npydsaver_write_str_byte(self):
+        self.saver_write_str_byte()
+
+    def test_npydsaver_write_num_arr(self):
+        self.saver_write_num_arr()
+
+    def test_npydsaver_overwrite(self):
+        with self.PckSaver(self.tmpfile) as saver:
+            self.assertTrue(saver.write('/', {'v': 1}))
+            self.assertTrue(saver.write('', {'v': 2}))
+            self.assertTrue(saver.write('g/k', {'num': 10}))
+        with self.PckSaver(self.tmpfile) as saver:
+            self.assertTrue(saver.write('g/k', {'num': 20}))
+        store = saver.get_store()
+        self.assertEqual(self.saver_get(store, 'v', 'g/k/num'), [2, 20])
+        self.assertSetEqual(self.saver_get_keys(store), {'v', 'g/k/num'})
+
+    def test_npydsaver_with(self):
+        self.saver_with()
@@ -3,6 +3,7 @@
 # Copyright (c) 2018-2020 shmilee
 
 import unittest
+import zipfile
 import numpy
 from . import PckSaverTest
 from ..npzpck import NpzPckSaver
@@ -49,5 +50,40 @@ class TestNpzPckSaver(PckSaverTest, unittest.TestCase):
         outkeys = set(npz.files)
         self.assertSetEqual(inkeys, outkeys)
 
+    def test_npzsaver_compact(self):
+        with self.PckSaver(self.tmpfile) as saver:
+            saver.write('g', {'a': 1, 'b': 2})
+            self.assertFalse(saver.compact())  # open
+        self.assertFalse(saver.compact())
+        with self.PckSaver(self.tmpfile) as saver:
+            saver.write('g', {'a': 10})
+        self.assertTrue(saver.compact())
+        with zipfile.ZipFile(self.tmpfile) as z:
+            self.assertListEqual(sorted(z.namelist()),
+                                 ['g/a.npy', 'g/b.npy'])
+        self.assertListEqual(self.saver_get(self.tmpfile, 'g/a', 'g/b'),
+                             [10, 2])
+
     def test_npzsaver_with(self):
         self.saver_with()
+
+    def test_npzsaver_compression(self):
+        with self.assertRaises(ValueError):
+            self.PckSaver(self.tmpfile, compression='lzma:9')
+        with self.assertRaises(ValueError):
+            self.PckSaver(self.tmpfile, compression='deflate:10')
+        data = {'arr': numpy.arange(1000.0)}
+        with self.PckSaver(self.tmpfile, compression='fast') as saver:
+            self.assertEqual(saver.compress_kwds['compression'],
+                             zipfile.ZIP_DEFLATED)
+            self.assertTrue(saver.write('g', data))
+        with self.PckSaver(self.tmpfile, compression='store') as saver:
+            self.assertTrue(saver.write('s', data))
+        with zipfile.ZipFile(self.tmpfile) as z:
+            self.assertEqual(z.getinfo('g/arr.npy').compress_type,
+                             zipfile.ZIP_DEFLATED)
+            self.assertEqual(z.getinfo('s/arr.npy').compress_type,
+                             zipfile.ZIP_STORED)
+        npz = numpy.load(self.tmpfile)
+        numpy.testing.assert_array_equal(npz['g/arr'], data['arr'])
+        numpy.testing.assert_array_equal(npz['s/arr'], data['arr'])
@@ -12,27 +12,75 @@ import json
 import random
 import string
 import hmac
+import threading
+import concurrent.futures
 
 from .glogger import getGLogger
 from .processors import Processor_Names, get_processor, is_processor
 from .__about__ import __gversion__
 
-__all__ = ['cli_script']
+__all__ = ['GdpServer']
 
 log = getGLogger('G')
 
+# processors in worker processes, {(key, generation): processor}
+_WORKER_PROCESSORS = {}
+
+
+def _export_in_process(key, path, kwargs, figlabel, digkwargs):
+    '''Export results of *figlabel* in a worker process.'''
+    gdp = _WORKER_PROCESSORS.get(key)
+    if gdp is None:
+        gdp = get_processor(path, **kwargs)
+        # only main process can write results file
+        gdp.resfilesaver = None
+        _WORKER_PROCESSORS[key] = gdp
+    return gdp.export(figlabel, fmt='json', **digkwargs)
+
+
 class GdpServer(object):
     '''
     A TCP server to export gdp data.
+
+    Dig and export run in :attr:`executor`, not in the event loop,
+    so a long dig does not block other clients. Same requests of
+    different clients share one computation. Requests of each client
+    are handled in order, pending ones are dropped when it disconnects.
+
+    Attributes
+    ----------
+    ip, port: address to bind
+    executor: 'thread', 'process' or :class:`concurrent.futures.Executor`
+        Processors are shared by threads, and each one is used by one
+        thread at a time. Worker processes open their own processors,
+        which do not save results in digged data files.
+        Default 'thread'.
+    max_workers: int, max number of threads or processes, default None
+    max_queued: int, max number of queued requests of each client
     '''
+    max_queued = 16
 
-    def __init__(self, ip, port, secret):
+    def __init__(self, ip, port, secret, executor='thread', max_workers=None):
         self.ip = ip
         self.port = port
         self.__secret = secret
         self.processors = []
         self.processors_lib = {}
         self.clients = {}
+        if executor == 'process':
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers)
+        elif executor == 'thread':
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix='gdpserver')
+        else:
+            self.executor = executor
+        self._in_process = isinstance(
+            self.executor, concurrent.futures.ProcessPoolExecutor)
+        self._processors_args = {}  # key: (generation, path, kwargs)
+        self._generation = 0
+        self._locks = {}
+        self._tasks = {}
 
     def add_processor(self, path, **kwargs):
         '''processor get by :func:`processors.get_processor`, rm visplter'''
@@ -46,56 +94,139 @@ class GdpServer(object):
                 self.processors_lib[key] = None
             log.info("Add %s in server!" % path)
             self.processors_lib[key] = gdp
+            self._generation += 1
+            # worker processes open converted data, not overwrite it
+            self._processors_args[key] = (
+                self._generation, gdp.pckloader.path,
+                dict(kwargs, overwrite=False))
+            self._locks[key] = threading.Lock()
         self.processors = sorted(self.processors_lib.keys())
 
     def del_processor(self, path, name='all'):
         '''*name*: 'all' or Processor_Names'''
         if name == 'all':
-            for key in self.processors_lib:
-                if key[1] == path:
-                    log.info("Delete %s in server!" % (key,))
-                    self.processors_lib.pop(key)
+            keys = [key for key in self.processors_lib if key[1] == path]
         else:
-            key = (name, path)
+            keys = [(name, path)]
+        for key in keys:
             if key in self.processors_lib:
                 log.info("Delete %s in server!" % (key,))
                 self.processors_lib.pop(key)
+                self._processors_args.pop(key)
         self.processors = sorted(self.processors_lib.keys())
 
     def start(self, **kwargs):
         log.info("Bind to %s:%s" % (self.ip, self.port))
         runserver = websockets.serve(self.serve, self.ip, self.port, **kwargs)
-        asyncio.get_event_loop().run_until_complete(runserver)
-        asyncio.get_event_loop().run_forever()
+        try:
+            asyncio.get_event_loop().run_until_complete(runserver)
+            asyncio.get_event_loop().run_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _export(self, key, figlabel, digkwargs):
+        '''Export results of *figlabel* in a thread.'''
+        with self._locks[key]:
+            gdp = self.processors_lib[key]
+            return gdp.export(figlabel, fmt='json', **digkwargs)
+
+    async def get_results(self, key, figlabel, digkwargs):
+        '''
+        Get exported results of *figlabel* with dig kwargs *digkwargs*
+        from processor *key*, computed in :attr:`executor`.
+        Same requests share one computation, which is cancelled
+        if all of them are cancelled before it starts.
+        '''
+        generation, path, kwargs = self._processors_args[key]
+        taskkey = (key, generation, figlabel,
+                   json.dumps(digkwargs, sort_keys=True))
+        task = self._tasks.get(taskkey)
+        if task is None:
+            loop = asyncio.get_running_loop()
+            if self._in_process:
+                future = loop.run_in_executor(
+                    self.executor, _export_in_process, (key, generation),
+                    path, kwargs, figlabel, digkwargs)
+            else:
+                future = loop.run_in_executor(
+                    self.executor, self._export, key, figlabel, digkwargs)
+            task = [future, 0]  # future, number of waiters
+            self._tasks[taskkey] = task
+
+            def done(future):
+                if self._tasks.get(taskkey) is task:
+                    self._tasks.pop(taskkey)
+            future.add_done_callback(done)
+        else:
+            log.debug("Share computation of %s %s" % (figlabel, digkwargs))
+        task[1] += 1
+        try:
+            return await asyncio.shield(task[0])
+        finally:
+            task[1] -= 1
+            if task[1] == 0 and not task[0].done():
+                task[0].cancel()
+
+    @staticmethod
+    def _status(status, reason):
+        return json.dumps({'status': status, 'reason': reason})
+
+    async def handle(self, msg):
+        '''Handle a request message, return response message.'''
+        try:
+            request = json.loads(msg)
+            action = request['action']
+            key = (request['name'], request['path'])
+        except (ValueError, KeyError, TypeError):
+            return self._status(400, 'bad request')
+        if key not in self.processors_lib:
+            return self._status(404, 'processor not found')
+        if action == 'get_figlabels':
+            gdp = self.processors_lib[key]
+            return json.dumps({'status': 200,
+                               'figlabels': gdp.availablelabels})
+        elif action == 'get_results':
+            figlabel = request.get('figlabel')
+            digkwargs = request.get('kwargs') or {}
+            if not isinstance(digkwargs, dict):
+                return self._status(400, 'kwargs should be an object')
+            try:
+                return await self.get_results(key, figlabel, digkwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.error("Failed to get results of %s!" % figlabel,
+                          exc_info=1)
+                return self._status(500, 'failed to get results')
+        else:
+            log.error("unsupported action: %s" % action)
+            return self._status(400, 'unsupported action')
+
+    async def _handle_queue(self, ws, queue):
+        '''Handle requests of a client one by one.'''
+        while True:
+            msg = await queue.get()
+            await ws.send(await self.handle(msg))
 
-    async def serve(self, ws, path):
+    async def serve(self, ws, path=None):
         if await self.register(ws):
             log.info("Serve connection from %s:%s" % ws.remote_address)
+            queue = asyncio.Queue(maxsize=self.max_queued)
+            worker = asyncio.ensure_future(self._handle_queue(ws, queue))
             try:
                 data = json.dumps({'processors': self.processors})
                 await ws.send(data)
                 async for msg in ws:
-                    request = json.loads(msg)
-                    if request['action'] == 'get_figlabels':
-                        key = (request['name'], request['path'])
-                        if key in self.processors_lib:
-                            gdp = self.processors_lib[key]
-                            data = json.dumps({'status': 200, 'figlabels': gdp.availablelabels})
-                            await ws.send(data)
-                        else:
-                            await ws.send(json.dumps({'status': 404, 'reason': 'processor not found'}))
-                    elif request['action'] == 'get_results':
-                        key = (request['name'], request['path'])
-                        figlabel = request['figlabel']
-                        if key in self.processors_lib:
-                            gdp = self.processors_lib[key]
-                            data = gdp.export(figlabel, fmt='json')
-                            await ws.send(data)
-                        else:
-                            await ws.send(json.dumps({'status': 404, 'reason': 'processor not found'}))
-                    else:
-                        log.error("unsupported action: {}", request['action'])
+                    if worker.done():
+                        break  # failed to send
+                    try:
+                        queue.put_nowait(msg)
+                    except asyncio.QueueFull:
+                        await ws.send(self._status(429, 'too many requests'))
             finally:
+                # connection closed, drop pending requests
+                worker.cancel()
+                await asyncio.gather(worker, return_exceptions=True)
                 await self.unregister(ws)
         else:
             await ws.close()
@@ -128,7 +259,7 @@ class GdpServer(object):
     async def unregister(self, ws):
         if not ws.closed:
             await ws.close()
-        self.clients.pop(ws)
+        self.clients.pop(ws, None)
 
     # test client register
     async def auth(ip, secret):
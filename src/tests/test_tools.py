@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 shmilee
+
+import os
+import unittest
+import tempfile
+import numpy
+
+from .. import tools
+
+
+def direct_correlation(data, r0, r1, c0, c1, dr, dc):
+    '''Correlation by its definition, loop of (i, j).'''
+    tau = numpy.zeros((dr, dc))
+    for i in range(dr):
+        for j in range(dc):
+            M0 = data[r0:r1-i, c0:c1-j]
+            M1 = data[r0+i:r1, c0+j:c1]
+            tau[i, j] = (M0*M1).sum() / numpy.sqrt(
+                (M0*M0).sum() * (M1*M1).sum())
+    return tau
+
+
+class TestCorrelation(unittest.TestCase):
+    '''
+    Test function correlation.
+    '''
+
+    def setUp(self):
+        rng = numpy.random.default_rng(7)
+        self.data = rng.standard_normal((3, 40, 30))
+        self.args = (2, 37, 3, 28, 9, 7)
+        self.tau = [direct_correlation(d, *self.args) for d in self.data]
+
+    def test_correlation_2d(self):
+        tau, vdr, vdc = tools.correlation(self.data[0], *self.args)
+        numpy.testing.assert_allclose(tau, self.tau[0], rtol=0, atol=1e-12)
+        self.assertIsNone(vdr)
+        for chunksize in (1, 4, 100):
+            tau, vdr, vdc = tools.correlation(
+                self.data[0], *self.args, chunksize=chunksize)
+            numpy.testing.assert_allclose(
+                tau, self.tau[0], rtol=0, atol=1e-12)
+
+    def test_correlation_batch(self):
+        tau, vdr, vdc = tools.correlation(self.data, *self.args)
+        self.assertEqual(tau.shape, (3, 9, 7))
+        numpy.testing.assert_allclose(tau, self.tau, rtol=0, atol=1e-12)
+
+    def test_correlation_memmap(self):
+        fd, path = tempfile.mkstemp(suffix='-test.npy')
+        os.close(fd)
+        try:
+            numpy.save(path, self.data[1])
+            data = numpy.load(path, mmap_mode='r')
+            tau, vdr, vdc = tools.correlation(data, *self.args, chunksize=5)
+            numpy.testing.assert_allclose(
+                tau, self.tau[1], rtol=0, atol=1e-12)
+            del data
+        finally:
+            os.remove(path)
+
+    def test_correlation_ruler(self):
+        ruler_r = numpy.linspace(0, 1, 40) ** 2
+        ruler_c = numpy.linspace(0, 2, 30) ** 2
+        r0, r1, c0, c1, dr, dc = self.args
+        tau, vdr, vdc = tools.correlation(
+            self.data[0], *self.args, ruler_r=ruler_r, ruler_c=ruler_c)
+        numpy.testing.assert_allclose(
+            vdr, [ruler_r[r0+i] - ruler_r[r0] for i in range(dr)])
+        numpy.testing.assert_allclose(
+            vdc, [ruler_c[c0+j] - ruler_c[c0] for j in range(dc)])
+        tau, vdr, vdc = tools.correlation(
+            self.data[0], *self.args, ruler_r=ruler_r, ruler_r_use='big',
+            ruler_c=ruler_c, ruler_c_use='big')
+        numpy.testing.assert_allclose(tau, self.tau[0], rtol=0, atol=1e-12)
+        numpy.testing.assert_allclose(
+            vdr, [ruler_r[r1] - ruler_r[r1-i] for i in range(dr)])
+        numpy.testing.assert_allclose(
+            vdc, [ruler_c[c1] - ruler_c[c1-j] for j in range(dc)])
+
+
+class TestDepositBlock(unittest.TestCase):
+    '''
+    Test functions linear_deposit, block_sum.
+    '''
+
+    def test_linear_deposit(self):
+        grid = numpy.array([0.0, 1.0, 2.0, 4.0])
+        x = numpy.array([0.25, 1.0, 3.0, 4.0])
+        w = numpy.array([1.0, 2.0, 4.0, 8.0])
+        numpy.testing.assert_allclose(
+            tools.linear_deposit(grid, x, w), [0.75, 2.25, 2.0, 10.0])
+        # out of grid, on first or last point
+        numpy.testing.assert_allclose(
+            tools.linear_deposit(grid, [-1.0, 0.0, 5.0], [1.0, 2.0, 4.0]),
+            [3.0, 0.0, 0.0, 4.0])
+        # sum of weights is kept, x, weights of any shape
+        x = numpy.random.uniform(-1, 5, (10, 20))
+        w = numpy.random.rand(10, 20)
+        self.assertAlmostEqual(
+            tools.linear_deposit(grid, x, w).sum(), w.sum())
+
+    def test_block_sum(self):
+        a = numpy.arange(7 * 5, dtype=float).reshape(7, 5)
+        res = tools.block_sum(a, (3, 2))
+        self.assertEqual(res.shape, (3, 3))
+        # last blocks are shorter
+        self.assertEqual(res[2, 2], a[6, 4])
+        self.assertEqual(res[0, 2], a[0:3, 4].sum())
+        self.assertEqual(res[2, 0], a[6, 0:2].sum())
+        self.assertEqual(res[1, 1], a[3:6, 2:4].sum())
+        self.assertEqual(res.sum(), a.sum())
+        numpy.testing.assert_allclose(
+            tools.block_sum(numpy.arange(5), 2), [1, 5, 4])
+
+    def test_block_sum_mean(self):
+        a = numpy.arange(7 * 5, dtype=float).reshape(7, 5)
+        res = tools.block_sum(a, (3, 2), mean=True)
+        self.assertEqual(res[2, 2], a[6, 4])
+        self.assertEqual(res[0, 2], a[0:3, 4].mean())
+        self.assertEqual(res[1, 1], a[3:6, 2:4].mean())
+        numpy.testing.assert_allclose(
+            tools.block_sum(a, 2, mean=True)[3], [30.5, 32.5, 34])
+        numpy.testing.assert_allclose(
+            tools.block_sum(numpy.arange(5), 2, mean=True), [0.5, 2.5, 4])
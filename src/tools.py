@@ -8,6 +8,7 @@ Some tools for Core.
 
 import contextlib
 import numpy as np
+import scipy.fft as sp_fft
 import scipy.optimize as sp_optimize
 import scipy.signal as sp_signal
 import scipy.interpolate as sp_interpolate
@@ -21,6 +22,7 @@ __all__ = ['nparray_default_bitsize', 'np_printoptions',
            'argrelextrema', 'intersection_4points',
            'near_peak', 'high_envelope',
            'fft', 'fft2', 'savgolay_filter',
+           'linear_deposit', 'block_sum',
            'max_subarray', 'findflat', 'findgrowth',
            'correlation',
            ]
@@ -554,7 +556,8 @@ def savgolay_filter(x, window_size=None, polyorder=None, info=None, **kwargs):
     Parameters
     ----------
     window_size: int
-        window length, a positive odd integer, default 51, len(x) or len(x)-1
+        window length, a positive odd integer, default 51, n or n-1,
+        n is length of x along the axis, default last axis
     polyorder: int
         less than window length, default 3 or window_size-1
     info: str
@@ -562,7 +565,7 @@ def savgolay_filter(x, window_size=None, polyorder=None, info=None, **kwargs):
     kwargs: passed to `scipy.signal.savgol_filter`
     '''
     if not window_size:
-        window_size = min(51, len(x))
+        window_size = min(51, np.shape(x)[kwargs.get('axis', -1)])
         if window_size % 2 == 0:
             window_size = window_size - 1
     if not polyorder:
@@ -572,6 +575,56 @@ def savgolay_filter(x, window_size=None, polyorder=None, info=None, **kwargs):
     return sp_signal.savgol_filter(x, window_size, polyorder, **kwargs)
 
 
+def linear_deposit(grid, x, weights):
+    '''
+    Deposit *weights* at points *x* onto sorted 1-D *grid* by linear
+    interpolation, return deposited array of *grid* size.
+    Points out of *grid* are deposited on its first or last point.
+
+    Parameters
+    ----------
+    grid: 1-D array, at least 2 points, increasing
+    x: array, points of weights
+    weights: array, same shape as x
+    '''
+    grid = np.asarray(grid)
+    x, weights = np.ravel(x), np.ravel(weights)
+    N = grid.size
+    k = np.searchsorted(grid, x, side='left')  # grid[k-1] < x <= grid[k]
+    idx = np.clip(k - 1, 0, N - 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dp = (x - grid[idx]) / (grid[idx+1] - grid[idx])
+    dp = np.where(k == 0, 0.0, np.where(k == N, 1.0, dp))
+    return (np.bincount(idx, weights=(1.0-dp)*weights, minlength=N)
+            + np.bincount(idx+1, weights=dp*weights, minlength=N))
+
+
+def block_sum(a, block, mean=False):
+    '''
+    Sum every *block* elements of array *a* along each axis,
+    the last block may have less elements.
+
+    Parameters
+    ----------
+    block: int or tuple of int, block size along each axis
+    mean: bool, return mean of elements in each block, default False
+    '''
+    a = np.asarray(a)
+    if isinstance(block, int_types):
+        block = (block,) * a.ndim
+    count = 1
+    for axis, size in enumerate(block):
+        if size > 1:
+            starts = np.arange(0, a.shape[axis], size)
+            if mean:
+                shape = [1] * a.ndim
+                shape[axis] = starts.size
+                count = count * np.minimum(
+                    size, a.shape[axis] - starts).reshape(shape)
+            a = np.add.reduceat(a, starts, axis=axis)
+    return a / count if mean else a
+
+
 def max_subarray(A):
     '''
     Maximum subarray problem
@@ -613,9 +666,58 @@ def findgrowth(X, lowerlimit, info=None):
     return _start, _len
 
 
+def _correlation_tau(data, r0, r1, c0, c1, dr, dc, chunksize=None):
+    '''
+    Return correlation matrix of data[..., r0:r1, c0:c1] with shifts
+    [0, dr) x [0, dc). Numerator is got by FFT cross-correlation,
+    and energies are got by cumulative sums of squared data.
+    Read *chunksize* rows at once.
+    '''
+    R, C = r1 - r0, c1 - c0
+    chunksize = R if not chunksize else max(1, min(int(chunksize), R))
+    # zero padding, no wrap for shifts < dr, dc
+    shape = (sp_fft.next_fast_len(chunksize + dr - 1, real=True),
+             sp_fft.next_fast_len(C + dc - 1, real=True))
+    batch = tuple(data.shape[:-2])
+    num = np.zeros(batch + (dr, dc))
+    # q0[n,j] = sum(S[n,:C-j]**2), q1[n,j] = sum(S[n,j:]**2)
+    q0 = np.empty(batch + (R, dc))
+    q1 = np.empty(batch + (R, dc))
+    jcols = np.arange(dc)
+    for a in range(0, R, chunksize):
+        b = min(a + chunksize, R)
+        if chunksize < R:
+            log.debug('correlation rows %d-%d/%d' % (a, b, R))
+        Y = np.asarray(data[..., r0+a:r0+min(b+dr-1, R), c0:c1],
+                       dtype=np.float64)
+        X = Y[..., :b-a, :]
+        FX = sp_fft.rfft2(X, s=shape)
+        FY = sp_fft.rfft2(Y, s=shape) if Y.shape != X.shape else FX
+        num += sp_fft.irfft2(FX.conj()*FY, s=shape)[..., :dr, :dc]
+        cs = np.cumsum(X*X, axis=-1)
+        q0[..., a:b, :] = cs[..., np.clip(C-1-jcols, -1, None)]
+        q0[..., a:b, C:] = 0.0
+        q1[..., a:b, :] = cs[..., -1:]
+        q1[..., a:b, 1:] -= cs[..., np.clip(jcols[:-1], None, C-1)]
+        q1[..., a:b, C:] = 0.0
+    # inten0[i,j] = sum(q0[:R-i,j]), inten1[i,j] = sum(q1[i:,j])
+    T0 = np.cumsum(q0, axis=-2)
+    irows = np.arange(dr)
+    inten0 = T0[..., np.clip(R-1-irows, 0, None), :]
+    inten1 = np.repeat(q1.sum(axis=-2, keepdims=True), dr, axis=-2)
+    n = min(dr, R)
+    inten1[..., 1:n, :] -= np.cumsum(q1[..., :n-1, :], axis=-2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tau = num / np.sqrt(inten0*inten1)
+    # no overlap, same as sum of empty arrays
+    tau[..., R:, :] = np.nan
+    tau[..., :, C:] = np.nan
+    return tau
+
+
 def correlation(data, r0, r1, c0, c1, dr, dc,
                 ruler_r=None, ruler_r_use='little',
-                ruler_c=None, ruler_c_use='little'):
+                ruler_c=None, ruler_c_use='little', chunksize=None):
     '''
     Calculate correlation length or autocorrelation time
     xiao2010, POP, 17, 022302
@@ -623,57 +725,50 @@ def correlation(data, r0, r1, c0, c1, dr, dc,
     Parameters
     ----------
     data: 2d array, like delta_phi(zeta,psi)
+        or nd array, a batch of 2d arrays in last two axes,
+        like delta_phi(time,zeta,psi)
     r0, r1, c0, c1: select data[r0:r1, c0:c1]
     dr, dc: correlation matrix size
     ruler_r, ruler_c: index [0,dr] [0,dc] -> value [vdr0, vdr1] [vdc0, vdc1]
         (ruler_r.size, ruler_c.size) == data.shape
     ruler_r_use, ruler_c_use: use ruler little or big endian
+    chunksize: int
+        number of rows read at once, for *data* larger than memory,
+        like numpy.memmap or h5py dataset. Default None, all rows.
 
     Returns
     -------
     tau: correlation 2d array, tau.shape == (vdr.size, vdc.size)
+        or nd array for a batch, tau.shape == data.shape[:-2] + (dr, dc)
     vdr: delta row array
     vdc: delta column array
+
+    Notes
+    -----
+    tau[i,j] = sum(M0*M1)/sqrt(sum(M0*M0)*sum(M1*M1)),
+    where M0 = data[r0:r1-i, c0:c1-j], M1 = data[r0+i:r1, c0+j:c1].
+    The numerators of all (i,j) are got by one FFT cross-correlation,
+    and the denominators by cumulative sums, in O(N*log(N)).
     '''
-    tau = np.zeros((dr, dc))
-    logstep = max(1, round(dr/10))
-    for i in range(dr):
-        for j in range(dc):
-            # tmptau, tmpinten0, tmpinten1 = 0, 0, 0
-            # for m in range(c0, c1-j):
-            #    for n in range(r0, r1-i):
-            #        tmptau = tmptau + data[n,m]*data[n+i,m+j]
-            #        tmpinten0 = tmpinten0 + data[n,m]*data[n,m]
-            #        tmpinten1 = tmpinten1 + data[n+i,m+j]*data[n+i,m+j]
-            # tau[i,j] = tmptau/np.sqrt(tmpinten0*tmpinten1)
-            tmpM0, tmpM1 = data[r0:r1-i, c0:c1-j], data[r0+i:r1, c0+j:c1]
-            tmp = np.multiply(tmpM0, tmpM1)
-            tmptau = np.sum(tmp)
-            tmp = np.multiply(tmpM0, tmpM0)
-            tmpinten0 = np.sum(tmp)
-            tmp = np.multiply(tmpM1, tmpM1)
-            tmpinten1 = np.sum(tmp)
-            tau[i, j] = tmptau/np.sqrt(tmpinten0*tmpinten1)
-        if (i+1) % logstep == 0 or i == 0 or i+1 == dr:
-            log.info('correlation row %d/%d' % (i+1, dr))
-            # print('row %d: %s' % (i, tau[i, :]))
-            # print(tau[i,:])
+    log.info('correlation matrix %dx%d of data %s'
+             % (dr, dc, tuple(data.shape)))
+    tau = _correlation_tau(data, r0, r1, c0, c1, dr, dc, chunksize=chunksize)
     if ruler_r is None:
         vdr = None
     else:
-        vdr = np.zeros(dr)
-        for i in range(dr):
-            if ruler_r_use == 'little':
-                vdr[i] = ruler_r[r0+i] - ruler_r[r0]
-            else:
-                vdr[i] = ruler_r[r1] - ruler_r[r1-i]
+        idx = np.arange(dr)
+        if ruler_r_use == 'little':
+            vdr = ruler_r[r0+idx] - ruler_r[r0]
+        else:
+            vdr = ruler_r[r1] - ruler_r[r1-idx]
+        vdr = np.asarray(vdr, dtype=np.float64)
     if ruler_c is None:
         vdc = None
     else:
-        vdc = np.zeros(dc)
-        for j in range(dc):
-            if ruler_c_use == 'little':
-                vdc[j] = ruler_c[c0+j] - ruler_c[c0]
-            else:
-                vdc[j] = ruler_c[c1] - ruler_c[c1-j]
+        idx = np.arange(dc)
+        if ruler_c_use == 'little':
+            vdc = ruler_c[c0+idx] - ruler_c[c0]
+        else:
+            vdc = ruler_c[c1] - ruler_c[c1-idx]
+        vdc = np.asarray(vdc, dtype=np.float64)
     return tau, vdr, vdc